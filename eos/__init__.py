@@ -0,0 +1,10 @@
+"""Eos 타자 보스전 패키지.
+
+모듈 구성:
+
+- text, packs, ingest, ngram: 가사 줄 목록, 콘텐츠 팩, 수집기, n-gram 색인
+- engine, stats, replay: 화면 없는 규칙 엔진, 입력 통계, 입력 기록
+- store, net, telemetry: 기록 저장소, 레이스·관전 서버, 텔레메트리 전송
+- render, watchdog, gui: Tk 그리기 도우미, 멈춤 감시기, 게임 화면
+- bots, benches, cli: 가상 타자 봇, 성능 측정 도구, 명령줄 진입점
+"""
@@ -0,0 +1,1156 @@
+"""성능 측정 도구 (python Eos.py bench-* 명령)."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import random
+import selectors
+import shutil
+import socket
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from .text import (
+    CHOSEONG, HANGUL_BASE, HANGUL_COUNT, HangulMatcher, LYRICS_LINES, LineTextSource, MATCH_COMPLETE,
+    MATCH_PARTIAL, MATCH_WRONG, MappedTextSource, _composition_states,
+)
+from .packs import ContentPack, PACK_SUFFIX, SongLibrary, compile_content_pack, open_text_source
+from .ngram import NGRAM_SUFFIX, NgramIndex, build_ngram_index, line_ngrams
+from .engine import EVENT_CORRECT, EVENT_WRONG, TypingEngine
+from .stats import RollingHistogram, TypingStats
+from .store import STORE_QUEUE_SIZE, SessionStore, personal_best, session_record, top_scores
+from .net import (
+    RACE_ROOM_SIZE, RaceServer, SPECTATE_KEYFRAME_INTERVAL, SpectatorDecoder, SpectatorEncoder, SpectatorHub,
+    _encode_race_message,
+)
+from .telemetry import FileTelemetrySink, TELEMETRY_KEY, TelemetryExporter
+from .render import LineRenderer, LyricsViewport, TrajectoryCache, bezier_trajectory
+from .gui import TypingBattleGame, _import_tk
+
+
+class _SlowTelemetrySink:
+    """벤치마크용 수집기 대역: 묶음마다 ``delay`` 초씩 붙잡혀 버퍼를 넘치게 합니다."""
+
+    def __init__(self, delay: float) -> None:
+        self.delay = delay
+        self.received = 0
+
+    def send(self, payload: bytes) -> None:
+        self.received += len(payload)
+        if self.delay:
+            time.sleep(self.delay)
+
+    def close(self) -> None:
+        pass
+
+
+TELEMETRY_MODES = ("off", "file", "slow", "busy")
+# 내보내기가 꽉 막히거나 쉬지 않고 돌아도 키 처리 p99가 내보내기 없을 때와 같아야 합니다.
+# 짧은 측정의 흔들림을 감안해 1.5배와 +20 µs 중 큰 쪽까지 봐줍니다.
+TELEMETRY_P99_RATIO = 1.5
+TELEMETRY_P99_SLACK_US = 20.0
+
+
+def benchmark_telemetry(mode: str, keystrokes: int = 200_000, burst: int = 50, error_rate: float = 0.05, seed: int = 0) -> dict:
+    """화면 스레드가 하는 일(엔진, 통계, ``emit``)의 키당 시간을 내보내기 상태별로 잽니다.
+
+    ``off``는 내보내기 없음, ``file``은 임시 파일, ``slow``는 묶음마다 0.2초 붙잡히는
+    수집기와 작은 버퍼, ``busy``는 쉬지 않고 압축하는 내보내기 스레드입니다.
+    """
+    exporter = None
+    workdir = tempfile.TemporaryDirectory()
+    if mode == "file":
+        exporter = TelemetryExporter(FileTelemetrySink(os.path.join(workdir.name, "telemetry.jsonl.gz")))
+    elif mode == "slow":
+        exporter = TelemetryExporter(_SlowTelemetrySink(0.2), capacity=1024, batch_size=256)
+    elif mode == "busy":
+        exporter = TelemetryExporter(_SlowTelemetrySink(0.0), flush_interval=0.0)
+    engine = TypingEngine(LYRICS_LINES)
+    stats = TypingStats()
+    source = engine.source
+
+    def on_event(event: str, *args) -> None:
+        if event == EVENT_CORRECT:
+            ch = source.char_at(args[0] - 1)
+            stats.correct_char(ch, time.monotonic())
+            if exporter is not None:
+                exporter.emit(TELEMETRY_KEY, ch, True)
+        elif event == EVENT_WRONG:
+            stats.wrong_char(args[1], time.monotonic())
+            if exporter is not None:
+                exporter.emit(TELEMETRY_KEY, args[1], False)
+
+    engine.subscribe(on_event)
+    stream = _build_keystroke_stream(LYRICS_LINES, error_rate, seed)
+    timings = RollingHistogram(keystrokes)
+    perf_ns = time.perf_counter_ns
+    processed = 0
+    started = time.perf_counter()
+    while processed < keystrokes:
+        for ch in stream:
+            if engine.game_over:
+                engine.reset()
+            tick = perf_ns()
+            engine.process_char(ch)
+            timings.add((perf_ns() - tick) / 1000.0)
+            processed += 1
+            if processed % burst == 0:
+                # 키 묶음 사이에 이벤트 루프가 쉬는 시간을 흉내 내 내보내기 스레드가 돌 틈을 줍니다.
+                time.sleep(0.0005)
+            if processed == keystrokes:
+                break
+    elapsed = time.perf_counter() - started
+    result = {"mode": mode, "keystrokes": processed, "rate": processed / elapsed, **timings.summary()}
+    if exporter is not None:
+        exporter.close()
+        result.update(sent=exporter.sent, dropped=exporter.dropped, batches=exporter.batches, bytes=exporter.bytes_sent)
+    workdir.cleanup()
+    return result
+
+
+def check_telemetry_latency(
+    results: list[dict], ratio: float = TELEMETRY_P99_RATIO, slack_us: float = TELEMETRY_P99_SLACK_US
+) -> list[str]:
+    """첫 결과(``off``)를 기준으로 키당 p99가 한도를 넘은 모드를 돌려줍니다."""
+    baseline = results[0]["p99"]
+    limit = max(baseline * ratio, baseline + slack_us)
+    return [
+        f"{result['mode']} p99 {result['p99']:.2f} µs > {limit:.2f} µs"
+        for result in results[1:]
+        if result["p99"] > limit
+    ]
+
+
+def _build_keystroke_stream(lines, error_rate: float, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    stream = []
+    for line in lines:
+        for ch in line:
+            if rng.random() < error_rate:
+                stream.append("#" if ch != "#" else "@")
+            stream.append(ch)
+    return stream
+
+
+def benchmark_engine(keystrokes: int = 2_000_000, error_rate: float = 0.05, seed: int = 0) -> dict:
+    engine = TypingEngine(LYRICS_LINES)
+    engine.subscribe(lambda _event, *_args: None)
+    stream = _build_keystroke_stream(LYRICS_LINES, error_rate, seed)
+
+    def drive(count: int) -> None:
+        process_char = engine.process_char
+        remaining = count
+        while remaining > 0:
+            for ch in stream[:remaining]:
+                process_char(ch)
+            remaining -= len(stream)
+            engine.reset()
+
+    drive(len(stream))
+
+    started = time.perf_counter()
+    drive(keystrokes)
+    elapsed = time.perf_counter() - started
+
+    sample = min(keystrokes, 100_000)
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    drive(sample)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "keystrokes": keystrokes,
+        "seconds": elapsed,
+        "keystrokes_per_sec": keystrokes / elapsed if elapsed > 0 else float("inf"),
+        "retained_bytes_per_key": (current - baseline) / sample,
+        "peak_transient_bytes": peak - baseline,
+    }
+
+
+class _TkCallRecorder:
+    """위젯 메서드 호출 횟수만 세는 화면 없는 대역."""
+
+    def __init__(self) -> None:
+        self.calls = {}
+
+    def __getattr__(self, name: str):
+        calls = self.calls
+
+        def record(*_args, **_kwargs):
+            calls[name] = calls.get(name, 0) + 1
+
+        return record
+
+    def total(self) -> int:
+        return sum(self.calls.values())
+
+
+def benchmark_line_render(error_rate: float = 0.05, seed: int = 0, incremental: bool = True) -> dict:
+    engine = TypingEngine(LYRICS_LINES)
+    recorder = _TkCallRecorder()
+    renderer = LineRenderer(recorder)
+    wrong = []
+    engine.subscribe(lambda event, *args: wrong.append(args[0]) if event == EVENT_WRONG else None)
+
+    keystrokes = 0
+    for ch in _build_keystroke_stream(LYRICS_LINES, error_rate, seed):
+        del wrong[:]
+        if not engine.process_char(ch):
+            continue
+        keystrokes += 1
+        _line_idx, line, typed_len, _ = engine.line_state()
+        if not incremental:
+            renderer.invalidate()
+        renderer.render(line, typed_len, wrong[-1] if wrong else None)
+
+    return {
+        "keystrokes": keystrokes,
+        "calls_per_key": recorder.total() / keystrokes,
+        "calls": dict(sorted(recorder.calls.items())),
+    }
+
+
+def benchmark_viewport(line_count: int, keystrokes: int = 100_000, error_rate: float = 0.05, seed: int = 0) -> dict:
+    lines = [LYRICS_LINES[idx % len(LYRICS_LINES)] for idx in range(line_count)]
+    source = LineTextSource(lines)
+    engine = TypingEngine(source)
+    recorder = _TkCallRecorder()
+    viewport = LyricsViewport(recorder)
+    stream = _build_keystroke_stream(LYRICS_LINES, error_rate, seed)
+
+    processed = 0
+    worst_calls = 0
+    elapsed = 0.0
+    while processed < keystrokes:
+        for ch in stream:
+            if engine.game_over:
+                engine.reset()
+            if not engine.process_char(ch):
+                continue
+            line_idx, _line, typed_len, _next_line = engine.line_state()
+            before = recorder.total()
+            started = time.perf_counter()
+            viewport.render(source, line_idx, typed_len)
+            elapsed += time.perf_counter() - started
+            worst_calls = max(worst_calls, recorder.total() - before)
+            processed += 1
+            if processed == keystrokes:
+                break
+
+    return {
+        "lines": line_count,
+        "keystrokes": processed,
+        "calls_per_key": recorder.total() / processed,
+        "max_calls_per_key": worst_calls,
+        "us_per_key": elapsed / processed * 1e6,
+    }
+
+
+FRAME_SCENARIOS = ("idle", "typing", "paste", "transition", "victory")
+# 화면 갱신 경로마다 부르는 Tcl 명령 수. 코드를 따라가며 센 값이고, 아래
+# FRAME_BUDGETS는 이 값을 더해 만듭니다. tkinter의 after_cancel은
+# 'after info'와 'after cancel' 두 번을 부릅니다.
+TK_PATH_CALLS = {
+    "idle_jobs": 2,  # _reconcile_ui와 _input_finished를 after idle로 예약
+    "stat_label": 1,  # 타수 Label.configure
+    "hp_bar": 3,  # 채움 coords, 글자 itemconfig, 깜빡임 itemconfig
+    "line_advance": 9,  # 같은 줄 한 글자: 아래 줄 글자 교체 4(configure 2, delete, insert), 태그 이동 5
+    "line_last": 7,  # 줄의 마지막 글자: 글자 교체 4, typed·current·bottom_typed 태그 3
+    "line_bulk": 7,  # 여러 글자를 한 번에: configure 2, 태그 이동 5 (글자 교체는 글자마다 2)
+    "line_transition": 17,  # show_transition: configure 2, delete 1, insert 3, 태그 지우기 7, 붙이기 4
+    "line_rebuild": 18,  # 새 줄 첫 화면: configure 2, delete 1, insert 3, 태그 지우기 7, 붙이기 5
+    "viewport_advance": 1,  # view_typed 태그 한 번
+    "viewport_scroll": 9,  # 맨 위 행 지우고 새 행 붙이기 3, 태그 다시 나누기 5, typed 표시 1
+    "missile_launch": 2,  # 풀 항목 coords, state itemconfig
+    "missile_flight": 1,  # 나는 미사일마다 프레임당 coords
+    "missile_hit": 1,  # 명중하거나 치운 미사일 항목 숨기기
+    "boss_flash": 3,  # 보스 색 바꾸기, 넉백 move, 140 ms 뒤 색 되돌리기
+    "hp_restore": 1,  # 120 ms 뒤 HP 막대 색 되돌리기
+    "clock_wake": 3,  # 쉬던 FrameClock 깨우기: after_cancel 2, after 1
+    "frame": 1,  # 다음 프레임 after
+    "jiggle": 2,  # 플레이어·보스 그룹 move
+    "finish": 4,  # 입력창·결과·요약 Label configure, 보스 style
+}
+
+
+def _tk_calls(*paths: str) -> int:
+    return sum(TK_PATH_CALLS[path] for path in paths)
+
+
+# bench-frames 기본값(키 간격 80 ms, 프레임 16 ms, 미사일 24발)에서의 시나리오별 상한.
+# 키당 호출은 입력 처리(엔진, _reconcile_ui, _input_finished) 안에서 나간 것만,
+# 프레임당 호출은 FrameClock 틱 안에서 나간 것만 셉니다.
+_TYPING_MISSILES = 12  # 평균 비행 48단계 × 20 ms ≈ 960 ms를 80 ms마다 쏘면 동시에 12발
+_PASTE_KEYS = 17  # 첫 줄에서 마지막 글자를 뺀 길이
+_TRANSITION_FRAMES = 3  # 미사일이 곧바로 맞아도 HP 복귀(120 ms), 줄 재작성(160 ms), 흔들기에 깨어납니다
+FRAME_BUDGETS = {
+    "idle": {"calls_per_frame": _tk_calls("frame", "jiggle")},
+    "typing": {
+        # 첫 키의 clock_wake(3)는 측정하는 키 10개 이상에 나눠져 키당 1을 넘지 않습니다.
+        "calls_per_key": _tk_calls(
+            "idle_jobs", "stat_label", "hp_bar", "line_advance", "viewport_advance", "missile_launch"
+        ) + 1,
+        # 키 하나(80 ms)가 프레임 5개에 걸치므로 명중·HP 복귀는 프레임당 1로 잡습니다.
+        "calls_per_frame": _tk_calls("frame") + _TYPING_MISSILES * _tk_calls("missile_flight") + 1,
+    },
+    "paste": {
+        # 글자마다 아래 줄 교체 2와 미사일 발사, 한 번만 드는 경로(17회)는 붙여 넣은 글자 수로 나눕니다.
+        "calls_per_key": 2 + _tk_calls("missile_launch") + -(-_tk_calls(
+            "idle_jobs", "stat_label", "hp_bar", "line_bulk", "viewport_advance", "clock_wake"
+        ) // _PASTE_KEYS),
+        "calls_per_frame": _tk_calls("frame") + _PASTE_KEYS * _tk_calls("missile_flight") + 2,
+    },
+    "transition": {
+        "calls_per_key": _tk_calls(
+            "idle_jobs", "stat_label", "hp_bar", "line_transition", "viewport_scroll", "missile_launch", "clock_wake"
+        ),
+        # 줄 재작성과 명중 효과가 가장 적은 프레임에 몰린 경우를 상한으로 잡습니다.
+        "calls_per_frame": _tk_calls("frame") + -(-_tk_calls(
+            "line_rebuild", "missile_hit", "boss_flash", "hp_restore", "jiggle"
+        ) // _TRANSITION_FRAMES),
+    },
+    "victory": {
+        # 끝낼 때 나는 미사일을 모두 숨깁니다 (최대 MISSILE_CAPACITY개).
+        "calls_per_key": _tk_calls(
+            "idle_jobs", "stat_label", "hp_bar", "line_last", "viewport_advance", "missile_launch", "finish",
+            "clock_wake",
+        ) + TypingBattleGame.MISSILE_CAPACITY * _tk_calls("missile_hit"),
+        "calls_per_frame": _tk_calls("frame", "hp_restore") + 1,
+    },
+}
+
+
+class TclCallCounter:
+    """Tk 인터프리터(``root.tk``)를 감싸 Tcl 호출 수와 시간을 명령별로 재는 대리자.
+
+    위젯은 만들어질 때 부모의 ``tk``를 물려받으므로, 게임을 만들기 전에
+    ``root.tk``를 이 객체로 바꿔 두어야 모든 호출이 집계됩니다.
+    """
+
+    def __init__(self, interp) -> None:
+        self.interp = interp
+        self.phase = "other"
+        self.reset()
+
+    def reset(self) -> None:
+        self.calls = {}
+        self.phases = {}
+        self.count = 0
+        self.seconds = 0.0
+
+    def measure(self, phase: str, function):
+        """``function`` 안에서 나간 호출을 ``phase``로 묶어 세는 감싼 함수를 돌려줍니다."""
+
+        def wrapped(*args):
+            outer, self.phase = self.phase, phase
+            try:
+                return function(*args)
+            finally:
+                self.phase = outer
+
+        return wrapped
+
+    def call(self, *args):
+        if len(args) == 1 and isinstance(args[0], tuple):
+            args = args[0]
+        started = time.perf_counter()
+        try:
+            return self.interp.call(*args)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.count += 1
+            self.phases[self.phase] = self.phases.get(self.phase, 0) + 1
+            name = str(args[0])
+            if name.startswith(".") and len(args) > 1:
+                name = str(args[1])
+                if name == "tag" and len(args) > 2:
+                    name = f"tag {args[2]}"
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def __getattr__(self, name: str):
+        return getattr(self.interp, name)
+
+
+def _start_virtual_display():
+    """DISPLAY가 없으면 Xvfb를 띄우고 그 프로세스를 돌려줍니다."""
+    if os.environ.get("DISPLAY"):
+        return None
+    xvfb = shutil.which("Xvfb")
+    if xvfb is None:
+        raise RuntimeError("DISPLAY가 없고 Xvfb도 찾을 수 없습니다.")
+    read_fd, write_fd = os.pipe()
+    process = subprocess.Popen(
+        [xvfb, "-displayfd", str(write_fd), "-screen", "0", "1024x768x24", "-nolisten", "tcp"],
+        pass_fds=(write_fd,),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    os.close(write_fd)
+    with os.fdopen(read_fd, "rb") as pipe:
+        number = pipe.readline().strip()
+    if not number:
+        process.kill()
+        raise RuntimeError("Xvfb를 시작하지 못했습니다.")
+    os.environ["DISPLAY"] = ":" + number.decode("ascii")
+    return process
+
+
+def _frame_scenario_plan(name: str, text: str, first_line: str) -> tuple[str, str, bool, int]:
+    """시나리오별 (준비 입력, 측정 입력, 한 번에 붙여 넣기 여부, 마무리 대기 ms)."""
+    if name == "idle":
+        return "", "", False, 2000
+    if name == "typing":
+        return "", first_line[:-1], False, 300
+    if name == "paste":
+        return "", first_line[:-1], True, 800
+    if name == "transition":
+        return first_line[:-1], first_line[-1], False, 400
+    if name == "victory":
+        return text[:-1], text[-1], False, 800
+    raise ValueError(f"알 수 없는 시나리오: {name}")
+
+
+def benchmark_frames(scenarios=FRAME_SCENARIOS, key_interval_ms: int = 80, seed: int = 0) -> dict:
+    """실제 Tk 화면에서 시나리오마다 Tcl 호출 수와 프레임 시간을 잽니다.
+
+    호출은 입력 처리(``input``), FrameClock 틱(``frame``), 그 밖(``other``)으로
+    나눠 셉니다. 키당 호출은 입력 처리분을 키 수로, 프레임당 호출은 틱 안의
+    호출을 프레임 수로 나눈 값입니다.
+    """
+    from _tkinter import DONT_WAIT
+
+    display = _start_virtual_display()
+    root = _import_tk().Tk()
+    counter = TclCallCounter(root.tk)
+    root.tk = counter
+    game = TypingBattleGame(root, seed=seed)
+    frames = {"count": 0, "seconds": 0.0}
+    tick = game.clock._tick
+
+    def counted_tick() -> None:
+        started = time.perf_counter()
+        tick()
+        frames["count"] += 1
+        frames["seconds"] += time.perf_counter() - started
+
+    game.clock._tick = counter.measure("frame", counted_tick)
+    game.engine.feed_text = counter.measure("input", game.engine.feed_text)
+    game._reconcile_ui = counter.measure("input", game._reconcile_ui)
+    game._input_finished = counter.measure("input", game._input_finished)
+
+    def pump(ms: float) -> None:
+        deadline = time.monotonic() + ms / 1000.0
+        while time.monotonic() < deadline:
+            while counter.interp.dooneevent(DONT_WAIT):
+                pass
+            time.sleep(0.001)
+
+    def type_text(chars: str, paste: bool) -> None:
+        if paste:
+            game.entry_var.set(game.entry_var.get() + chars)
+            pump(key_interval_ms)
+            return
+        for ch in chars:
+            game.entry_var.set(game.entry_var.get() + ch)
+            pump(key_interval_ms)
+
+    results = {}
+    try:
+        pump(200)
+        for name in scenarios:
+            game._restart()
+            source = game.engine.source
+            text = "".join(source.line(idx) for idx in range(source.line_count))
+            setup, measured, paste, settle_ms = _frame_scenario_plan(name, text, source.line(0))
+            if setup:
+                type_text(setup, True)
+            pump(1000)
+            counter.reset()
+            frames["count"] = 0
+            frames["seconds"] = 0.0
+            started = time.perf_counter()
+            type_text(measured, paste)
+            pump(settle_ms)
+            elapsed = time.perf_counter() - started
+            keys = len(measured)
+            input_calls = counter.phases.get("input", 0)
+            frame_calls = counter.phases.get("frame", 0)
+            results[name] = {
+                "keystrokes": keys,
+                "frames": frames["count"],
+                "calls": counter.count,
+                "other_calls": counter.phases.get("other", 0),
+                "calls_per_key": input_calls / keys if keys else 0.0,
+                "calls_per_frame": frame_calls / frames["count"] if frames["count"] else 0.0,
+                "calls_per_second": counter.count / elapsed,
+                "tcl_ms": counter.seconds * 1000.0,
+                "ms_per_frame": frames["seconds"] * 1000.0 / frames["count"] if frames["count"] else 0.0,
+                "top_calls": sorted(counter.calls.items(), key=lambda item: -item[1])[:5],
+            }
+    finally:
+        game.close()
+        root.tk = counter.interp
+        root.destroy()
+        if display is not None:
+            display.terminate()
+            display.wait()
+    return results
+
+
+def check_frame_budgets(results: dict, budgets=FRAME_BUDGETS) -> list[str]:
+    failures = []
+    for name, result in results.items():
+        for metric, limit in budgets.get(name, {}).items():
+            if result[metric] > limit:
+                failures.append(f"{name}: {metric} {result[metric]:.1f} > {limit}")
+    return failures
+
+
+# 새 프로세스 기준 시작 시간 상한 (ms). 중앙값이 넘으면 bench-launch가 실패합니다.
+LAUNCH_BUDGETS = {"import_ms": 300, "first_frame_ms": 450}
+LAUNCH_MODES = ("import", "eager", "fast")
+_LAUNCH_PROBE = (
+    "import sys, time\n"
+    "started = time.perf_counter()\n"
+    "sys.path.insert(0, sys.argv[1])\n"
+    "import Eos\n"
+    "imported = time.perf_counter()\n"
+    "from eos.benches import _report_launch\n"
+    "_report_launch(started, imported, sys.argv[2])\n"
+)
+
+
+def _report_launch(started: float, imported: float, mode: str) -> None:
+    """bench-launch가 띄운 자식 프로세스에서 시작 단계별 시각을 JSON 한 줄로 출력합니다.
+
+    가져오기 시간은 ``import Eos``까지만 잽니다. 이 함수를 부르려고 가져온 benches는 빼야 합니다.
+    """
+    result = {"import_ms": (imported - started) * 1000.0, "tk_on_import": "tkinter" in sys.modules}
+    if mode != "import":
+        from _tkinter import DONT_WAIT
+
+        root = _import_tk().Tk()
+        game = TypingBattleGame(root, seed=0, fast_start=mode == "fast")
+        result["construct_ms"] = (time.perf_counter() - started) * 1000.0
+        deadline = time.monotonic() + 10.0
+        while not game.ready or "first_frame_ms" not in result:
+            if not root.tk.dooneevent(DONT_WAIT):
+                if time.monotonic() > deadline:
+                    break
+                time.sleep(0.0005)
+            now = (time.perf_counter() - started) * 1000.0
+            if "first_frame_ms" not in result and root.winfo_ismapped():
+                result["first_frame_ms"] = now
+            if "ready_ms" not in result and game.ready:
+                result["ready_ms"] = now
+        game.close()
+        root.destroy()
+    print(json.dumps(result))
+
+
+def benchmark_launch(rounds: int = 5, modes=LAUNCH_MODES) -> dict:
+    directory = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    display = None
+    if any(mode != "import" for mode in modes):
+        display = _start_virtual_display()
+    results = {}
+    try:
+        for mode in modes:
+            samples = []
+            for _ in range(rounds):
+                completed = subprocess.run(
+                    [sys.executable, "-c", _LAUNCH_PROBE, directory, mode],
+                    capture_output=True,
+                    text=True,
+                    check=True,
+                )
+                samples.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+            summary = {"tk_on_import": any(sample["tk_on_import"] for sample in samples)}
+            for key in ("import_ms", "construct_ms", "first_frame_ms", "ready_ms"):
+                values = sorted(sample[key] for sample in samples if key in sample)
+                if values:
+                    summary[key] = values[len(values) // 2]
+            results[mode] = summary
+    finally:
+        if display is not None:
+            display.terminate()
+            display.wait()
+    return results
+
+
+def benchmark_trajectories(missiles: int = 20_000, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    start, end = (80, 60), (340, 60)
+    launches = [
+        (
+            (rng.uniform(-200, 300), rng.uniform(-160, 180)),
+            (rng.uniform(100, 600), rng.uniform(-60, 260)),
+            rng.randint(24, 72),
+            rng.uniform(0.8, 3.5),
+        )
+        for _ in range(missiles)
+    ]
+
+    def per_frame() -> None:
+        for control1, control2, steps, ease_power in launches:
+            for step in range(steps + 1):
+                t = (step / steps) ** ease_power
+                inv = 1.0 - t
+                (
+                    inv ** 3 * start[0]
+                    + 3 * inv ** 2 * t * control1[0]
+                    + 3 * inv * t ** 2 * control2[0]
+                    + t ** 3 * end[0],
+                    inv ** 3 * start[1]
+                    + 3 * inv ** 2 * t * control1[1]
+                    + 3 * inv * t ** 2 * control2[1]
+                    + t ** 3 * end[1],
+                )
+
+    def table() -> None:
+        for control1, control2, steps, ease_power in launches:
+            bezier_trajectory(start, control1, control2, end, steps, ease_power)
+
+    cache = TrajectoryCache(random.Random(seed))
+
+    def cached() -> None:
+        for _control1, _control2, steps, ease_power in launches:
+            cache.trajectory(start, end, steps, ease_power)
+
+    cached()
+    results = {"numpy": np is not None}
+    for name, run in (("per_frame", per_frame), ("table", table), ("cached", cached)):
+        started = time.perf_counter()
+        run()
+        results[name] = (time.perf_counter() - started) / missiles * 1e6
+    results["templates"] = len(cache)
+    return results
+
+
+def _estimate_eager_bytes(total_chars: int) -> int:
+    sample_lines = LYRICS_LINES * 256
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    text_chars = [ch for line in sample_lines for ch in line]
+    char_meta = [(line_idx, pos) for line_idx, line in enumerate(sample_lines) for pos in range(len(line))]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del text_chars, char_meta
+    sample_chars = sum(len(line) for line in sample_lines)
+    return int((current - baseline) / sample_chars * total_chars)
+
+
+def benchmark_text_source(megabytes: int = 64, lookups: int = 200_000, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    line_bytes = "\n".join(LYRICS_LINES).encode("utf-8") + b"\n"
+    repeats = max(1, megabytes * 1024 * 1024 // len(line_bytes))
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "corpus.txt")
+        with open(path, "wb") as handle:
+            chunk = line_bytes * 1024
+            for _ in range(repeats // 1024):
+                handle.write(chunk)
+            handle.write(line_bytes * (repeats % 1024))
+
+        started = time.perf_counter()
+        source = MappedTextSource(path)
+        build_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for _ in range(lookups):
+            index = rng.randrange(source.total_chars)
+            source.char_at(index)
+        random_seconds = time.perf_counter() - started
+
+        engine = TypingEngine(source)
+        started = time.perf_counter()
+        for _ in range(lookups):
+            engine.process_char(engine.expected_char())
+        sequential_seconds = time.perf_counter() - started
+
+        tracemalloc.start()
+        for _ in range(lookups):
+            engine.process_char(engine.expected_char())
+        _, lookup_peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        result = {
+            "megabytes": os.path.getsize(path) / (1024 * 1024),
+            "lines": source.line_count,
+            "chars": source.total_chars,
+            "build_seconds": build_seconds,
+            "index_bytes": source.index_nbytes(),
+            "eager_bytes": _estimate_eager_bytes(source.total_chars),
+            "lookup_peak_bytes": lookup_peak,
+            "random_lookup_us": random_seconds / lookups * 1e6,
+            "sequential_key_us": sequential_seconds / lookups * 1e6,
+        }
+        source.close()
+    return result
+
+
+def benchmark_hangul_matcher(rounds: int = 5) -> dict:
+    matcher = HangulMatcher()
+    events = []
+    for offset in range(HANGUL_COUNT):
+        expected = chr(HANGUL_BASE + offset)
+        following = chr(HANGUL_BASE + (offset * 7919) % HANGUL_COUNT)
+        states = _composition_states(expected)
+        for state in states[:-1]:
+            events.append((state, expected, following, MATCH_PARTIAL))
+        events.append((states[-1], expected, following, MATCH_COMPLETE))
+        wrong_initial = CHOSEONG[(HangulMatcher.INITIAL[offset] + 1) % len(CHOSEONG)]
+        events.append((wrong_initial, expected, following, MATCH_WRONG))
+
+    mismatches = sum(1 for ch, expected, following, want in events if matcher.classify(ch, expected, following) != want)
+
+    classify = matcher.classify
+    started = time.perf_counter()
+    for _ in range(rounds):
+        for ch, expected, following, _want in events:
+            classify(ch, expected, following)
+    elapsed = time.perf_counter() - started
+    total = len(events) * rounds
+    return {
+        "syllables": HANGUL_COUNT,
+        "events": total,
+        "mismatches": mismatches,
+        "ns_per_event": elapsed / total * 1e9,
+    }
+
+
+def benchmark_stats(keystrokes: int = 1_000_000, error_rate: float = 0.05, seed: int = 0) -> dict:
+    """통계 갱신을 붙였을 때와 뺐을 때의 키당 처리 시간을 비교합니다."""
+    stream = _build_keystroke_stream(LYRICS_LINES, error_rate, seed)
+    source = LineTextSource(LYRICS_LINES)
+
+    def drive(with_stats: bool) -> float:
+        engine = TypingEngine(source)
+        stats = TypingStats()
+        if with_stats:
+            monotonic = time.monotonic
+            char_at = source.char_at
+
+            def listener(event: str, *args) -> None:
+                if event == EVENT_CORRECT:
+                    stats.correct_char(char_at(args[0] - 1), monotonic())
+                elif event == EVENT_WRONG:
+                    stats.wrong_char(args[1], monotonic())
+
+            engine.subscribe(listener)
+        process_char = engine.process_char
+        done = 0
+        started = time.perf_counter()
+        while done < keystrokes:
+            engine.reset()
+            for ch in stream[:keystrokes - done]:
+                process_char(ch)
+            done += min(len(stream), keystrokes - done)
+        return time.perf_counter() - started
+
+    bare = min(drive(False) for _ in range(3))
+    tracked = min(drive(True) for _ in range(3))
+    return {
+        "keystrokes": keystrokes,
+        "bare_ns": bare / keystrokes * 1e9,
+        "stats_ns": tracked / keystrokes * 1e9,
+        "overhead_ns": (tracked - bare) / keystrokes * 1e9,
+    }
+
+
+class _SlowDiskStore(SessionStore):
+    """배치마다 디스크가 느린 것처럼 기다리는 저장소 (포화 측정용)."""
+
+    def __init__(self, path, queue_size: int, delay_ms: float) -> None:
+        self.delay = delay_ms / 1000.0
+        super().__init__(path, queue_size)
+
+    def _write_batch(self, connection: sqlite3.Connection, insert: str, rows: list) -> None:
+        time.sleep(self.delay)
+        super()._write_batch(connection, insert, rows)
+
+
+def benchmark_store(records: int = 100_000, queue_size: int = STORE_QUEUE_SIZE, disk_delay_ms: float = 0.0, seed: int = 0) -> dict:
+    """큐가 넘칠 만큼 빠르게 기록을 밀어 넣으며 ``submit``이 멈추지 않는지 확인합니다.
+
+    ``disk_delay_ms``를 주면 배치마다 그만큼 디스크가 느린 상황을 흉내 냅니다.
+    """
+    rng = random.Random(seed)
+    songs = [hashlib.sha256(str(number).encode()).hexdigest() for number in range(20)]
+    players = [f"player{number}" for number in range(50)]
+    rows = []
+    for _ in range(records):
+        summary = {
+            "chars": rng.randint(10, 500),
+            "wrong": rng.randint(0, 30),
+            "seconds": rng.uniform(10, 300),
+            "cpm": rng.uniform(100, 900),
+            "wpm": rng.uniform(20, 150),
+            "accuracy": rng.uniform(80, 100),
+            "most_missed": [["닳", 2]],
+        }
+        rows.append(session_record(rng.choice(songs), "bench", rng.choice(players), summary, rng.random() < 0.8))
+
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "history.sqlite3")
+        store = _SlowDiskStore(path, queue_size, disk_delay_ms) if disk_delay_ms else SessionStore(path, queue_size)
+        submit_us = RollingHistogram(records)
+        perf_counter = time.perf_counter
+        started = perf_counter()
+        for row in rows:
+            tick = perf_counter()
+            store.submit(row)
+            submit_us.add((perf_counter() - tick) * 1e6)
+        submit_seconds = perf_counter() - started
+        store.close(timeout=60.0)
+        drain_seconds = perf_counter() - started
+
+        connection = sqlite3.connect(path)
+        rounds = 200
+        tick = perf_counter()
+        for number in range(rounds):
+            top_scores(connection, song=songs[number % len(songs)], limit=10)
+        top_ms = (perf_counter() - tick) / rounds * 1000.0
+        tick = perf_counter()
+        for number in range(rounds):
+            personal_best(connection, songs[number % len(songs)], players[number % len(players)])
+        best_ms = (perf_counter() - tick) / rounds * 1000.0
+        stored = connection.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        connection.close()
+
+    return {
+        "records": records,
+        "accepted": records - store.dropped,
+        "dropped": store.dropped,
+        "stored": stored,
+        "written": store.written,
+        "batches": store.batches,
+        "error": repr(store.error) if store.error else "",
+        "submit_us": submit_us.summary(),
+        "stalls": sum(1 for value in submit_us.samples() if value > 1000.0),
+        "submit_seconds": submit_seconds,
+        "rows_per_sec": store.written / max(drain_seconds, 1e-9),
+        "top_scores_ms": top_ms,
+        "personal_best_ms": best_ms,
+    }
+
+
+def _synthetic_corpus(lines: int, seed: int = 0):
+    """지프 분포로 고른 한글 낱말로 가짜 말뭉치 줄을 만듭니다."""
+    rng = random.Random(seed)
+    syllables = [ch for ch in "".join(LYRICS_LINES) if ch != " "]
+    syllables += [chr(HANGUL_BASE + rng.randrange(HANGUL_COUNT)) for _ in range(400)]
+    vocabulary = ["".join(rng.choice(syllables) for _ in range(rng.randint(1, 4))) for _ in range(20_000)]
+    weights = list(itertools.accumulate(1.0 / rank for rank in range(1, len(vocabulary) + 1)))
+    for _ in range(lines):
+        words = rng.choices(vocabulary, cum_weights=weights, k=rng.randint(3, 7))
+        yield " ".join(words)
+
+
+def benchmark_ngram_index(lines: int = 1_000_000, queries: int = 50, weak_count: int = 24, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "corpus" + NGRAM_SUFFIX)
+        started = time.perf_counter()
+        header = build_ngram_index(_synthetic_corpus(lines, seed), path)
+        build_seconds = time.perf_counter() - started
+        size = os.path.getsize(path)
+
+        started = time.perf_counter()
+        index = NgramIndex(path)
+        open_ms = (time.perf_counter() - started) * 1000.0
+        # 실제로 있는 조각 가운데 고르되, 자주 틀리는 조각은 흔한 조각이라고 보고 짧은 줄에서 뽑습니다.
+        samples = [index.line(rng.randrange(index.line_count)) for _ in range(200)]
+        pool = sorted({gram for line in samples for gram in line_ngrams(line)})
+        timings = []
+        postings = 0
+        for _ in range(queries):
+            weak = [(gram, rng.randint(1, 9)) for gram in rng.sample(pool, min(weak_count, len(pool)))]
+            postings += sum(len(index.postings(gram)) for gram, _weight in weak)
+            tick = time.perf_counter()
+            index.drill_lines(weak)
+            timings.append((time.perf_counter() - tick) * 1000.0)
+        index.close()
+    timings.sort()
+    return {
+        "lines": header["lines"],
+        "terms": header["terms"],
+        "build_seconds": build_seconds,
+        "bytes": size,
+        "open_ms": open_ms,
+        "postings_per_query": postings / queries,
+        "query_p50_ms": timings[len(timings) // 2],
+        "query_max_ms": timings[-1],
+        "numpy": np is not None,
+    }
+
+
+def _read_text_source(path: str):
+    source = MappedTextSource(path)
+    source.content_digest()
+    return source
+
+
+def _read_pack_source(path: str):
+    source = ContentPack(path)
+    source.content_digest()
+    return source
+
+
+def benchmark_startup(lines: int = 200_000, rounds: int = 5) -> dict:
+    """원문 텍스트를 색인하는 기존 경로와 미리 만든 팩을 여는 경로의 시작 비용을 비교합니다."""
+    corpus = (LYRICS_LINES * (lines // len(LYRICS_LINES) + 1))[:lines]
+    result = {"lines": len(corpus)}
+    with tempfile.TemporaryDirectory() as workdir:
+        text_path = os.path.join(workdir, "corpus.txt")
+        pack_path = os.path.join(workdir, "corpus" + PACK_SUFFIX)
+        with open(text_path, "w", encoding="utf-8") as handle:
+            handle.write("\n".join(corpus))
+
+        started = time.perf_counter()
+        compile_content_pack(corpus, pack_path, "bench")
+        result["compile_seconds"] = time.perf_counter() - started
+        result["text_bytes"] = os.path.getsize(text_path)
+        result["pack_bytes"] = os.path.getsize(pack_path)
+
+        for name, opener in (("text", _read_text_source), ("pack", _read_pack_source)):
+            timings = []
+            for _ in range(rounds):
+                started = time.perf_counter()
+                source = opener(text_path if name == "text" else pack_path)
+                engine = TypingEngine(source)
+                engine.line_state()
+                timings.append(time.perf_counter() - started)
+                del engine
+                source.close()
+            timings.sort()
+            result[f"{name}_ms"] = timings[len(timings) // 2] * 1000.0
+
+        timings = []
+        library = SongLibrary(os.path.join(workdir, "library"))
+        for _ in range(rounds):
+            started = time.perf_counter()
+            source = ContentPack(library.ensure_builtin())
+            TypingEngine(source).line_state()
+            timings.append(time.perf_counter() - started)
+            source.close()
+        result["builtin_first_ms"] = timings[0] * 1000.0
+        result["builtin_cached_ms"] = sorted(timings[1:])[len(timings[1:]) // 2] * 1000.0 if rounds > 1 else timings[0] * 1000.0
+    return result
+
+
+def _run_race_server(text, room_size: int, host: str, unix_path, pipe) -> None:
+    server = RaceServer(open_text_source(text), room_size)
+
+    def ready(listener) -> None:
+        pipe.send(None if unix_path else listener.sockets[0].getsockname()[1])
+        pipe.close()
+
+    try:
+        asyncio.run(server.serve(host, 0, unix_path, ready))
+    except KeyboardInterrupt:
+        pass
+
+
+async def _race_request(connect, message: dict) -> dict:
+    reader, writer = await connect()
+    writer.write(_encode_race_message(message))
+    reply = json.loads(await reader.readline())
+    writer.close()
+    return reply
+
+
+async def _race_client(connect, name: str, keys: int, rate: float, error_rate: float, seed: int, rtt: RollingHistogram) -> int:
+    """얇은 클라이언트 흉내: 들어가서 받은 가사를 일정한 속도로 칩니다."""
+    rng = random.Random(seed)
+    reader, writer = await connect()
+    writer.write(_encode_race_message({"op": "join", "player": name}))
+    while True:
+        message = json.loads(await reader.readline())
+        if message["op"] == "welcome":
+            break
+    stream = _build_keystroke_stream(message["lines"], error_rate, seed)[:keys]
+    sent = 0
+    for seq, ch in enumerate(stream):
+        started = time.perf_counter()
+        writer.write(_encode_race_message({"op": "keys", "text": ch, "seq": seq}))
+        while True:
+            message = json.loads(await reader.readline())
+            if message["op"] == "state" and message["seq"] == seq:
+                break
+        rtt.add((time.perf_counter() - started) * 1000.0)
+        sent += 1
+        await asyncio.sleep(rng.expovariate(rate))
+    writer.close()
+    return sent
+
+
+async def _race_load(connect, clients: int, keys: int, rate: float, error_rate: float, ramp: float) -> dict:
+    rtt = RollingHistogram(65536)
+    before = await _race_request(connect, {"op": "stats"})
+    started = time.perf_counter()
+
+    async def staggered(number: int) -> int:
+        await asyncio.sleep(ramp * number / clients)
+        return await _race_client(connect, f"bot{number}", keys, rate, error_rate, number, rtt)
+
+    results = await asyncio.gather(*(staggered(number) for number in range(clients)), return_exceptions=True)
+    wall = time.perf_counter() - started
+    after = await _race_request(connect, {"op": "stats"})
+    failures = [result for result in results if isinstance(result, BaseException)]
+    cpu = after["cpu_seconds"] - before["cpu_seconds"]
+    return {
+        "clients": clients,
+        "failed": len(failures),
+        "first_error": repr(failures[0]) if failures else "",
+        "keystrokes": sum(result for result in results if isinstance(result, int)),
+        "seconds": wall,
+        "server_cpu_seconds": cpu,
+        "peak_sessions": after["peak_sessions"],
+        "server_latency_ms": after["latency_ms"],
+        "round_trip_ms": rtt.summary(),
+        # 서버가 한 코어를 얼마나 썼는지로 코어 하나가 감당할 세션 수를 어림합니다.
+        "sessions_per_core": after["peak_sessions"] / max(cpu / wall, 1e-9),
+    }
+
+
+def benchmark_race_server(
+    clients: int = 2000,
+    keys: int = 100,
+    rate: float = 5.0,
+    error_rate: float = 0.05,
+    room_size: int = RACE_ROOM_SIZE,
+    ramp: float = 5.0,
+    text=None,
+    unix: bool = False,
+) -> dict:
+    """서버를 별도 프로세스로 띄우고 한 프로세스에서 가상 클라이언트 수천 개를 붙입니다."""
+    try:
+        import resource
+        soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        wanted = min(hard, max(soft, clients * 2 + 64))
+        resource.setrlimit(resource.RLIMIT_NOFILE, (wanted, hard))
+    except (ImportError, ValueError, OSError):
+        pass
+
+    with tempfile.TemporaryDirectory() as workdir:
+        unix_path = os.path.join(workdir, "race.sock") if unix else None
+        parent, child = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(
+            target=_run_race_server,
+            args=(text, room_size, "127.0.0.1", unix_path, child),
+            daemon=True,
+        )
+        process.start()
+        port = parent.recv()
+
+        def connect():
+            if unix_path:
+                return asyncio.open_unix_connection(unix_path)
+            return asyncio.open_connection("127.0.0.1", port)
+
+        try:
+            result = asyncio.run(_race_load(connect, clients, keys, rate, error_rate, ramp))
+        finally:
+            process.terminate()
+            process.join()
+    return result
+
+
+def _spectator_viewers(socket_path: str, viewers: int, pipe) -> None:
+    """관전자 여러 명을 한 프로세스에서 흉내 내고, 받은 바이트와 최종 상태를 돌려줍니다."""
+    selector = selectors.DefaultSelector()
+    for _ in range(viewers):
+        viewer = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        viewer.connect(socket_path)
+        viewer.setblocking(False)
+        selector.register(viewer, selectors.EVENT_READ, [SpectatorDecoder(), 0])
+    pipe.send("ready")
+    open_count = viewers
+    while open_count:
+        for key, _mask in selector.select():
+            data = key.fileobj.recv(65536)
+            if data:
+                key.data[0].feed(data)
+                key.data[1] += len(data)
+            else:
+                selector.unregister(key.fileobj)
+                key.fileobj.close()
+                open_count -= 1
+                pipe.send((key.data[1], key.data[0].index, key.data[0].synced))
+
+
+def benchmark_spectators(viewers: int = 300, keystrokes: int = 2000, rate: float = 200.0, error_rate: float = 0.05, seed: int = 0) -> dict:
+    source = LineTextSource(LYRICS_LINES * (keystrokes // 60 + 1))
+    engine = TypingEngine(source)
+    encoder = SpectatorEncoder(engine)
+    engine.subscribe(encoder)
+    stream = _build_keystroke_stream(
+        [source.line(idx) for idx in range(source.line_count)], error_rate, seed
+    )[:keystrokes]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        socket_path = os.path.join(workdir, "spectate.sock")
+        hub = SpectatorHub(socket_path)
+        hub.publish(encoder.keyframe(), keyframe=True)
+        parent, child = multiprocessing.Pipe(duplex=False)
+        process = multiprocessing.Process(target=_spectator_viewers, args=(socket_path, viewers, child), daemon=True)
+        process.start()
+        parent.recv()
+        while hub.viewers < viewers:
+            time.sleep(0.01)
+
+        rng = random.Random(seed)
+        keyframe_at = started = time.perf_counter()
+        encode_seconds = 0.0
+        for number, ch in enumerate(stream, 1):
+            engine.process_char(ch)
+            tick = time.perf_counter()
+            if rng.random() < 0.9:
+                encoder.missile(1)
+            chunk = encoder.take()
+            if chunk:
+                hub.publish(chunk)
+            if tick - keyframe_at >= SPECTATE_KEYFRAME_INTERVAL:
+                keyframe_at = tick
+                hub.publish(encoder.keyframe(), keyframe=True)
+            encode_seconds += time.perf_counter() - tick
+            delay = started + number / rate - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        time.sleep(0.2)
+        published = hub.bytes_published
+        dropped = hub.dropped_viewers
+        hub.close()
+        received = [parent.recv() for _ in range(viewers)]
+        process.join()
+
+    seconds = keystrokes / rate
+    return {
+        "viewers": viewers,
+        "keystrokes": keystrokes,
+        "bytes_per_keystroke": published / keystrokes,
+        "bytes_per_viewer_sec": published / seconds,
+        "encode_us_per_key": encode_seconds / keystrokes * 1e6,
+        "fanout_cpu_seconds": hub.cpu_seconds,
+        "fanout_us_per_viewer_key": hub.cpu_seconds / (viewers * keystrokes) * 1e6,
+        "dropped": dropped,
+        "in_sync": sum(1 for _bytes, index, synced in received if synced and index == engine.current_index),
+    }
@@ -0,0 +1,261 @@
+"""가상 타자 봇과 봇 시나리오 실행기."""
+
+from __future__ import annotations
+
+import concurrent.futures
+import os
+import random
+import time
+from collections import deque
+
+from .text import HANGUL_BASE, HANGUL_COUNT, _composition_states
+from .packs import open_text_source
+from .engine import TypingEngine
+from .stats import RollingHistogram
+from .replay import REPLAY_INPUT, SessionRecorder, TraceDigest, engine_state
+from .gui import TypingBattleGame, _import_tk
+
+
+class TypistProfile:
+    """합성 타자 봇의 성향: 속도, 오타율, IME 조합 여부, 붙여넣기 몰아치기."""
+
+    def __init__(
+        self,
+        name: str,
+        cpm: float = 300.0,
+        error_rate: float = 0.03,
+        ime: bool = True,
+        burst_rate: float = 0.0,
+        burst_chars: tuple[int, int] = (8, 30),
+        jitter: float = 0.35,
+        pause_rate: float = 0.01,
+        pause_ms: float = 800.0,
+    ) -> None:
+        self.name = name
+        self.cpm = cpm
+        self.error_rate = error_rate
+        self.ime = ime
+        self.burst_rate = burst_rate
+        self.burst_chars = burst_chars
+        self.jitter = jitter
+        self.pause_rate = pause_rate
+        self.pause_ms = pause_ms
+
+
+BOT_SCENARIOS = {
+    profile.name: profile
+    for profile in (
+        TypistProfile("steady", cpm=300, error_rate=0.03),
+        TypistProfile("fast", cpm=900, error_rate=0.05),
+        TypistProfile("sloppy", cpm=400, error_rate=0.2),
+        TypistProfile("paste", cpm=300, error_rate=0.02, burst_rate=0.05),
+        TypistProfile("no-ime", cpm=600, ime=False),
+        TypistProfile("superhuman", cpm=20_000, error_rate=0.02, jitter=0.1, pause_rate=0.0),
+    )
+}
+
+
+class SyntheticTypist:
+    """프로필대로 입력창 내용을 한 단계씩 바꿔 가는 봇.
+
+    타수(CPM)는 자모 한 타 기준입니다. IME를 쓰면 음절을 자모 단위로 조합하면서
+    조합 중인 마지막 글자를 바꿔 끼우고, 붙여넣기는 여러 글자를 한 번에 넣습니다.
+    다음 입력창 내용은 게임이 남겨 둔 입력창 내용과 엔진 상태만 보고 정하므로
+    엔진을 직접 구동하든 ``entry_var``로 구동하든 같은 규칙으로 움직입니다.
+    """
+
+    def __init__(self, profile: TypistProfile, seed: int = 0) -> None:
+        self.profile = profile
+        self.rng = random.Random(seed)
+        self._stroke_ms = 60000.0 / profile.cpm
+        self._plan = deque()
+        self._composing = None
+
+    def next_event(self, entry: str, engine: TypingEngine):
+        """``(지연 ms, 새 입력창 내용)``을 돌려줍니다. 다 쳤으면 None."""
+        if self._plan and self._plan[0][2] and not entry.endswith(self._composing or "\0"):
+            # 조합 중이던 글자가 이미 처리됐거나 오타로 지워졌으면 계획을 새로 세웁니다.
+            self._plan.clear()
+        if not self._plan:
+            if engine.game_over or engine.expected_char() is None:
+                return None
+            self._plan_next(engine)
+        strokes, state, replace = self._plan.popleft()
+        self._composing = state[-1:]
+        base = entry[:-1] if replace and entry else entry
+        return self._delay(strokes), base + state
+
+    def _delay(self, strokes: int) -> float:
+        profile = self.profile
+        delay = self._stroke_ms * strokes * self.rng.lognormvariate(0.0, profile.jitter)
+        if profile.pause_rate and self.rng.random() < profile.pause_rate:
+            delay += self.rng.expovariate(1.0 / profile.pause_ms)
+        return delay
+
+    def _plan_next(self, engine: TypingEngine) -> None:
+        profile = self.profile
+        rng = self.rng
+        expected = engine.expected_char()
+        roll = rng.random()
+        if roll < profile.burst_rate:
+            count = rng.randint(*profile.burst_chars)
+            end = min(engine.total_chars, engine.current_index + count)
+            text = "".join(engine.source.char_at(index) for index in range(engine.current_index, end))
+            self._plan.append((1, text, False))
+            return
+        target = expected
+        if roll < profile.burst_rate + profile.error_rate:
+            if 0 <= ord(expected) - HANGUL_BASE < HANGUL_COUNT:
+                while target == expected:
+                    target = chr(HANGUL_BASE + rng.randrange(HANGUL_COUNT))
+            else:
+                target = rng.choice("qwertasdfgzxcv#")
+        if profile.ime and 0 <= ord(target) - HANGUL_BASE < HANGUL_COUNT:
+            for step, state in enumerate(_composition_states(target)):
+                self._plan.append((1, state, step > 0))
+        else:
+            self._plan.append((1, target, False))
+
+
+def _save_bot_recording(path: str, seed: int, source, events: list, engine: TypingEngine, trace: TraceDigest) -> None:
+    recorder = SessionRecorder(path, seed, getattr(source, "path", None), source.content_digest())
+    recorder.events = events
+    recorder.save(engine_state(engine), trace)
+
+
+def run_typist_direct(profile: TypistProfile, source, seed: int = 0, record_path=None) -> dict:
+    """봇 입력을 화면 없이 엔진에 바로 넣고 입력 하나당 처리 시간을 잽니다."""
+    engine = TypingEngine(source)
+    trace = TraceDigest()
+    engine.subscribe(trace)
+    typist = SyntheticTypist(profile, seed)
+    latency = RollingHistogram(65536)
+    events = []
+    entry = ""
+    typed_ms = 0.0
+    perf_counter = time.perf_counter
+    while True:
+        step = typist.next_event(entry, engine)
+        if step is None:
+            break
+        delay, entry = step
+        typed_ms += delay
+        events.append([int(round(delay)), REPLAY_INPUT, entry])
+        started = perf_counter()
+        entry = engine.feed_text(entry)
+        latency.add((perf_counter() - started) * 1000.0)
+    if record_path:
+        _save_bot_recording(record_path, seed, engine.source, events, engine, trace)
+    return {
+        "events": len(events),
+        "victory": engine.victory,
+        "chars": engine.current_index,
+        "typed_seconds": typed_ms / 1000.0,
+        "busy_seconds": sum(latency.samples()) / 1000.0,
+        "latency_ms": latency.samples(),
+    }
+
+
+def run_typist_gui(profile: TypistProfile, source, seed: int = 0, speed: float = 1.0, record_path=None) -> dict:
+    """봇 입력을 실제 ``entry_var`` 경로로 흘려 넣고, 예정 시각보다 얼마나 밀리는지 잽니다.
+
+    화면(가상 디스플레이 포함)이 있어야 합니다.
+    """
+    root = _import_tk().Tk()
+    game = TypingBattleGame(root, source=source, seed=seed)
+    typist = SyntheticTypist(profile, seed)
+    lag = RollingHistogram(65536)
+    events = []
+    schedule = {"due": time.perf_counter(), "text": None}
+
+    def fire() -> None:
+        now = time.perf_counter()
+        if schedule["text"] is not None:
+            lag.add((now - schedule["due"]) * 1000.0)
+            game.entry_var.set(schedule["text"])
+        step = typist.next_event(game.entry_var.get(), game.engine)
+        if step is None:
+            root.after(300, root.quit)
+            return
+        delay, text = step
+        events.append([int(round(delay)), REPLAY_INPUT, text])
+        schedule["due"] += delay / 1000.0 / speed
+        schedule["text"] = text
+        root.after(max(0, int((schedule["due"] - time.perf_counter()) * 1000.0)), fire)
+
+    started = time.perf_counter()
+    root.after_idle(fire)
+    root.mainloop()
+    wall = time.perf_counter() - started
+    engine = game.engine
+    probe = game.probe.snapshot()
+    if record_path:
+        _save_bot_recording(record_path, seed, engine.source, events, engine, game.trace)
+    game.close()
+    root.destroy()
+    return {
+        "events": len(events),
+        "victory": engine.victory,
+        "chars": engine.current_index,
+        "typed_seconds": sum(event[0] for event in events) / 1000.0 / speed,
+        "wall_seconds": wall,
+        "lag_ms": lag.samples(),
+        "photon_p95_ms": probe["photon"]["p95"],
+        "render_p95_ms": probe["render"]["p95"],
+    }
+
+
+def _run_bot_task(task: tuple) -> dict:
+    name, seed, mode, speed, text, record_dir = task
+    profile = BOT_SCENARIOS[name]
+    source = open_text_source(text)
+    record_path = os.path.join(record_dir, f"bot-{name}-{seed}.jsonl") if record_dir else None
+    # 화면 없이 도는 봇은 tkinter를 불러오지 않습니다.
+    tcl_error = _import_tk().TclError if mode == "gui" else ()
+    try:
+        if mode == "gui":
+            result = run_typist_gui(profile, source, seed, speed, record_path)
+        else:
+            result = run_typist_direct(profile, source, seed, record_path)
+    except tcl_error as exc:
+        return {"scenario": name, "error": str(exc)}
+    finally:
+        source.close()
+    result["scenario"] = name
+    return result
+
+
+def run_bot_scenarios(names, bots: int = 8, mode: str = "direct", speed: float = 1.0, workers=None, text=None, record_dir=None) -> dict:
+    """시나리오마다 봇 여러 개를 프로세스 풀에서 돌리고 시나리오별로 합칩니다."""
+    if record_dir:
+        os.makedirs(record_dir, exist_ok=True)
+    tasks = [(name, seed, mode, speed, text, record_dir) for name in names for seed in range(bots)]
+    report = {name: {"bots": 0, "errors": [], "events": 0, "victories": 0, "typed_seconds": 0.0, "busy_seconds": 0.0, "wall_seconds": 0.0} for name in names}
+    samples = {name: RollingHistogram(1 << 20) for name in names}
+    extras = {name: [] for name in names}
+    with concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        for result in pool.map(_run_bot_task, tasks):
+            entry = report[result["scenario"]]
+            if "error" in result:
+                entry["errors"].append(result["error"])
+                continue
+            entry["bots"] += 1
+            entry["events"] += result["events"]
+            entry["victories"] += result["victory"]
+            entry["typed_seconds"] += result["typed_seconds"]
+            entry["busy_seconds"] += result.get("busy_seconds", 0.0)
+            entry["wall_seconds"] += result.get("wall_seconds", 0.0)
+            for value in result.get("latency_ms", result.get("lag_ms", [])):
+                samples[result["scenario"]].add(value)
+            if mode == "gui":
+                extras[result["scenario"]].append((result["photon_p95_ms"], result["render_p95_ms"]))
+    for name, entry in report.items():
+        entry["latency_ms"] = samples[name].summary()
+        entry["offered_rate"] = entry["events"] / max(entry["typed_seconds"], 1e-9)
+        if mode == "gui":
+            entry["achieved_rate"] = entry["events"] / max(entry["wall_seconds"], 1e-9)
+            entry["photon_p95_ms"] = max((photon for photon, _render in extras[name]), default=0.0)
+            entry["render_p95_ms"] = max((render for _photon, render in extras[name]), default=0.0)
+        else:
+            entry["capacity_rate"] = entry["events"] / max(entry["busy_seconds"], 1e-9)
+    return report
@@ -0,0 +1,805 @@
+"""명령줄 진입점. 하위 명령이 없으면 게임 창을 띄웁니다."""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import json
+import os
+import socket
+import sqlite3
+import struct
+import sys
+import time
+from pathlib import Path
+
+# 여기서는 가벼운 모듈만 가져옵니다. numpy·asyncio·tkinter를 끌고 오는 gui, net, bots, benches는
+# 그 모듈이 필요한 하위 명령 안에서 가져와 `Eos scores` 같은 명령이 빨리 뜨게 합니다.
+from .text import LINE_DISPLAY_COLUMNS
+from .packs import (
+    ContentPack, PACK_SUFFIX, SongLibrary, compile_content_pack, default_library_dir, open_text_source,
+)
+from .ingest import ingest_corpus
+from .ngram import NGRAM_SUFFIX
+from .replay import engine_state, load_recording, replay_headless
+from .store import STORE_QUEUE_SIZE, SessionStore, default_player, default_store_path, top_scores
+from .telemetry import TelemetryExporter, decode_telemetry, open_telemetry_sink
+
+
+def _describe_telemetry(events: list[dict], payload_bytes: int) -> str:
+    counts = {}
+    for event in events:
+        counts[event["type"]] = counts.get(event["type"], 0) + 1
+    kinds = ", ".join(f"{kind} {count}" for kind, count in sorted(counts.items()))
+    return f"이벤트 {len(events):,}개 ({kinds}), 압축 {payload_bytes:,} B"
+
+
+def _cmd_telemetry_collect(args: argparse.Namespace) -> int:
+    delay = args.delay_ms / 1000.0
+
+    def receive(payload: bytes) -> None:
+        print(_describe_telemetry(decode_telemetry(payload), len(payload)), flush=True)
+        if delay:
+            time.sleep(delay)
+
+    if args.file:
+        with open(args.file, "rb") as handle:
+            payload = handle.read()
+        print(_describe_telemetry(decode_telemetry(payload), len(payload)))
+        return 0
+    if args.http:
+        from http.server import BaseHTTPRequestHandler, HTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                receive(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                self.send_response(204)
+                self.end_headers()
+
+            def log_message(self, *_args) -> None:
+                pass
+
+        server = HTTPServer(("127.0.0.1", args.http), Handler)
+        print(f"http://127.0.0.1:{args.http}/ 에서 기다립니다", flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        server.server_close()
+        return 0
+    if os.path.exists(args.unix):
+        os.unlink(args.unix)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(args.unix)
+    listener.listen(4)
+    print(f"unix:{args.unix} 에서 기다립니다", flush=True)
+    try:
+        while True:
+            conn, _address = listener.accept()
+            with conn, conn.makefile("rb") as stream:
+                while True:
+                    header = stream.read(4)
+                    if len(header) < 4:
+                        break
+                    (size,) = struct.unpack("<I", header)
+                    receive(stream.read(size))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        listener.close()
+        os.unlink(args.unix)
+    return 0
+
+
+def _cmd_bench_telemetry(args: argparse.Namespace) -> int:
+    from .benches import TELEMETRY_MODES, benchmark_telemetry, check_telemetry_latency
+
+    results = [benchmark_telemetry(mode, args.keystrokes) for mode in TELEMETRY_MODES]
+    for result in results:
+        line = f"{result['mode']:<5} 키당 p50 {result['p50']:.2f} / p99 {result['p99']:.2f} / 최대 {result['max']:.0f} µs"
+        if "sent" in result:
+            line += f", 보냄 {result['sent']:,} / 버림 {result['dropped']:,} (묶음 {result['batches']:,}개, {result['bytes']:,} B)"
+        print(line)
+    failures = check_telemetry_latency(results)
+    for failure in failures:
+        print(f"기준 초과: {failure}")
+    return 1 if failures else 0
+
+
+def _cmd_bench_render(args: argparse.Namespace) -> int:
+    from .benches import benchmark_line_render
+
+    for label, incremental in (("전체 재작성", False), ("증분 렌더링", True)):
+        result = benchmark_line_render(args.error_rate, args.seed, incremental)
+        detail = ", ".join(f"{name} {count / result['keystrokes']:.2f}" for name, count in result["calls"].items())
+        print(f"{label}: 키당 Tk 호출 {result['calls_per_key']:.2f}회 ({detail})")
+    return 0
+
+
+def _cmd_bench_viewport(args: argparse.Namespace) -> int:
+    from .benches import benchmark_viewport
+
+    for line_count in args.lines:
+        result = benchmark_viewport(line_count, args.keystrokes, args.error_rate, args.seed)
+        print(
+            f"{result['lines']:>7,}줄: 키당 Tk 호출 {result['calls_per_key']:.2f}회 (최대 {result['max_calls_per_key']}회), "
+            f"키당 {result['us_per_key']:.2f} µs"
+        )
+    return 0
+
+
+def _cmd_bench_frames(args: argparse.Namespace) -> int:
+    from .benches import FRAME_SCENARIOS, benchmark_frames, check_frame_budgets
+    from .gui import _import_tk
+
+    tcl_error = _import_tk().TclError
+    try:
+        results = benchmark_frames(args.scenarios or FRAME_SCENARIOS, args.key_interval, args.seed)
+    except (RuntimeError, tcl_error) as exc:
+        print(f"화면을 열 수 없습니다: {exc}", file=sys.stderr)
+        return 2
+    for name, result in results.items():
+        top = ", ".join(f"{call} {count}" for call, count in result["top_calls"])
+        print(
+            f"{name:<10} 키당 {result['calls_per_key']:6.1f}회, 프레임당 {result['calls_per_frame']:5.1f}회, "
+            f"그 밖 {result['other_calls']}회, "
+            f"프레임 {result['frames']}개 {result['ms_per_frame']:.2f} ms, Tcl 합계 {result['tcl_ms']:.1f} ms ({top})"
+        )
+    failures = check_frame_budgets(results)
+    for failure in failures:
+        print(f"기준 초과: {failure}")
+    return 1 if failures else 0
+
+
+def _cmd_bench_launch(args: argparse.Namespace) -> int:
+    from .benches import LAUNCH_BUDGETS, LAUNCH_MODES, benchmark_launch
+
+    modes = ("import",) if args.import_only else LAUNCH_MODES
+    try:
+        results = benchmark_launch(args.rounds, modes)
+    except RuntimeError as exc:
+        print(f"화면을 열 수 없습니다: {exc} (--import-only로 가져오기 시간만 잴 수 있습니다)", file=sys.stderr)
+        return 2
+    labels = (("import_ms", "가져오기"), ("construct_ms", "생성"), ("first_frame_ms", "첫 프레임"), ("ready_ms", "입력 가능"))
+    for mode, summary in results.items():
+        parts = [f"{label} {summary[key]:.1f} ms" for key, label in labels if key in summary]
+        print(f"{mode:<7} " + ", ".join(parts) + (" (tkinter 가져옴)" if summary["tk_on_import"] else ""))
+    failures = []
+    if results["import"]["tk_on_import"]:
+        failures.append("모듈을 가져오기만 해도 tkinter를 불러옵니다")
+    if results["import"]["import_ms"] > LAUNCH_BUDGETS["import_ms"]:
+        failures.append(f"가져오기 {results['import']['import_ms']:.1f} ms > {LAUNCH_BUDGETS['import_ms']} ms")
+    fast = results.get("fast", {})
+    if fast.get("first_frame_ms", 0.0) > LAUNCH_BUDGETS["first_frame_ms"]:
+        failures.append(f"빠른 시작 첫 프레임 {fast['first_frame_ms']:.1f} ms > {LAUNCH_BUDGETS['first_frame_ms']} ms")
+    for failure in failures:
+        print(f"기준 초과: {failure}")
+    return 1 if failures else 0
+
+
+def _cmd_bench_trajectory(args: argparse.Namespace) -> int:
+    from .benches import benchmark_trajectories
+
+    result = benchmark_trajectories(args.missiles, args.seed)
+    print(f"미사일 {args.missiles:,}발, NumPy {'사용' if result['numpy'] else '없음'}")
+    print(f"매 프레임 계산: 미사일당 {result['per_frame']:.1f} µs")
+    print(f"궤적 테이블: 미사일당 {result['table']:.1f} µs")
+    print(f"템플릿 캐시: 미사일당 {result['cached']:.1f} µs (템플릿 {result['templates']}종)")
+    return 0
+
+
+def _cmd_bench_text(args: argparse.Namespace) -> int:
+    from .benches import benchmark_text_source
+
+    result = benchmark_text_source(args.megabytes, args.lookups, args.seed)
+    print(f"말뭉치 {result['megabytes']:.1f} MB, {result['lines']:,}줄, {result['chars']:,}자")
+    print(f"색인 생성 {result['build_seconds']:.2f}초, 색인 {result['index_bytes'] / 1024 / 1024:.1f} MB")
+    print(f"글자별 리스트로 만들 때 예상 메모리: {result['eager_bytes'] / 1024 / 1024:.1f} MB")
+    print(f"조회 중 최대 추적 메모리: {result['lookup_peak_bytes'] / 1024:.1f} KiB")
+    print(f"임의 위치 조회 {result['random_lookup_us']:.2f} µs, 순차 입력 키당 {result['sequential_key_us']:.2f} µs")
+    return 0
+
+
+def _cmd_bench_hangul(args: argparse.Namespace) -> int:
+    from .benches import benchmark_hangul_matcher
+
+    result = benchmark_hangul_matcher(args.rounds)
+    print(f"음절 {result['syllables']:,}개, IME 이벤트 {result['events']:,}회")
+    print(f"이벤트당 {result['ns_per_event']:.0f} ns, 판정 불일치 {result['mismatches']}건")
+    return 1 if result["mismatches"] else 0
+
+
+def _cmd_bots(args: argparse.Namespace) -> int:
+    from .bots import BOT_SCENARIOS, run_bot_scenarios
+
+    names = args.scenario or list(BOT_SCENARIOS)
+    report = run_bot_scenarios(names, args.bots, args.mode, args.speed, args.workers, args.text, args.record_dir)
+    failed = False
+    for name, entry in report.items():
+        latency = entry["latency_ms"]
+        print(f"[{name}] 봇 {entry['bots']}개, 입력 {entry['events']:,}회, 완주 {entry['victories']}/{entry['bots']}")
+        for error in entry["errors"][:1]:
+            failed = True
+            print(f"  실행 실패 {len(entry['errors'])}건: {error}", file=sys.stderr)
+        print(f"  봇이 보낸 속도 초당 {entry['offered_rate']:,.1f}회")
+        if args.mode == "gui":
+            print(f"  실제 처리 초당 {entry['achieved_rate']:,.1f}회, 예정 대비 지연 p50 {latency['p50']:.2f} / p95 {latency['p95']:.2f} / 최대 {latency['max']:.2f} ms")
+            print(f"  입력→화면 p95 {entry['photon_p95_ms']:.2f} ms, 입력→그리기 p95 {entry['render_p95_ms']:.2f} ms")
+        else:
+            print(f"  엔진 처리 p50 {latency['p50'] * 1000:.1f} / p95 {latency['p95'] * 1000:.1f} / p99 {latency['p99'] * 1000:.1f} µs")
+            print(f"  엔진만으로 감당할 수 있는 속도 초당 {entry['capacity_rate']:,.0f}회")
+    return 1 if failed else 0
+
+
+def _cmd_bench_stats(args: argparse.Namespace) -> int:
+    from .benches import benchmark_stats
+
+    result = benchmark_stats(args.keystrokes)
+    print(f"키 입력 {result['keystrokes']:,}회")
+    print(f"엔진만 {result['bare_ns']:.0f} ns/키, 통계 포함 {result['stats_ns']:.0f} ns/키")
+    print(f"통계 갱신 비용 {result['overhead_ns']:.0f} ns/키 ({result['overhead_ns'] / result['bare_ns'] * 100:.0f}%)")
+    return 0
+
+
+def _cmd_bench_store(args: argparse.Namespace) -> int:
+    from .benches import benchmark_store
+
+    ok = True
+    for label, delay in (("보통 디스크", 0.0), (f"느린 디스크 (배치당 {args.disk_delay:.0f} ms)", args.disk_delay)):
+        result = benchmark_store(args.records, args.queue_size, delay)
+        submit = result["submit_us"]
+        print(f"[{label}]")
+        print(f"  기록 {result['records']:,}건 제출 ({result['submit_seconds']:.2f}초): 접수 {result['accepted']:,}, 버림 {result['dropped']:,}")
+        print(
+            f"  submit 지연 p50 {submit['p50']:.1f} / p99 {submit['p99']:.1f} / 최대 {submit['max']:.1f} µs, "
+            f"1 ms 넘은 횟수 {result['stalls']:,}"
+        )
+        print(f"  저장 {result['stored']:,}건, 트랜잭션 {result['batches']:,}번, 초당 {result['rows_per_sec']:,.0f}건")
+        print(f"  곡별 상위 10개 {result['top_scores_ms']:.3f} ms, 개인 최고 {result['personal_best_ms']:.3f} ms")
+        if result["error"]:
+            print(f"  저장 오류: {result['error']}", file=sys.stderr)
+        # 1 ms를 넘는 드문 지연은 GIL 전환 간격(sys.getswitchinterval) 때문입니다.
+        # 디스크를 기다렸다면 느린 디스크 쪽에서 배치 지연만큼 막혔을 것입니다.
+        ok = ok and not result["error"] and result["stored"] == result["accepted"]
+        ok = ok and submit["max"] < max(args.disk_delay, 50.0) * 1000.0
+    return 0 if ok else 1
+
+
+def _cmd_scores(args: argparse.Namespace) -> int:
+    path = args.store or default_store_path()
+    if not os.path.exists(path):
+        print(f"{path}: 기록이 없습니다.")
+        return 0
+    connection = sqlite3.connect(path)
+    song = None
+    if args.song:
+        row = connection.execute(
+            "SELECT song FROM sessions WHERE title = ? OR song LIKE ? LIMIT 1", (args.song, args.song + "%")
+        ).fetchone()
+        if row is None:
+            print(f"'{args.song}' 곡 기록이 없습니다.")
+            return 0
+        song = row[0]
+    for rank, row in enumerate(top_scores(connection, song, args.player, args.limit), start=1):
+        when = time.strftime("%Y-%m-%d %H:%M", time.localtime(row["finished_at"]))
+        print(
+            f"{rank:>3}. {row['score']:>7.1f}  {row['player']:<12} {row['title']:<16} "
+            f"{row['cpm']:.0f}타 {row['accuracy']:.1f}% {'완주' if row['victory'] else '중단'}  {when}"
+        )
+    connection.close()
+    return 0
+
+
+def _parse_weak_ngrams(items) -> list[tuple[str, int]]:
+    weak = []
+    for item in items:
+        gram, _, weight = item.partition(":")
+        weak.append((gram, int(weight) if weight else 1))
+    return weak
+
+
+def _cmd_ngram_index(args: argparse.Namespace) -> int:
+    from .ngram import _iter_corpus_lines, build_ngram_index
+
+    started = time.perf_counter()
+    header = build_ngram_index(_iter_corpus_lines(args.inputs, args.columns), args.output)
+    print(f"{args.output}: 줄 {header['lines']:,}개, 조각 {header['terms']:,}개 ({time.perf_counter() - started:.1f}초)")
+    return 0
+
+
+def _cmd_drill(args: argparse.Namespace) -> int:
+    from .ngram import NgramIndex
+
+    index = NgramIndex(args.index)
+    weak = _parse_weak_ngrams(args.weak)
+    started = time.perf_counter()
+    ranked = index.query(weak, args.limit)
+    elapsed = (time.perf_counter() - started) * 1000.0
+    for score, line_id in ranked:
+        print(f"{score:>8} {index.line(line_id)}")
+    print(f"줄 {index.line_count:,}개에서 {elapsed:.2f} ms")
+    index.close()
+    return 0
+
+
+def _cmd_bench_ngram(args: argparse.Namespace) -> int:
+    from .benches import benchmark_ngram_index
+
+    result = benchmark_ngram_index(args.lines, args.queries, args.weak)
+    print(f"줄 {result['lines']:,}개, 조각 {result['terms']:,}개, 색인 {result['bytes'] / 1024 / 1024:.1f} MB ({result['build_seconds']:.1f}초)")
+    print(f"열기 {result['open_ms']:.2f} ms, 질의당 postings {result['postings_per_query']:,.0f}개")
+    print(f"질의 p50 {result['query_p50_ms']:.2f} ms, 최대 {result['query_max_ms']:.2f} ms ({'numpy' if result['numpy'] else '순수 파이썬'})")
+    return 0
+
+
+def _cmd_bench_startup(args: argparse.Namespace) -> int:
+    from .benches import benchmark_startup
+
+    result = benchmark_startup(args.lines, args.rounds)
+    print(f"{result['lines']:,}줄: 원문 {result['text_bytes'] / 1024 / 1024:.1f} MB, 팩 {result['pack_bytes'] / 1024 / 1024:.1f} MB")
+    print(f"팩 만들기 {result['compile_seconds']:.2f}초 (한 번만)")
+    print(f"원문 색인 경로 {result['text_ms']:.1f} ms, 팩 열기 {result['pack_ms']:.1f} ms (중앙값)")
+    print(f"기본 가사: 첫 실행 {result['builtin_first_ms']:.2f} ms, 캐시 사용 {result['builtin_cached_ms']:.2f} ms")
+    return 0
+
+
+def _cmd_pack(args: argparse.Namespace) -> int:
+    library = SongLibrary(args.library)
+    library.directory.mkdir(parents=True, exist_ok=True)
+    with open(args.input, encoding="utf-8") as handle:
+        lines = handle.read().split("\n")
+    title = args.title or Path(args.input).stem
+    path = library.directory / (Path(args.input).stem + PACK_SUFFIX)
+    header = compile_content_pack(lines, path, title)
+    print(f"{path}: {header['lines']:,}줄, {header['chars']:,}자, sha256 {header['sha256'][:16]}")
+    return 0
+
+
+def _cmd_ingest(args: argparse.Namespace) -> int:
+    def progress(entry: dict, totals: dict, elapsed: float) -> None:
+        if args.verbose:
+            print(f"{entry['source']}: 스테이지 {len(entry['stages'])}개")
+        elif totals["files"] % 100 == 0:
+            print(f"파일 {totals['files']:,}개, {totals['bytes'] / 1024 / 1024 / max(elapsed, 1e-9):.1f} MB/s")
+
+    output = args.output or str(SongLibrary(args.library).directory)
+    result = ingest_corpus(args.inputs, output, args.workers, args.stage_lines, args.columns, progress)
+    print(
+        f"파일 {result['files']:,}개 처리 (건너뜀 {result['skipped']:,}, 실패 {result['failed']:,}), "
+        f"스테이지 {result['stages']:,}개"
+    )
+    print(f"{result['bytes'] / 1024 / 1024:.1f} MB / {result['seconds']:.2f}초 = {result['mb_per_sec']:.1f} MB/s")
+    return 1 if result["failed"] else 0
+
+
+def _cmd_serve(args: argparse.Namespace) -> int:
+    import asyncio
+
+    from .net import RACE_DEFAULT_PORT, RACE_ROOM_SIZE, RaceServer
+
+    server = RaceServer(open_text_source(args.text), args.room_size or RACE_ROOM_SIZE)
+    port = RACE_DEFAULT_PORT if args.port is None else args.port
+
+    def ready(listener) -> None:
+        where = args.unix or ", ".join(str(sock.getsockname()) for sock in listener.sockets)
+        print(f"레이스 서버 대기 중: {where}")
+
+    try:
+        asyncio.run(server.serve(args.host, port, args.unix, ready))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def _cmd_loadtest(args: argparse.Namespace) -> int:
+    from .benches import benchmark_race_server
+    from .net import RACE_ROOM_SIZE
+
+    result = benchmark_race_server(
+        args.clients, args.keys, args.rate, args.error_rate, args.room_size or RACE_ROOM_SIZE, args.ramp, args.text,
+        args.unix,
+    )
+    server = result["server_latency_ms"]
+    rtt = result["round_trip_ms"]
+    print(f"클라이언트 {result['clients']:,}명 (실패 {result['failed']:,}), 키 입력 {result['keystrokes']:,}회 / {result['seconds']:.1f}초")
+    if result["first_error"]:
+        print(f"첫 실패: {result['first_error']}", file=sys.stderr)
+    print(f"서버 처리 지연 p50 {server['p50']:.3f} / p95 {server['p95']:.3f} / p99 {server['p99']:.3f} / 최대 {server['max']:.3f} ms")
+    print(f"왕복 지연 p50 {rtt['p50']:.2f} / p95 {rtt['p95']:.2f} / p99 {rtt['p99']:.2f} ms")
+    print(f"서버 CPU {result['server_cpu_seconds']:.2f}초, 동시 세션 최대 {result['peak_sessions']:,}")
+    print(f"코어당 세션 수 (추정): {result['sessions_per_core']:,.0f}")
+    return 1 if result["failed"] else 0
+
+
+def _cmd_spectate(args: argparse.Namespace) -> int:
+    from .net import SpectatorDecoder, render_spectator_line
+
+    import stat as stat_module
+
+    state = SpectatorDecoder()
+    if stat_module.S_ISSOCK(os.stat(args.stream).st_mode):
+        stream = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        stream.connect(args.stream)
+        read = lambda: stream.recv(65536)
+    else:
+        stream = open(args.stream, "rb")
+        read = lambda: stream.read(65536)
+    interval = 1.0 / args.fps
+    drawn = 0.0
+    try:
+        while True:
+            data = read()
+            if data:
+                state.feed(data)
+            elif isinstance(stream, socket.socket):
+                break
+            elif not args.follow:
+                break
+            else:
+                time.sleep(interval)
+            now = time.monotonic()
+            if state.synced and now - drawn >= interval:
+                drawn = now
+                sys.stdout.write("\r\x1b[K" + render_spectator_line(state))
+                sys.stdout.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stream.close()
+    if state.synced:
+        sys.stdout.write("\r\x1b[K" + render_spectator_line(state) + "\n")
+    return 0
+
+
+def _cmd_bench_spectate(args: argparse.Namespace) -> int:
+    from .benches import benchmark_spectators
+
+    result = benchmark_spectators(args.viewers, args.keystrokes, args.rate)
+    print(f"관전자 {result['viewers']:,}명, 키 입력 {result['keystrokes']:,}회")
+    print(f"키당 {result['bytes_per_keystroke']:.2f} B, 관전자당 {result['bytes_per_viewer_sec'] / 1024:.2f} KiB/s")
+    print(f"인코딩 키당 {result['encode_us_per_key']:.1f} µs (게임 스레드)")
+    print(f"송신 스레드 CPU {result['fanout_cpu_seconds']:.2f}초, 관전자·키당 {result['fanout_us_per_viewer_key']:.2f} µs")
+    print(f"끊긴 관전자 {result['dropped']:,}명, 최종 상태 일치 {result['in_sync']:,}/{result['viewers']:,}")
+    return 0 if result["in_sync"] == result["viewers"] else 1
+
+
+def _cmd_replay(args: argparse.Namespace) -> int:
+    from .gui import TypingBattleGame, _import_tk
+
+    header, events, footer = load_recording(args.recording)
+    if args.gui:
+        root = _import_tk().Tk()
+        game = TypingBattleGame(root, source=open_text_source(header.get("text")), seed=header["seed"])
+        game.replay(events, args.speed)
+        game.run()
+    if game.watchdog_summary:
+        print(game.watchdog_summary, file=sys.stderr)
+        engine, trace = game.engine, game.trace
+    else:
+        started = time.perf_counter()
+        engine, trace = replay_headless(header, events)
+        elapsed = time.perf_counter() - started
+        print(f"입력 이벤트 {len(events):,}개를 {elapsed:.3f}초에 재생 ({len(events) / max(elapsed, 1e-9):,.0f}개/초)")
+
+    state = engine_state(engine)
+    print(f"최종 상태: {json.dumps(state, ensure_ascii=False)}")
+    print(f"이벤트 해시: {trace.hexdigest()} ({trace.count}개)")
+    if header.get("text_sha256") and header["text_sha256"] != engine.source.content_digest():
+        print("본문이 기록할 때와 다릅니다.", file=sys.stderr)
+        return 1
+    if footer and (footer.get("final") != state or footer.get("trace_sha256") != trace.hexdigest()):
+        print("기록된 최종 상태/이벤트 해시와 일치하지 않습니다.", file=sys.stderr)
+        return 1
+    return 0
+
+
+def _cmd_bench_engine(args: argparse.Namespace) -> int:
+    from .benches import benchmark_engine
+
+    result = benchmark_engine(args.keystrokes, args.error_rate, args.seed)
+    print(f"키 입력 {result['keystrokes']:,}회 / {result['seconds']:.3f}초")
+    print(f"초당 키 입력: {result['keystrokes_per_sec']:,.0f}")
+    print(f"키당 잔존 할당: {result['retained_bytes_per_key']:.3f} B")
+    print(f"최대 일시 할당: {result['peak_transient_bytes']:,} B")
+    if args.min_rate and result["keystrokes_per_sec"] < args.min_rate:
+        print(f"기준 미달: 초당 {args.min_rate:,.0f}회 이상이어야 합니다.", file=sys.stderr)
+        return 1
+    return 0
+
+
+def _int_at_least(minimum: int):
+    def parse(value: str) -> int:
+        number = int(value)
+        if number < minimum:
+            raise argparse.ArgumentTypeError(f"{minimum} 이상이어야 합니다: {value}")
+        return number
+
+    return parse
+
+
+class _LazyChoices:
+    """``module.name``을 처음 검사하거나 도움말을 찍을 때 가져오는 argparse ``choices``.
+
+    선택지가 무거운 모듈에 있어도 그 인자를 쓰지 않는 명령은 모듈을 가져오지 않습니다.
+    argparse가 인자를 등록할 때 선택지를 훑지 않도록 ``metavar``를 함께 지정해야 합니다.
+    """
+
+    def __init__(self, module: str, name: str) -> None:
+        self._module = module
+        self._name = name
+
+    def _load(self):
+        return getattr(importlib.import_module(self._module, __package__), self._name)
+
+    def __contains__(self, value) -> bool:
+        return value in self._load()
+
+    def __iter__(self):
+        return iter(self._load())
+
+
+def _build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="Eos", description="타자 연습 보스전 게임")
+    parser.add_argument(
+        "--max-missiles",
+        type=_int_at_least(1),
+        help="동시에 날 수 있는 미사일 수",
+    )
+    parser.add_argument(
+        "--burst",
+        choices=_LazyChoices(".gui", "BURST_POLICIES"),
+        metavar="POLICY",
+        help="한 번에 여러 글자가 들어왔을 때 미사일을 보여 주는 방식 (%(choices)s)",
+    )
+    parser.add_argument("--overlay", action="store_true", help="지연 시간 오버레이를 켭니다 (F3으로 전환)")
+    parser.add_argument("--metrics-out", help="지연 시간 통계를 JSON Lines로 1초마다 덧붙일 파일")
+    parser.add_argument("--latency-budget", type=float, default=50.0, help="입력→화면 p95 지연 예산 (ms)")
+    parser.add_argument("--seed", type=int, help="연출용 난수 시드 (기록·재생용)")
+    parser.add_argument("--record", help="이번 세션의 입력을 리플레이 파일로 저장합니다")
+    parser.add_argument("--text", help="가사 대신 입력할 UTF-8 텍스트 파일 또는 콘텐츠 팩 (메모리 매핑)")
+    parser.add_argument("--library", help=f"콘텐츠 팩 폴더 (기본값: {default_library_dir()})")
+    parser.add_argument("--player", help=f"기록에 남길 이름 (기본값: {default_player()})")
+    parser.add_argument("--store", help=f"기록 DB 경로 (기본값: {default_store_path()})")
+    parser.add_argument("--no-store", dest="use_store", action="store_false", help="판 기록을 저장하지 않습니다")
+    parser.add_argument(
+        "--telemetry",
+        metavar="TARGET",
+        help="게임 이벤트를 보낼 수집기 (파일 경로, unix:소켓 경로, http://주소)",
+    )
+    parser.add_argument(
+        "--fast-start",
+        action="store_true",
+        help="빈 창을 먼저 띄우고 나머지 위젯은 유휴 시간에 나눠 만듭니다",
+    )
+    parser.add_argument(
+        "--watchdog",
+        type=float,
+        metavar="MS",
+        help="이벤트 루프가 MS 넘게 멈추면 메인 스레드 스택을 표본 추출합니다",
+    )
+    parser.add_argument("--watchdog-out", help="멈춤 표본을 접힌 스택 형식으로 저장할 파일")
+    parser.add_argument("--drill-index", help=f"약점 연습 판을 만들 n-gram 색인 (*{NGRAM_SUFFIX})")
+    parser.add_argument("--spectator-socket", help="관전 스트림을 내보낼 유닉스 소켓 경로")
+    parser.add_argument("--spectator-file", help="관전 스트림을 덧붙일 파일")
+    parser.add_argument(
+        "--no-trajectory-cache",
+        dest="trajectory_cache",
+        action="store_false",
+        help="미사일마다 궤적을 새로 계산합니다",
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    replay = commands.add_parser("replay", help="기록한 세션을 다시 실행하고 결과를 검증합니다")
+    replay.add_argument("recording")
+    replay.add_argument("--gui", action="store_true", help="화면에서 원래 속도로 재생합니다")
+    replay.add_argument("--speed", type=float, default=1.0, help="--gui 재생 배속")
+    replay.set_defaults(handler=_cmd_replay)
+
+    bench_engine = commands.add_parser("bench-engine", help="화면 없이 입력 처리 속도를 측정합니다")
+    bench_engine.add_argument("--keystrokes", type=int, default=2_000_000)
+    bench_engine.add_argument("--error-rate", type=float, default=0.05)
+    bench_engine.add_argument("--seed", type=int, default=0)
+    bench_engine.add_argument("--min-rate", type=float, default=0.0, help="초당 키 입력 하한 (미달 시 종료 코드 1)")
+    bench_engine.set_defaults(handler=_cmd_bench_engine)
+
+    bench_render = commands.add_parser("bench-render", help="현재 줄 표시의 키당 Tk 호출 수를 비교합니다")
+    bench_render.add_argument("--error-rate", type=float, default=0.05)
+    bench_render.add_argument("--seed", type=int, default=0)
+    bench_render.set_defaults(handler=_cmd_bench_render)
+
+    bench_viewport = commands.add_parser("bench-viewport", help="가사 길이에 따른 가사 뷰의 키당 Tk 호출 수를 비교합니다")
+    bench_viewport.add_argument("--lines", type=int, nargs="+", default=[4, 40_000])
+    bench_viewport.add_argument("--keystrokes", type=int, default=100_000)
+    bench_viewport.add_argument("--error-rate", type=float, default=0.05)
+    bench_viewport.add_argument("--seed", type=int, default=0)
+    bench_viewport.set_defaults(handler=_cmd_bench_viewport)
+
+    bench_frames = commands.add_parser("bench-frames", help="실제 화면(Xvfb)에서 시나리오별 Tcl 호출 수와 프레임 시간을 잽니다")
+    bench_frames.add_argument(
+        "--scenarios",
+        nargs="+",
+        choices=_LazyChoices(".benches", "FRAME_SCENARIOS"),
+        metavar="SCENARIO",
+        help="%(choices)s 가운데 고릅니다 (기본값: 전부)",
+    )
+    bench_frames.add_argument("--key-interval", type=int, default=80, help="입력 간격 (ms)")
+    bench_frames.add_argument("--seed", type=int, default=0)
+    bench_frames.set_defaults(handler=_cmd_bench_frames)
+
+    bench_launch = commands.add_parser("bench-launch", help="모듈 가져오기와 첫 프레임까지의 시간을 잽니다")
+    bench_launch.add_argument("--rounds", type=int, default=5)
+    bench_launch.add_argument("--import-only", action="store_true", help="화면 없이 가져오기 시간만 잽니다")
+    bench_launch.set_defaults(handler=_cmd_bench_launch)
+
+    collect = commands.add_parser("telemetry-collect", help="텔레메트리를 받아 보여 주는 로컬 수집기 대역")
+    collect_target = collect.add_mutually_exclusive_group(required=True)
+    collect_target.add_argument("--unix", help="유닉스 소켓 경로")
+    collect_target.add_argument("--http", type=int, metavar="PORT", help="HTTP 포트")
+    collect_target.add_argument("--file", help="저장된 텔레메트리 파일을 요약합니다")
+    collect.add_argument("--delay-ms", type=float, default=0.0, help="묶음마다 일부러 늦게 받습니다")
+    collect.set_defaults(handler=_cmd_telemetry_collect)
+
+    bench_telemetry = commands.add_parser("bench-telemetry", help="텔레메트리 내보내기가 키 처리 지연에 주는 영향을 잽니다")
+    bench_telemetry.add_argument("--keystrokes", type=int, default=200_000)
+    bench_telemetry.set_defaults(handler=_cmd_bench_telemetry)
+
+    bench_trajectory = commands.add_parser("bench-trajectory", help="미사일 궤적 계산 비용을 비교합니다")
+    bench_trajectory.add_argument("--missiles", type=int, default=20_000)
+    bench_trajectory.add_argument("--seed", type=int, default=0)
+    bench_trajectory.set_defaults(handler=_cmd_bench_trajectory)
+
+    bench_text = commands.add_parser("bench-text", help="메모리 매핑 텍스트 소스의 색인 비용을 측정합니다")
+    bench_text.add_argument("--megabytes", type=int, default=64)
+    bench_text.add_argument("--lookups", type=int, default=200_000)
+    bench_text.add_argument("--seed", type=int, default=0)
+    bench_text.set_defaults(handler=_cmd_bench_text)
+
+    bench_hangul = commands.add_parser("bench-hangul", help="한글 전체 음절의 IME 조합 판정 속도를 측정합니다")
+    bench_hangul.add_argument("--rounds", type=int, default=5)
+    bench_hangul.set_defaults(handler=_cmd_bench_hangul)
+
+    pack = commands.add_parser("pack", help="텍스트 파일을 콘텐츠 팩으로 만들어 곡 목록에 추가합니다")
+    pack.add_argument("input")
+    pack.add_argument("--title", help="곡 목록에 보일 제목 (기본값: 파일 이름)")
+    pack.add_argument("--library", help="팩을 넣을 폴더")
+    pack.set_defaults(handler=_cmd_pack)
+
+    ingest = commands.add_parser("ingest", help="텍스트 폴더를 여러 프로세스로 스테이지 팩으로 만듭니다")
+    ingest.add_argument("inputs", nargs="+", help="입력 파일 또는 폴더 (.txt .lrc .srt .vtt .md)")
+    ingest.add_argument("--output", help="팩과 매니페스트를 쓸 폴더 (기본값: 곡 목록 폴더)")
+    ingest.add_argument("--library", help="--output이 없을 때 쓸 콘텐츠 팩 폴더")
+    ingest.add_argument("--workers", type=int, help="프로세스 수 (기본값: CPU 수)")
+    ingest.add_argument("--stage-lines", type=int, default=40, help="스테이지 하나의 줄 수")
+    ingest.add_argument("--columns", type=_int_at_least(2), default=LINE_DISPLAY_COLUMNS, help="한 줄의 최대 표시 폭 (2 이상)")
+    ingest.add_argument("-v", "--verbose", action="store_true")
+    ingest.set_defaults(handler=_cmd_ingest)
+
+    serve = commands.add_parser("serve", help="여러 명이 같은 보스를 상대하는 레이스 서버를 띄웁니다")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int)
+    serve.add_argument("--unix", help="TCP 대신 쓸 유닉스 소켓 경로")
+    serve.add_argument("--room-size", type=int)
+    serve.set_defaults(handler=_cmd_serve)
+
+    loadtest = commands.add_parser("loadtest", help="가상 클라이언트 수천 개로 레이스 서버 부하를 측정합니다")
+    loadtest.add_argument("--clients", type=int, default=2000)
+    loadtest.add_argument("--keys", type=int, default=100, help="클라이언트마다 보낼 키 입력 수")
+    loadtest.add_argument("--rate", type=float, default=5.0, help="클라이언트당 초당 키 입력 수")
+    loadtest.add_argument("--error-rate", type=float, default=0.05)
+    loadtest.add_argument("--room-size", type=int)
+    loadtest.add_argument("--ramp", type=float, default=5.0, help="클라이언트를 나눠 붙이는 시간 (초)")
+    loadtest.add_argument("--unix", action="store_true", help="유닉스 소켓으로 연결합니다")
+    loadtest.set_defaults(handler=_cmd_loadtest)
+
+    spectate = commands.add_parser("spectate", help="관전 스트림(유닉스 소켓 또는 파일)을 터미널에 보여 줍니다")
+    spectate.add_argument("stream")
+    spectate.add_argument("--follow", action="store_true", help="파일 끝에서 기다리며 계속 읽습니다")
+    spectate.add_argument("--fps", type=float, default=20.0)
+    spectate.set_defaults(handler=_cmd_spectate)
+
+    bench_spectate = commands.add_parser("bench-spectate", help="관전 스트림 대역폭과 관전자당 CPU를 측정합니다")
+    bench_spectate.add_argument("--viewers", type=int, default=300)
+    bench_spectate.add_argument("--keystrokes", type=int, default=2000)
+    bench_spectate.add_argument("--rate", type=float, default=200.0, help="초당 키 입력 수")
+    bench_spectate.set_defaults(handler=_cmd_bench_spectate)
+
+    bots = commands.add_parser("bots", help="합성 타자 봇으로 입력 경로에 부하를 걸고 시나리오별로 보고합니다")
+    bots.add_argument(
+        "--scenario",
+        action="append",
+        choices=_LazyChoices(".bots", "BOT_SCENARIOS"),
+        metavar="SCENARIO",
+        help="%(choices)s 가운데 고릅니다. 여러 번 지정 가능 (기본값: 전부)",
+    )
+    bots.add_argument("--bots", type=int, default=8, help="시나리오마다 돌릴 봇 수")
+    bots.add_argument("--mode", choices=("direct", "gui"), default="direct", help="엔진 직접 구동 또는 화면의 entry_var 경로")
+    bots.add_argument("--speed", type=float, default=1.0, help="gui 모드 배속")
+    bots.add_argument("--workers", type=int, help="프로세스 수 (기본값: CPU 수)")
+    bots.add_argument("--record-dir", help="봇마다 리플레이 파일을 저장할 폴더")
+    bots.set_defaults(handler=_cmd_bots)
+
+    bench_stats = commands.add_parser("bench-stats", help="타자 통계 갱신 비용을 측정합니다")
+    bench_stats.add_argument("--keystrokes", type=int, default=1_000_000)
+    bench_stats.set_defaults(handler=_cmd_bench_stats)
+
+    scores = commands.add_parser("scores", help="저장된 기록으로 순위표를 보여 줍니다")
+    scores.add_argument("--song", help="곡 제목 또는 본문 해시 앞부분")
+    scores.add_argument("--player")
+    scores.add_argument("--limit", type=int, default=10)
+    scores.add_argument("--store", help="기록 DB 경로")
+    scores.set_defaults(handler=_cmd_scores)
+
+    bench_store = commands.add_parser("bench-store", help="기록 저장 스레드를 포화시켜 UI 쪽이 막히지 않는지 확인합니다")
+    bench_store.add_argument("--records", type=int, default=100_000)
+    bench_store.add_argument("--queue-size", type=int, default=STORE_QUEUE_SIZE)
+    bench_store.add_argument("--disk-delay", type=float, default=200.0, help="느린 디스크 시나리오의 배치당 지연 (ms)")
+    bench_store.set_defaults(handler=_cmd_bench_store)
+
+    ngram_index = commands.add_parser("ngram-index", help="텍스트 말뭉치로 약점 연습용 n-gram 색인을 만듭니다")
+    ngram_index.add_argument("inputs", nargs="+", help="입력 파일 또는 폴더")
+    ngram_index.add_argument("--output", required=True, help=f"색인 파일 (*{NGRAM_SUFFIX})")
+    ngram_index.add_argument("--columns", type=_int_at_least(2), default=LINE_DISPLAY_COLUMNS)
+    ngram_index.set_defaults(handler=_cmd_ngram_index)
+
+    drill = commands.add_parser("drill", help="약한 조각이 많이 든 줄을 찾습니다")
+    drill.add_argument("index")
+    drill.add_argument("weak", nargs="+", help="조각[:틀린 횟수] (예: 닳도:3)")
+    drill.add_argument("--limit", type=int, default=8)
+    drill.set_defaults(handler=_cmd_drill)
+
+    bench_ngram = commands.add_parser("bench-ngram", help="n-gram 색인 생성과 질의 속도를 측정합니다")
+    bench_ngram.add_argument("--lines", type=int, default=1_000_000)
+    bench_ngram.add_argument("--queries", type=int, default=50)
+    bench_ngram.add_argument("--weak", type=int, default=24, help="질의당 약한 조각 수")
+    bench_ngram.set_defaults(handler=_cmd_bench_ngram)
+
+    bench_startup = commands.add_parser("bench-startup", help="원문 색인과 콘텐츠 팩 열기의 시작 비용을 비교합니다")
+    bench_startup.add_argument("--lines", type=int, default=200_000)
+    bench_startup.add_argument("--rounds", type=int, default=5)
+    bench_startup.set_defaults(handler=_cmd_bench_startup)
+
+    return parser
+
+
+def main(argv=None) -> None:
+    args = _build_arg_parser().parse_args(argv)
+    if args.command is not None:
+        sys.exit(args.handler(args))
+    from .gui import BURST_EACH, TypingBattleGame, _import_tk
+    from .ngram import NgramIndex
+
+    library = SongLibrary(args.library)
+    if args.text:
+        source = open_text_source(args.text)
+    else:
+        try:
+            source = ContentPack(library.ensure_builtin())
+        except (OSError, ValueError):
+            source, library = None, None
+    store = SessionStore(args.store) if args.use_store else None
+    root = _import_tk().Tk()
+    game = TypingBattleGame(
+        root,
+        max_missiles=TypingBattleGame.MISSILE_CAPACITY if args.max_missiles is None else args.max_missiles,
+        trajectory_cache=args.trajectory_cache,
+        source=source,
+        burst_policy=args.burst or BURST_EACH,
+        overlay=args.overlay,
+        metrics_out=args.metrics_out,
+        latency_budget_ms=args.latency_budget,
+        seed=args.seed,
+        record_path=args.record,
+        library=library,
+        spectator_socket=args.spectator_socket,
+        spectator_file=args.spectator_file,
+        store=store,
+        player=args.player,
+        drill_index=NgramIndex(args.drill_index) if args.drill_index else None,
+        watchdog_ms=args.watchdog,
+        watchdog_out=args.watchdog_out,
+        fast_start=args.fast_start,
+        telemetry=TelemetryExporter(open_telemetry_sink(args.telemetry)) if args.telemetry else None,
+    )
+    game.run()
+    if game.watchdog_summary:
+        print(game.watchdog_summary, file=sys.stderr)
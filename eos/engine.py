@@ -0,0 +1,151 @@
+"""화면 없이 돌아가는 타자 규칙 엔진."""
+
+from __future__ import annotations
+
+from .text import (
+    HANGUL_BASE, HANGUL_COUNT, HangulMatcher, LYRICS_LINES, LineTextSource, MATCH_PARTIAL, MATCH_WRONG,
+)
+
+EVENT_CORRECT = "correct"
+EVENT_WRONG = "wrong"
+EVENT_LINE_CHANGE = "line_change"
+EVENT_FINISH = "finish"
+
+
+class TypingEngine:
+    """화면 없이 동작하는 보스전 규칙 엔진.
+
+    입력 문자를 받아 상태를 갱신하고, 구독자에게 ``(event, *args)`` 형태로
+    이벤트를 전달합니다. GUI는 이 이벤트를 받아 화면만 그립니다.
+    """
+
+    def __init__(self, source=LYRICS_LINES) -> None:
+        self.matcher = HangulMatcher()
+        self._listeners = []
+        self.load_source(source)
+
+    def load_source(self, source) -> None:
+        if not isinstance(source, LineTextSource):
+            source = LineTextSource(source)
+        if source.total_chars == 0:
+            raise ValueError("입력할 글자가 없는 텍스트입니다.")
+        self.source = source
+        self.total_chars = source.total_chars
+        self.boss_damage_per_hit = 100.0 / float(self.total_chars)
+        self.reset()
+
+    def reset(self) -> None:
+        self.boss_hp = 100.0
+        self.current_index = 0
+        self.current_line_index = 0
+        self._line = self.source.line(0)
+        self._col = 0
+        self.game_over = False
+        self.victory = False
+
+    def subscribe(self, listener) -> None:
+        self._listeners.append(listener)
+
+    def unsubscribe(self, listener) -> None:
+        self._listeners.remove(listener)
+
+    def _emit(self, event: str, *args) -> None:
+        for listener in self._listeners:
+            listener(event, *args)
+
+    def expected_char(self):
+        if self.current_index < self.total_chars:
+            return self._line[self._col]
+        return None
+
+    def following_char(self):
+        col = self._col + 1
+        if col < len(self._line):
+            return self._line[col]
+        if self.current_line_index + 1 < self.source.line_count:
+            return self.source.line(self.current_line_index + 1)[0]
+        return None
+
+    def feed_text(self, text: str) -> str:
+        """입력창 내용을 처리하고, 아직 조합 중이라 입력창에 남겨 둘 글자를 돌려줍니다."""
+        last = len(text) - 1
+        for pos, ch in enumerate(text):
+            if self.game_over:
+                return ""
+            if pos == last and (self.is_composing_char(ch) or 0 <= ord(ch) - HANGUL_BASE < HANGUL_COUNT):
+                expected = self.expected_char()
+                state = self.matcher.classify(ch, expected, self.following_char())
+                if state == MATCH_PARTIAL:
+                    return ch
+                if state == MATCH_WRONG and expected is not None:
+                    self._handle_wrong_input(ch, expected)
+                    return ""
+            self.process_char(ch)
+        return ""
+
+    def process_char(self, ch: str) -> bool:
+        if self.game_over:
+            return False
+        if not ch or ch == "\r" or ch == "\n":
+            return False
+
+        expected = self.expected_char()
+        if expected is None:
+            return False
+
+        if self.is_composing_char(ch):
+            return False
+
+        if ch.strip() == "" and expected != " ":
+            return False
+
+        if ch == expected:
+            self._handle_correct_input()
+        else:
+            self._handle_wrong_input(ch, expected)
+        return True
+
+    def _handle_correct_input(self) -> None:
+        previous_line_idx = self.current_line_index
+
+        self.current_index += 1
+        self.boss_hp = max(0.0, self.boss_hp - self.boss_damage_per_hit)
+        self._col += 1
+        if self._col >= len(self._line) and self.current_index < self.total_chars:
+            self.current_line_index += 1
+            self._line = self.source.line(self.current_line_index)
+            self._col = 0
+
+        self._emit(EVENT_CORRECT, self.current_index, previous_line_idx)
+        if self.current_line_index != previous_line_idx:
+            self._emit(EVENT_LINE_CHANGE, previous_line_idx, self.current_line_index)
+
+        if self.current_index >= self.total_chars:
+            self.finish(victory=True)
+
+    def _handle_wrong_input(self, ch: str, expected: str) -> None:
+        self._emit(EVENT_WRONG, ch, expected)
+
+    def finish(self, victory: bool) -> None:
+        if self.game_over:
+            return
+        self.game_over = True
+        self.victory = victory
+        self._emit(EVENT_FINISH, victory)
+
+    def line_state(self) -> tuple[int, str, int, str]:
+        idx = self.current_line_index
+        next_line = self.source.line(idx + 1) if idx + 1 < self.source.line_count else ""
+        return idx, self._line, self._col, next_line
+
+    @staticmethod
+    def is_composing_char(ch: str) -> bool:
+        if not ch:
+            return False
+        code = ord(ch)
+        return (
+            0x1100 <= code <= 0x11FF
+            or 0x3130 <= code <= 0x318F
+            or 0xA960 <= code <= 0xA97F
+            or 0xD7B0 <= code <= 0xD7FF
+        )
@@ -0,0 +1,934 @@
+"""tkinter 보스전 화면."""
+
+from __future__ import annotations
+
+import os
+import random
+import time
+import weakref
+
+from .text import LINE_DISPLAY_COLUMNS, LYRICS_LINES, LineTextSource
+from .packs import ContentPack, SongLibrary
+from .engine import EVENT_CORRECT, EVENT_FINISH, EVENT_LINE_CHANGE, EVENT_WRONG, TypingEngine
+from .stats import LATENCY_STAGES, LatencyProbe, TypingStats
+from .replay import REPLAY_INPUT, REPLAY_RESTART, SessionRecorder, TraceDigest, engine_state
+from .store import default_player, session_record
+from .net import SPECTATE_KEYFRAME_INTERVAL, SpectatorEncoder, SpectatorHub
+from .telemetry import TELEMETRY_KEY, TELEMETRY_RESULT, TELEMETRY_TIMING
+from .render import (
+    EntityGroup, FrameClock, LineRenderer, LyricsViewport, MissilePool, TimerRegistry, TrajectoryCache,
+    VIEWPORT_AFTER, VIEWPORT_BEFORE, bezier_trajectory,
+)
+from .watchdog import StallWatchdog
+
+# tkinter는 창을 띄울 때 _import_tk()로 불러옵니다. 명령줄 도구와 서버는 Tk 없이 시작합니다.
+tk = ttk = font = None
+
+
+def _import_tk():
+    global tk, ttk, font
+    if tk is None:
+        import tkinter
+        from tkinter import font as tk_font, ttk as tk_ttk
+
+        tk, ttk, font = tkinter, tk_ttk, tk_font
+    return tk
+
+
+BURST_EACH = "each"
+BURST_MERGE = "merge"
+BURST_INSTANT = "instant"
+BURST_POLICIES = (BURST_EACH, BURST_MERGE, BURST_INSTANT)
+
+
+class FontCache:
+    """루트 창마다 하나씩 두는 글꼴 캐시.
+
+    같은 글꼴을 다시 만들지 않고, 줄 높이 같은 측정값도 글꼴마다 한 번만
+    Tk에 묻습니다.
+    """
+
+    _by_root = weakref.WeakKeyDictionary()
+
+    def __init__(self) -> None:
+        self._fonts = {}
+        self._metrics = {}
+
+    @classmethod
+    def for_root(cls, root) -> "FontCache":
+        cache = cls._by_root.get(root)
+        if cache is None:
+            cache = cls._by_root[root] = cls()
+        return cache
+
+    def get(self, family: str, size: int, weight: str = "normal"):
+        key = (family, size, weight)
+        found = self._fonts.get(key)
+        if found is None:
+            found = self._fonts[key] = font.Font(family=family, size=size, weight=weight)
+        return found
+
+    def linespace(self, font_obj) -> int:
+        key = id(font_obj)
+        value = self._metrics.get(key)
+        if value is None:
+            value = self._metrics[key] = font_obj.metrics("linespace")
+        return value
+
+
+class TypingBattleGame:
+    CANVAS_WIDTH = 420
+    CANVAS_HEIGHT = 120
+
+    PLAYER_POS = (40, 20, 120, 100)
+    BOSS_POS = (300, 20, 380, 100)
+
+    HP_BAR_WIDTH = CANVAS_WIDTH
+    HP_BAR_HEIGHT = 22
+
+    MISSILE_CAPACITY = 24
+    KNOCKBACK_STEP = 3.0
+    KNOCKBACK_MAX = 6.0
+
+    DRILL_TITLE = "약점 연습"
+
+    def __init__(
+        self,
+        root: tk.Tk,
+        max_missiles: int = MISSILE_CAPACITY,
+        trajectory_cache: bool = True,
+        source=None,
+        burst_policy: str = BURST_EACH,
+        overlay: bool = False,
+        metrics_out=None,
+        latency_budget_ms: float = 50.0,
+        seed=None,
+        record_path=None,
+        library=None,
+        spectator_socket=None,
+        spectator_file=None,
+        store=None,
+        player=None,
+        drill_index=None,
+        watchdog_ms=None,
+        watchdog_out=None,
+        fast_start: bool = False,
+        telemetry=None,
+    ) -> None:
+        _import_tk()
+        self.root = root
+        self.library = library
+        self.seed = random.randrange(2 ** 32) if seed is None else seed
+        self.rng = random.Random(self.seed)
+        self.burst_policy = burst_policy
+        self.overlay_visible = overlay
+        self.latency_budget_ms = latency_budget_ms
+        self.probe = LatencyProbe()
+        self.stats = TypingStats()
+        self.store = store
+        self.player = player or default_player()
+        self.drill_index = drill_index
+        self.telemetry = telemetry
+        self._metrics_handle = open(metrics_out, "a", encoding="utf-8") if metrics_out else None
+        self.max_missiles = max_missiles
+        self.trajectory_cache = TrajectoryCache(self.rng) if trajectory_cache else None
+        self.root.title("Eos")
+        self.root.resizable(False, False)
+        self.fonts = FontCache.for_root(self.root)
+
+        self.engine = TypingEngine(source if source is not None else LYRICS_LINES)
+        self.engine.subscribe(self._on_engine_event)
+        self.trace = TraceDigest()
+        self.engine.subscribe(self.trace)
+        self.recorder = None
+        if record_path:
+            text = getattr(self.engine.source, "path", None)
+            if getattr(self.engine.source, "header", {}).get("builtin"):
+                text = None
+            self.recorder = SessionRecorder(record_path, self.seed, text, self.engine.source.content_digest())
+        self.spectators = None
+        if spectator_socket or spectator_file:
+            self.spectators = SpectatorHub(spectator_socket, spectator_file)
+            self.spectator_encoder = SpectatorEncoder(self.engine)
+            self.engine.subscribe(self.spectator_encoder)
+            self._keyframe_at = 0.0
+        self.timers = TimerRegistry(self.root)
+        self.clock = FrameClock(self.timers.after, self.timers.cancel)
+        self.clock.probe = self.probe
+        self._metrics_job = None
+
+        self.watchdog_ms = watchdog_ms
+        self.watchdog_out = watchdog_out
+        self.watchdog = None
+        self.watchdog_summary = None
+        self.ready = False
+        self._splash = None
+
+        self._build_state()
+        steps = [
+            self._build_styles,
+            self._build_hp_bar,
+            self._build_arena,
+            self._build_typing_area,
+            self._build_info_area,
+            self._finish_startup,
+        ]
+        if fast_start:
+            self._show_splash()
+            self._run_startup_steps(steps)
+        else:
+            for step in steps:
+                step()
+
+    def _show_splash(self) -> None:
+        """빈 창을 최종 크기로 먼저 띄워 두고, 나머지는 유휴 시간에 만듭니다."""
+        self._splash = tk.Label(self.root, text="불러오는 중…", bg="#1f1b2d", fg="#94a3b8")
+        self._splash.place(relx=0.5, rely=0.5, anchor="center")
+        self.root.configure(bg="#1f1b2d")
+        self.root.geometry("%dx%d" % self._estimated_window_size())
+
+    def _estimated_window_size(self) -> tuple[int, int]:
+        line = self.fonts.get("Nanum Gothic", 13, "bold")
+        bottom = self.fonts.get("Nanum Gothic", 14, "bold")
+        view = self.fonts.get("Nanum Gothic", 10)
+        status = self.fonts.get("Nanum Gothic", 11)
+        width = self.CANVAS_WIDTH + 2 * 16
+        height = (
+            2 * 16
+            + self.HP_BAR_HEIGHT + 6
+            + self.CANVAS_HEIGHT + 6 + 14
+            + 2 * 8 + 2 * self.fonts.linespace(line) + self.fonts.linespace(bottom)
+            + 6 + (VIEWPORT_BEFORE + 1 + VIEWPORT_AFTER) * self.fonts.linespace(view)
+            + 8 + 2 * self.fonts.linespace(status)
+            + 8 + 2 * self.fonts.linespace(status) + 8
+        )
+        return width, height
+
+    def _run_startup_steps(self, steps: list) -> None:
+        def run_next() -> None:
+            step = steps.pop(0)
+            step()
+            if steps:
+                self.timers.after_idle(run_next)
+
+        self.timers.after_idle(run_next)
+
+    def _finish_startup(self) -> None:
+        self.entry_var.trace_add("write", self._on_entry_change)
+        self.root.bind("<space>", self._on_space_press)
+        self.root.bind("<F3>", self._toggle_overlay)
+        if self._splash is not None:
+            self._splash.destroy()
+            self._splash = None
+            self.root.geometry("")
+        self._reset_game_state()
+        self.ready = True
+        # 위젯 생성은 멈춤으로 세지 않도록 화면을 다 만든 뒤에 감시를 시작합니다.
+        if self.watchdog_ms:
+            self.watchdog = StallWatchdog(self.root, self.watchdog_ms).start()
+
+    def _build_state(self) -> None:
+        self.engine.reset()
+        self.stats.reset()
+        self._stats_text = ""
+        self.prev_boss_percent = 100.0
+        self.game_over = False
+        self.await_restart = False
+        self.ignore_entry_update = False
+        self.player_offset = (0.0, 0.0)
+        self.boss_offset = (0.0, 0.0)
+        self._jiggle_job = None
+        self._reconcile_job = None
+        self._pending_hits = 0
+        self._pending_wrong = 0
+        self._pending_transition = None
+        self._pending_finish = None
+        self._display_wrong = None
+
+    def _build_styles(self) -> None:
+        style = ttk.Style()
+        style.configure("Info.TLabel", font=("Nanum Gothic", 14, "bold"))
+        style.configure("Status.TLabel", font=("Nanum Gothic", 11))
+        style.configure("Small.TLabel", font=("Nanum Gothic", 10))
+
+        self.line_font = self.fonts.get("Nanum Gothic", 13, "bold")
+        self.bottom_font = self.fonts.get("Nanum Gothic", 14, "bold")
+        self.view_font = self.fonts.get("Nanum Gothic", 10)
+
+        self.container = ttk.Frame(self.root, padding=16)
+        self.container.grid(row=0, column=0, sticky="nsew")
+
+    def _build_hp_bar(self) -> None:
+        hp_frame = ttk.Frame(self.container, padding=(0, 0, 0, 6))
+        hp_frame.grid(row=0, column=0, sticky="ew")
+        hp_frame.columnconfigure(0, weight=1)
+
+        self.hp_canvas = tk.Canvas(
+            hp_frame,
+            width=self.HP_BAR_WIDTH,
+            height=self.HP_BAR_HEIGHT,
+            bg="#111827",
+            highlightthickness=0,
+        )
+        self.hp_canvas.grid(row=0, column=0, sticky="ew")
+        self.hp_canvas.create_rectangle(
+            1,
+            1,
+            self.HP_BAR_WIDTH - 1,
+            self.HP_BAR_HEIGHT - 1,
+            outline="#991b1b",
+            width=2,
+        )
+        self.hp_bar_fill = self.hp_canvas.create_rectangle(
+            2,
+            2,
+            self.HP_BAR_WIDTH - 2,
+            self.HP_BAR_HEIGHT - 2,
+            fill="#ef4444",
+            width=0,
+        )
+        self.hp_percent_text = self.hp_canvas.create_text(
+            self.HP_BAR_WIDTH / 2,
+            self.HP_BAR_HEIGHT / 2,
+            text="보스 체력 100.0%",
+            fill="#fee2e2",
+            font=("Nanum Gothic", 12, "bold"),
+        )
+
+    def _build_arena(self) -> None:
+        self.canvas = tk.Canvas(
+            self.container,
+            width=self.CANVAS_WIDTH,
+            height=self.CANVAS_HEIGHT,
+            bg="#1f1b2d",
+            highlightthickness=0,
+        )
+        self.canvas.grid(row=1, column=0, sticky="ew", pady=(6, 14))
+        self.player_entity = EntityGroup(self.canvas, "player")
+        self.boss_entity = EntityGroup(self.canvas, "boss")
+
+        self.player_circle = self.canvas.create_oval(
+            self.PLAYER_POS[0],
+            self.PLAYER_POS[1],
+            self.PLAYER_POS[2],
+            self.PLAYER_POS[3],
+            fill="#172554",
+            outline="#1d4ed8",
+            width=4,
+            tags=self.player_entity.tags(body=True),
+        )
+        self.player_label = self.canvas.create_text(
+            (self.PLAYER_POS[0] + self.PLAYER_POS[2]) / 2,
+            (self.PLAYER_POS[1] + self.PLAYER_POS[3]) / 2,
+            text="플레이어",
+            fill="#bfdbfe",
+            font=("Nanum Gothic", 12, "bold"),
+            tags=self.player_entity.tags(),
+        )
+        self.boss_circle = self.canvas.create_oval(
+            self.BOSS_POS[0],
+            self.BOSS_POS[1],
+            self.BOSS_POS[2],
+            self.BOSS_POS[3],
+            fill="#450a0a",
+            outline="#dc2626",
+            width=5,
+            tags=self.boss_entity.tags(body=True),
+        )
+        self.boss_label = self.canvas.create_text(
+            (self.BOSS_POS[0] + self.BOSS_POS[2]) / 2,
+            (self.BOSS_POS[1] + self.BOSS_POS[3]) / 2,
+            text="보스",
+            fill="#fecaca",
+            font=("Nanum Gothic", 12, "bold"),
+            tags=self.boss_entity.tags(),
+        )
+
+        self.missiles = MissilePool(self.canvas, self.clock, self._on_missile_hit, capacity=self.max_missiles)
+        self.overlay_text = self.canvas.create_text(
+            6,
+            4,
+            anchor="nw",
+            text="",
+            fill="#94a3b8",
+            font=("Nanum Gothic", 8),
+            state="normal" if self.overlay_visible else "hidden",
+        )
+
+    def _build_typing_area(self) -> None:
+        typing_frame = ttk.Frame(self.container, padding=(0, 8))
+        typing_frame.grid(row=2, column=0, sticky="ew")
+        typing_frame.columnconfigure(0, weight=1)
+
+        self.current_line_display = tk.Text(
+            typing_frame,
+            width=LINE_DISPLAY_COLUMNS,
+            height=3,
+            font=self.line_font,
+            bg="#111025",
+            fg="#f4f4f5",
+            relief="flat",
+            wrap="char",
+        )
+        self.current_line_display.tag_configure("typed", foreground="#34d399")
+        self.current_line_display.tag_configure("current", foreground="#facc15")
+        self.current_line_display.tag_configure("pending", foreground="#a5b4fc")
+        self.current_line_display.tag_configure("align", justify="center")
+        self.current_line_display.tag_configure("bottom_line", font=self.bottom_font, foreground="#fef08a")
+        self.current_line_display.tag_configure("bottom_typed", foreground="#facc15")
+        self.current_line_display.tag_configure("bottom_wrong", foreground="#f87171")
+        self.current_line_display.tag_configure("transition_old", foreground="#94a3b8")
+        self.current_line_display.configure(state="disabled")
+        self.current_line_display.grid(row=0, column=0, sticky="ew", padx=0)
+        self.line_renderer = LineRenderer(self.current_line_display)
+
+        self.lyrics_display = tk.Text(
+            typing_frame,
+            width=LINE_DISPLAY_COLUMNS,
+            height=VIEWPORT_BEFORE + 1 + VIEWPORT_AFTER,
+            font=self.view_font,
+            bg="#0b0a1a",
+            fg="#64748b",
+            relief="flat",
+            wrap="none",
+        )
+        self.lyrics_display.tag_configure("align", justify="center")
+        self.lyrics_display.tag_configure("view_done", foreground="#475569")
+        self.lyrics_display.tag_configure("view_current", foreground="#e2e8f0")
+        self.lyrics_display.tag_configure("view_typed", foreground="#34d399")
+        self.lyrics_display.tag_configure("view_next", foreground="#94a3b8")
+        self.lyrics_display.configure(state="disabled")
+        self.lyrics_display.grid(row=1, column=0, sticky="ew", pady=(6, 0))
+        self.lyrics_view = LyricsViewport(self.lyrics_display)
+
+        self.entry_var = tk.StringVar()
+        self.entry = tk.Entry(
+            self.root,
+            textvariable=self.entry_var,
+            font=self.line_font,
+        )
+        self.entry.place(x=-1000, y=-1000, width=10, height=10)
+        self.entry.focus_set()
+
+    def _build_info_area(self) -> None:
+        info_frame = ttk.Frame(self.container, padding=(0, 4, 0, 0))
+        info_frame.grid(row=3, column=0, sticky="ew", pady=(4, 0))
+        info_frame.columnconfigure(0, weight=1)
+        info_frame.columnconfigure(1, weight=1)
+
+        self.result_label = ttk.Label(
+            info_frame,
+            text="",
+            style="Status.TLabel",
+            anchor="e",
+        )
+        self.result_label.grid(row=0, column=1, sticky="e")
+
+        self.stats_label = ttk.Label(
+            info_frame,
+            text="",
+            style="Small.TLabel",
+            anchor="e",
+        )
+        self.stats_label.grid(row=1, column=0, columnspan=2, sticky="e")
+
+        button_frame = ttk.Frame(self.container, padding=(0, 4))
+        button_frame.grid(row=4, column=0, sticky="e")
+
+        self.songs = self.library.songs() if self.library is not None else []
+        self.song_var = tk.StringVar(value=getattr(self.engine.source, "title", ""))
+        choices = [title for title, _path in self.songs]
+        if self.drill_index is not None:
+            choices.append(self.DRILL_TITLE)
+        if choices:
+            self.song_box = ttk.Combobox(
+                button_frame,
+                textvariable=self.song_var,
+                values=choices,
+                state="disabled" if self.recorder is not None else "readonly",
+                width=18,
+            )
+            self.song_box.grid(row=0, column=0, padx=8)
+
+        self.reset_button = ttk.Button(button_frame, text="다시 시작", command=self._restart)
+        self.reset_button.grid(row=0, column=1, padx=8)
+
+    def _reset_game_state(self) -> None:
+        self.clock.clear()
+        self.timers.cancel_all()
+        self.probe.discard_input()
+        self._metrics_job = None
+        self._build_state()
+        self.missiles.clear()
+        self.hp_canvas.itemconfig(self.hp_bar_fill, fill="#ef4444")
+        self._update_stat_labels()
+        self.result_label.configure(text="")
+        self.stats_label.configure(text="")
+
+        self.line_renderer.invalidate()
+        self.lyrics_view.invalidate()
+        self._update_line_display()
+
+        self.entry.configure(state="normal")
+        self.ignore_entry_update = True
+        self.entry_var.set("")
+        self.ignore_entry_update = False
+        self.entry.focus_set()
+        self.await_restart = False
+
+        self.player_entity.style(fill="#172554", outline="#1d4ed8")
+        self.boss_entity.style(fill="#450a0a", outline="#dc2626")
+
+        self.player_offset = (0.0, 0.0)
+        self.boss_offset = (0.0, 0.0)
+        self._apply_entity_offsets(self.player_offset, self.boss_offset)
+        self.game_over = False
+        self._schedule_jiggle()
+        self._schedule_metrics_report()
+        if self.spectators is not None:
+            self._publish_spectator_state(keyframe=True)
+        if self.store is not None and self.store.lookup_best(self._song_key(), self.player, self._show_personal_best):
+            self.timers.after(50, self._poll_store)
+
+    def _on_entry_change(self, *_args) -> None:
+        if self.ignore_entry_update or self.game_over:
+            return
+
+        new_text = self.entry_var.get()
+        if not new_text:
+            return
+
+        if self.recorder is not None:
+            self.recorder.record(REPLAY_INPUT, new_text)
+        self.probe.input_started()
+        remaining = self.engine.feed_text(new_text)
+        self.probe.stage("engine")
+        if self._reconcile_job is None:
+            self.probe.discard_input()
+        if remaining != new_text and not self.game_over:
+            self.ignore_entry_update = True
+            self.entry_var.set(remaining)
+            self.ignore_entry_update = False
+
+    def _on_space_press(self, _event: tk.Event) -> None:
+        if self.await_restart:
+            self._restart()
+            return "break"
+
+    def _restart(self) -> None:
+        if self.recorder is not None:
+            self.recorder.record(REPLAY_RESTART)
+        self.trace.mark("reset")
+        self._switch_song()
+        self._reset_game_state()
+
+    def _switch_song(self) -> None:
+        selected = self.song_var.get()
+        if selected == self.DRILL_TITLE and self.drill_index is not None:
+            self._load_drill()
+            return
+        current = getattr(self.engine.source, "path", None)
+        for title, path in self.songs:
+            if title == selected and str(path) != current:
+                previous = self.engine.source
+                self.engine.load_source(ContentPack(path))
+                previous.close()
+                return
+
+    def _load_drill(self) -> None:
+        """방금 판에서 자주 틀린 2·3글자 조각이 많이 든 줄로 다음 판을 만듭니다."""
+        weak = self.stats.weak_ngrams()
+        if not weak:
+            return
+        lines = self.drill_index.drill_lines(weak)
+        if lines:
+            previous = self.engine.source
+            self.engine.load_source(LineTextSource(lines))
+            previous.close()
+
+    def replay(self, events: list, speed: float = 1.0) -> None:
+        """기록된 입력을 원래 간격대로 실제 입력창 경로에 흘려 넣습니다.
+
+        단계는 세션 타이머로 하나씩 이어 걸기 때문에 다시 시작이나 창 닫기가 남은 단계를
+        함께 걷어 냅니다. 기록된 다시 시작은 타이머를 비운 뒤 다음 단계를 겁니다.
+        """
+        started = time.monotonic()
+        pending = iter(events)
+        due_ms = 0.0
+
+        def schedule_next() -> None:
+            nonlocal due_ms
+            for step_delay, kind, text in pending:
+                due_ms += step_delay / speed
+                if kind in (REPLAY_INPUT, REPLAY_RESTART):
+                    wait_ms = due_ms - (time.monotonic() - started) * 1000.0
+                    self.timers.after(max(0, int(wait_ms)), run_step, kind, text)
+                    return
+
+        def run_step(kind: str, text) -> None:
+            if kind == REPLAY_INPUT:
+                self.entry_var.set(text)
+            else:
+                self._restart()
+            schedule_next()
+
+        schedule_next()
+
+    def _on_engine_event(self, event: str, *args) -> None:
+        if event == EVENT_CORRECT:
+            self._handle_correct_input(*args)
+        elif event == EVENT_LINE_CHANGE:
+            self._pending_transition = self.engine.source.line(args[0])
+        elif event == EVENT_WRONG:
+            self._handle_wrong_input(*args)
+        elif event == EVENT_FINISH:
+            self._pending_finish = args
+        self._schedule_reconcile()
+
+    def _handle_correct_input(self, index: int, _previous_line_idx: int) -> None:
+        ch = self.engine.source.char_at(index - 1)
+        self.stats.correct_char(ch, time.monotonic())
+        if self.telemetry is not None:
+            self.telemetry.emit(TELEMETRY_KEY, ch, True)
+        self._pending_hits += 1
+        self._display_wrong = None
+        self._pending_transition = None
+
+    def _handle_wrong_input(self, ch: str, expected: str) -> None:
+        _line_idx, line, col, _next_line = self.engine.line_state()
+        self.stats.wrong_char(expected, time.monotonic(), line[max(0, col - 2):col])
+        if self.telemetry is not None:
+            self.telemetry.emit(TELEMETRY_KEY, expected, False)
+        self._pending_wrong += 1
+        self._display_wrong = ch
+        self._pending_transition = None
+
+    def _schedule_reconcile(self) -> None:
+        if self._reconcile_job is None:
+            self._reconcile_job = self.timers.after_idle(self._reconcile_ui)
+
+    def _reconcile_ui(self) -> None:
+        """한 번의 이벤트 루프 동안 쌓인 입력 결과를 화면에 한 번만 반영합니다."""
+        self._reconcile_job = None
+        self.probe.stage("reconcile")
+        hits = self._pending_hits
+        wrong = self._pending_wrong
+        transition = self._pending_transition
+        finish = self._pending_finish
+        self._pending_hits = 0
+        self._pending_wrong = 0
+        self._pending_transition = None
+        self._pending_finish = None
+
+        self._update_stat_labels()
+        if transition is not None:
+            self._line_transition_animation(transition)
+        else:
+            self._update_line_display(wrong_char=self._display_wrong)
+        if wrong:
+            self._flash_player()
+        if hits:
+            self._launch_burst(hits)
+        if finish is not None:
+            self._finish_game(*finish)
+        if self.spectators is not None:
+            self._publish_spectator_state()
+        self.probe.stage("render")
+        self.timers.after_idle(self._input_finished)
+
+    def _input_finished(self) -> None:
+        photon_ms = self.probe.input_finished()
+        if self.telemetry is not None and photon_ms is not None:
+            self.telemetry.emit(TELEMETRY_TIMING, photon_ms)
+
+    def _toggle_overlay(self, _event=None) -> None:
+        self.overlay_visible = not self.overlay_visible
+        self.canvas.itemconfig(self.overlay_text, state="normal" if self.overlay_visible else "hidden")
+        if self.overlay_visible:
+            self._refresh_overlay()
+            if self._metrics_job is None:
+                self._schedule_metrics_report()
+
+    def _refresh_overlay(self) -> None:
+        snapshot = self.probe.snapshot()
+        lines = []
+        for name, label in LATENCY_STAGES:
+            stats = snapshot[name]
+            lines.append(f"{label} {stats['p50']:.1f}/{stats['p95']:.1f}/{stats['p99']:.1f} ms")
+        lines.append(f"타이머 {self.clock.active_count()}개 (Tcl {self.timers.live_count()}개)")
+        over_budget = snapshot["photon"]["p95"] > self.latency_budget_ms
+        self.canvas.itemconfig(
+            self.overlay_text,
+            text="\n".join(lines),
+            fill="#f87171" if over_budget else "#94a3b8",
+        )
+
+    def _schedule_metrics_report(self) -> None:
+        self._metrics_job = None
+        if not self.overlay_visible and self._metrics_handle is None:
+            return
+        if self.overlay_visible:
+            self._refresh_overlay()
+        if self._metrics_handle is not None:
+            self.probe.export(
+                self._metrics_handle,
+                budget_ms=self.latency_budget_ms,
+                live_timers=self.timers.live_count(),
+                clock_timers=self.clock.active_count(),
+            )
+        self._metrics_job = self.clock.call_later(1000, self._schedule_metrics_report)
+
+    def _publish_spectator_state(self, keyframe: bool = False) -> None:
+        now = time.monotonic()
+        chunk = self.spectator_encoder.take()
+        if chunk:
+            self.spectators.publish(chunk)
+        if keyframe or now - self._keyframe_at >= SPECTATE_KEYFRAME_INTERVAL:
+            self._keyframe_at = now
+            self.spectators.publish(self.spectator_encoder.keyframe(), keyframe=True)
+
+    def _launch_burst(self, hits: int) -> None:
+        if self.spectators is not None:
+            self.spectator_encoder.missile(hits)
+        if hits == 1 or self.burst_policy == BURST_EACH:
+            for _ in range(hits):
+                self._animate_missile()
+        elif self.burst_policy == BURST_MERGE:
+            self._animate_missile(hits)
+        else:
+            self._on_missile_hit(hits)
+
+    def _update_stat_labels(self) -> None:
+        boss_percent = max(0.0, self.engine.boss_hp)
+        self._draw_hp_bar(boss_percent)
+        stats = self.stats
+        text = ""
+        if stats.correct or stats.wrong:
+            text = f"{stats.cpm():.0f}타 · {stats.wpm():.0f} WPM · 정확도 {stats.accuracy():.0f}%"
+        if text != self._stats_text and not self.game_over:
+            self._stats_text = text
+            self.stats_label.configure(text=text)
+
+    def _draw_hp_bar(self, boss_percent: float) -> None:
+        proportion = boss_percent / 100.0
+        proportion = max(0.0, min(1.0, proportion))
+        fill_width = 2 + (self.HP_BAR_WIDTH - 4) * proportion
+        self.hp_canvas.coords(
+            self.hp_bar_fill,
+            2,
+            2,
+            fill_width,
+            self.HP_BAR_HEIGHT - 2,
+        )
+        self.hp_canvas.itemconfig(
+            self.hp_percent_text,
+            text=f"보스 체력 {boss_percent:0.1f}%",
+        )
+        if boss_percent < self.prev_boss_percent and not self.game_over:
+            self._flash_hp_bar()
+        self.prev_boss_percent = boss_percent
+
+    def _flash_hp_bar(self) -> None:
+        original_fill = "#ef4444"
+        flash_fill = "#fca5a5"
+        self.hp_canvas.itemconfig(self.hp_bar_fill, fill=flash_fill)
+        self.clock.call_later(120, lambda: self.hp_canvas.itemconfig(self.hp_bar_fill, fill=original_fill))
+
+    def _update_line_display(self, wrong_char=None) -> None:
+        line_idx, current_line, typed_len, _ = self.engine.line_state()
+        self.line_renderer.render(current_line, typed_len, wrong_char)
+        self.lyrics_view.render(self.engine.source, line_idx, typed_len)
+
+    def _apply_entity_offsets(
+        self, player_offset: tuple[float, float], boss_offset: tuple[float, float]
+    ) -> None:
+        self.player_entity.move_to(*player_offset)
+        self.boss_entity.move_to(*boss_offset)
+
+    def _schedule_jiggle(self) -> None:
+        if self._jiggle_job is not None:
+            self.clock.cancel(self._jiggle_job)
+            self._jiggle_job = None
+        self._jiggle_job = self.clock.call_later(520, self._jiggle_entities)
+
+    def _jiggle_entities(self) -> None:
+        if self.game_over:
+            self._jiggle_job = None
+            return
+
+        max_offset = 2.0
+        smoothing = 0.4
+
+        target_player = (
+            self.rng.uniform(-max_offset, max_offset),
+            self.rng.uniform(-max_offset, max_offset),
+        )
+        target_boss = (
+            self.rng.uniform(-max_offset, max_offset),
+            self.rng.uniform(-max_offset, max_offset),
+        )
+
+        self.player_offset = (
+            self.player_offset[0] * smoothing + target_player[0] * (1 - smoothing),
+            self.player_offset[1] * smoothing + target_player[1] * (1 - smoothing),
+        )
+        self.boss_offset = (
+            self.boss_offset[0] * smoothing + target_boss[0] * (1 - smoothing),
+            self.boss_offset[1] * smoothing + target_boss[1] * (1 - smoothing),
+        )
+
+        self._apply_entity_offsets(self.player_offset, self.boss_offset)
+        self._schedule_jiggle()
+
+    def _animate_missile(self, hits: int = 1) -> None:
+        start_x = (self.PLAYER_POS[0] + self.PLAYER_POS[2]) // 2
+        start_y = (self.PLAYER_POS[1] + self.PLAYER_POS[3]) // 2
+        missile_radius = self.rng.randint(4, 10)
+
+        target_x = (self.BOSS_POS[0] + self.BOSS_POS[2]) // 2
+        target_y = (self.BOSS_POS[1] + self.BOSS_POS[3]) // 2
+
+        steps = self.rng.randint(24, 72)
+        frame_delay = self.rng.randint(8, 32)
+        ease_power = self.rng.uniform(0.8, 3.5)
+
+        if self.trajectory_cache is not None:
+            xs, ys = self.trajectory_cache.trajectory((start_x, start_y), (target_x, target_y), steps, ease_power)
+        else:
+            horizontal_span = target_x - start_x
+            direction = 1 if horizontal_span >= 0 else -1
+            span_abs = max(abs(horizontal_span), 120)
+
+            control1 = (
+                start_x + direction * span_abs * self.rng.uniform(0.3, 1.0) * self.rng.choice([-1, 1]),
+                start_y + self.rng.uniform(-220, 120),
+            )
+            control2 = (
+                target_x - direction * span_abs * self.rng.uniform(0.2, 0.9) * self.rng.choice([-1, 1]),
+                target_y + self.rng.uniform(-120, 200),
+            )
+            xs, ys = bezier_trajectory((start_x, start_y), control1, control2, (target_x, target_y), steps, ease_power)
+        self.missiles.launch(missile_radius, xs, ys, frame_delay, hits)
+
+    def _on_missile_hit(self, _hits: int) -> None:
+        if not self.game_over:
+            self._flash_boss()
+
+    def _line_transition_animation(self, previous_line_text) -> None:
+        self.line_renderer.show_transition(previous_line_text)
+        self.lyrics_view.render(self.engine.source, self.engine.current_line_index, 0)
+
+        def finalize() -> None:
+            if self.game_over:
+                return
+            self._update_line_display()
+
+        self.clock.call_later(160, finalize)
+
+    def _flash_boss(self) -> None:
+        if self.game_over:
+            return
+
+        original_fill = "#450a0a"
+        hit_fill = "#dc2626"
+        self.boss_entity.style(fill=hit_fill)
+        self.clock.call_later(140, lambda: self.boss_entity.style(fill=original_fill))
+        # 맞을 때마다 뒤로 살짝 밀리고, 다음 흔들림의 보간으로 제자리에 돌아옵니다.
+        self.boss_offset = (min(self.boss_offset[0] + self.KNOCKBACK_STEP, self.KNOCKBACK_MAX), self.boss_offset[1])
+        self._apply_entity_offsets(self.player_offset, self.boss_offset)
+
+    def _flash_player(self) -> None:
+        original_fill = "#172554"
+        hit_fill = "#2563eb"
+
+        self.player_entity.style(fill=hit_fill)
+        self.clock.call_later(150, lambda: self.player_entity.style(fill=original_fill))
+
+    def _finish_game(self, victory: bool) -> None:
+        self.game_over = True
+        self.missiles.clear()
+        self.entry.configure(state="disabled")
+        self.entry_var.set("")
+        if victory:
+            self.result_label.configure(text="승리!")
+            self.boss_entity.style(fill="#22c55e")
+            self.await_restart = True
+        summary = self._show_stats_summary()
+        if self.telemetry is not None:
+            self.telemetry.emit(TELEMETRY_RESULT, victory, summary)
+        if self.store is not None:
+            self._record_session(victory)
+
+    def _song_key(self) -> str:
+        return self.engine.source.content_digest()
+
+    def _poll_store(self) -> None:
+        self.store.poll()
+        if self.store.pending_lookups:
+            self.timers.after(50, self._poll_store)
+
+    def _show_personal_best(self, best) -> None:
+        if best is None or self.game_over or self.result_label.cget("text"):
+            return
+        self.result_label.configure(text=f"개인 최고 {best['cpm']:.0f}타 · {best['accuracy']:.0f}%")
+
+    def _record_session(self, victory: bool) -> None:
+        source = self.engine.source
+        title = getattr(source, "title", "") or os.path.basename(getattr(source, "path", "")) or SongLibrary.BUILTIN_TITLE
+        self.store.submit(session_record(self._song_key(), title, self.player, self.stats.summary(), victory))
+
+    def _show_stats_summary(self) -> dict:
+        summary = self.stats.summary()
+        parts = [
+            f"평균 {summary['cpm']:.0f}타 ({summary['wpm']:.0f} WPM)",
+            f"정확도 {summary['accuracy']:.1f}%",
+        ]
+        if summary["most_missed"]:
+            parts.append("자주 틀림 " + " ".join(f"'{ch}'×{count}" for ch, count in summary["most_missed"]))
+        if summary["slowest_jamo"]:
+            parts.append("느린 자모 " + " ".join(name for name, _ms in summary["slowest_jamo"]))
+        self._stats_text = " · ".join(parts)
+        self.stats_label.configure(text=self._stats_text)
+        return summary
+
+    def run(self) -> None:
+        self.root.mainloop()
+        self.close()
+
+    def close(self) -> None:
+        self.clock.clear()
+        self.timers.cancel_all()
+        watchdog = None
+        if self.watchdog is not None:
+            self.watchdog.stop()
+            if self.watchdog_out:
+                self.watchdog.dump(self.watchdog_out)
+            # 화면 쪽에서는 출력하지 않습니다. 지연 통계 파일의 마지막 기록에 남기고 알리는 일은 호출한 쪽이 합니다.
+            self.watchdog_summary = self.watchdog.summary()
+            watchdog = {
+                "stalls": self.watchdog.stalls,
+                "longest_ms": round(self.watchdog.longest_ms, 1),
+                "samples": self.watchdog.samples,
+                "top_functions": self.watchdog.top_functions(5),
+            }
+            self.watchdog = None
+        if self.spectators is not None:
+            self.spectators.close()
+            self.spectators = None
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+        if self.telemetry is not None:
+            self.telemetry.close()
+            self.telemetry = None
+        if self.drill_index is not None:
+            self.drill_index.close()
+            self.drill_index = None
+        if self.recorder is not None:
+            self.recorder.save(engine_state(self.engine), self.trace)
+            self.recorder = None
+        if self._metrics_handle is not None:
+            extra = {"watchdog": watchdog} if watchdog is not None else {}
+            self.probe.export(self._metrics_handle, budget_ms=self.latency_budget_ms, final=True, **extra)
+            self._metrics_handle.close()
+            self._metrics_handle = None
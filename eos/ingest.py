@@ -0,0 +1,238 @@
+"""가사·자막 파일(.txt/.lrc/.srt/.md)을 정리해 콘텐츠 팩으로 만드는 일괄 수집기."""
+
+from __future__ import annotations
+
+import concurrent.futures
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+from pathlib import Path
+
+from .text import LINE_DISPLAY_COLUMNS, _normalize_line, _text_tables, display_width
+from .packs import PACK_SUFFIX, compile_content_pack
+
+INGEST_MANIFEST = "manifest.jsonl"
+INGEST_SUFFIXES = (".txt", ".lrc", ".srt", ".vtt", ".md")
+INGEST_REPLACEMENTS = str.maketrans({
+    "\t": " ",
+    "\u00a0": " ",
+    "\u3000": " ",
+    "\u2018": "'",
+    "\u2019": "'",
+    "\u201c": '"',
+    "\u201d": '"',
+    "\u2013": "-",
+    "\u2014": "-",
+    "\u2026": "...",
+    "\u00b7": ".",
+})
+
+
+# 두벌식 자판과 영문 자판으로 바로 칠 수 없는 글자
+UNTYPEABLE_CHARS = re.compile("[^\x20-\x7e\uac00-\ud7a3]+")
+
+# 글자별 타수 분류(한글 2~5, 영숫자 a, 기호 s)를 한글 h / 그 밖 x로 줄입니다.
+_KIND_TABLE = str.maketrans("2345as", "hhhhxx")
+
+
+def _clean_ingest_line(raw: str) -> str:
+    line = _normalize_line(raw.strip()).translate(INGEST_REPLACEMENTS)
+    # 자막 번호·타임코드와 LRC 시간 태그는 입력할 내용이 아닙니다.
+    if not line or line.isdigit() or "-->" in line or line == "WEBVTT":
+        return ""
+    while line.startswith("[") and "]" in line:
+        line = line[line.index("]") + 1:].lstrip()
+    line = UNTYPEABLE_CHARS.sub("", line)
+    return " ".join(line.split())
+
+
+def wrap_display_lines(text: str, columns: int = LINE_DISPLAY_COLUMNS) -> list[str]:
+    """표시 폭(전각 2칸)이 ``columns``를 넘지 않도록 어절 단위로 줄을 나눕니다."""
+    if display_width(text) <= columns:
+        return [text] if text else []
+    lines = []
+    current, width = [], 0
+    for word in text.split(" "):
+        word_width = display_width(word)
+        while word_width > columns:
+            if current:
+                lines.append(" ".join(current))
+                current, width = [], 0
+            # 한 글자가 폭보다 넓어도 줄마다 적어도 한 글자는 내보냅니다.
+            cut, cut_width = 0, 0
+            while cut < len(word) and (cut == 0 or cut_width + display_width(word[cut]) <= columns):
+                cut_width += display_width(word[cut])
+                cut += 1
+            lines.append(word[:cut])
+            word, word_width = word[cut:], word_width - cut_width
+        if not word:
+            continue
+        if current and width + 1 + word_width > columns:
+            lines.append(" ".join(current))
+            current, width = [], 0
+        width += word_width + (1 if current else 0)
+        current.append(word)
+    if current:
+        lines.append(" ".join(current))
+    return lines
+
+
+def stage_difficulty(lines) -> float:
+    """스테이지 난이도 점수 (대략 1~10).
+
+    글자당 자모 타수(겹모음·겹받침은 한 타 더), 영문·기호 비율, 한/영 전환
+    횟수를 합쳐서 계산합니다.
+    """
+    strokes_table = _text_tables()[1]
+    chars = 0
+    strokes = 0
+    symbols = 0
+    switches = 0
+    for line in lines:
+        chars += len(line)
+        # 공백을 지우고 한글은 타수 숫자, 영숫자는 a, 기호는 s로 바꿉니다.
+        classes = line.translate(strokes_table)
+        latin = classes.count("a")
+        symbols += classes.count("s")
+        strokes += latin + classes.count("s") + sum(classes.count(digit) * int(digit) for digit in "2345")
+        kinds = classes.translate(_KIND_TABLE)
+        switches += kinds.count("hx") + kinds.count("xh")
+    if chars == 0:
+        return 0.0
+    score = 1.0 + 2.5 * (strokes / chars - 1.0) + 10.0 * symbols / chars + 20.0 * switches / chars
+    return round(min(10.0, max(1.0, score)), 2)
+
+
+def _ingest_file(path: str, output: str, stage_lines: int, columns: int) -> list[dict]:
+    """입력 파일 하나를 스테이지 팩들로 만듭니다. 프로세스 풀에서 실행됩니다."""
+    stem = Path(path).stem
+    key = hashlib.sha256(os.path.abspath(path).encode("utf-8")).hexdigest()[:8]
+    stages = []
+    pending = []
+
+    def flush() -> None:
+        number = len(stages) + 1
+        pack_path = os.path.join(output, f"{stem}-{key}-{number:04d}{PACK_SUFFIX}")
+        difficulty = stage_difficulty(pending)
+        header = compile_content_pack(
+            pending,
+            pack_path,
+            f"{stem} {number}",
+            {"difficulty": difficulty, "origin": path, "stage": number},
+        )
+        stages.append({"pack": os.path.basename(pack_path), "lines": header["lines"], "chars": header["chars"], "difficulty": difficulty})
+        pending.clear()
+
+    with open(path, encoding="utf-8-sig", errors="replace") as handle:
+        for raw in handle:
+            cleaned = _clean_ingest_line(raw)
+            if not cleaned:
+                continue
+            for line in wrap_display_lines(cleaned, columns):
+                pending.append(line)
+                if len(pending) >= stage_lines:
+                    flush()
+    if pending:
+        flush()
+    return stages
+
+
+def _iter_ingest_files(inputs):
+    for item in inputs:
+        if os.path.isfile(item):
+            yield item
+            continue
+        for directory, dirnames, filenames in os.walk(item):
+            dirnames.sort()
+            for name in sorted(filenames):
+                if name.lower().endswith(INGEST_SUFFIXES):
+                    yield os.path.join(directory, name)
+
+
+def _load_ingest_manifest(path: str) -> dict:
+    done = {}
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as handle:
+        for raw in handle:
+            try:
+                entry = json.loads(raw)
+            except json.JSONDecodeError:
+                # 중간에 끊긴 마지막 줄은 다시 처리합니다.
+                continue
+            done[entry["source"]] = entry
+    return done
+
+
+def _remove_stale_stages(output: str, previous, stages: list[dict]) -> None:
+    """다시 수집한 파일이 전보다 적은 스테이지를 만들었으면 남은 옛 팩을 지웁니다."""
+    if not previous:
+        return
+    current = {stage["pack"] for stage in stages}
+    for stage in previous.get("stages", ()):
+        if stage["pack"] not in current:
+            try:
+                os.remove(os.path.join(output, stage["pack"]))
+            except FileNotFoundError:
+                pass
+
+
+def ingest_corpus(inputs, output: str, workers=None, stage_lines: int = 40, columns: int = LINE_DISPLAY_COLUMNS, progress=None) -> dict:
+    """텍스트 모음을 여러 프로세스로 나눠 스테이지 팩으로 만듭니다.
+
+    파일 하나가 끝날 때마다 매니페스트에 한 줄씩 덧붙이므로, 중단한 뒤 다시
+    실행하면 크기와 수정 시각이 같은 파일은 건너뜁니다.
+    """
+    os.makedirs(output, exist_ok=True)
+    manifest_path = os.path.join(output, INGEST_MANIFEST)
+    done = _load_ingest_manifest(manifest_path)
+    workers = workers or os.cpu_count() or 1
+    result = {"files": 0, "skipped": 0, "failed": 0, "stages": 0, "bytes": 0}
+
+    started = time.perf_counter()
+    with open(manifest_path, "a", encoding="utf-8") as manifest, concurrent.futures.ProcessPoolExecutor(workers) as pool:
+        running = {}
+
+        def collect(block: bool) -> None:
+            finished, _ = concurrent.futures.wait(
+                running,
+                timeout=None if block else 0,
+                return_when=concurrent.futures.FIRST_COMPLETED,
+            )
+            for future in finished:
+                entry = running.pop(future)
+                try:
+                    entry["stages"] = future.result()
+                except (OSError, ValueError) as exc:
+                    result["failed"] += 1
+                    print(f"{entry['source']}: {exc}", file=sys.stderr)
+                    continue
+                manifest.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                manifest.flush()
+                _remove_stale_stages(output, done.get(entry["source"]), entry["stages"])
+                result["files"] += 1
+                result["stages"] += len(entry["stages"])
+                result["bytes"] += entry["size"]
+                if progress is not None:
+                    progress(entry, result, time.perf_counter() - started)
+
+        for path in _iter_ingest_files(inputs):
+            stat = os.stat(path)
+            source = os.path.abspath(path)
+            previous = done.get(source)
+            if previous and previous["size"] == stat.st_size and previous["mtime_ns"] == stat.st_mtime_ns:
+                result["skipped"] += 1
+                continue
+            entry = {"source": source, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+            running[pool.submit(_ingest_file, source, output, stage_lines, columns)] = entry
+            if len(running) >= workers * 2:
+                collect(block=True)
+        while running:
+            collect(block=True)
+
+    result["seconds"] = time.perf_counter() - started
+    result["mb_per_sec"] = result["bytes"] / (1024 * 1024) / max(result["seconds"], 1e-9)
+    return result
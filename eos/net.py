@@ -0,0 +1,647 @@
+"""멀티플레이 레이스 서버와 관전 스트림."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import selectors
+import socket
+import threading
+import time
+from collections import deque
+
+from .text import LYRICS_LINES, LineTextSource
+from .engine import EVENT_CORRECT, EVENT_FINISH, EVENT_LINE_CHANGE, EVENT_WRONG, TypingEngine
+from .stats import RollingHistogram
+
+RACE_DEFAULT_PORT = 7878
+RACE_ROOM_SIZE = 8
+# 이보다 많이 밀린 클라이언트에는 다른 사람 진행 상황을 보내지 않습니다.
+RACE_WRITE_LIMIT = 64 * 1024
+
+
+def _encode_race_message(message: dict) -> bytes:
+    return json.dumps(message, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+class RacePlayer:
+    """레이스 방 안의 한 명. 본문은 방과 함께 쓰고 입력 위치만 따로 가집니다."""
+
+    def __init__(self, name: str, room, writer) -> None:
+        self.name = name
+        self.room = room
+        self.writer = writer
+        self.hits = 0
+        self.engine = TypingEngine(room.source)
+        self.engine.subscribe(self._on_engine_event)
+
+    def _on_engine_event(self, event: str, *_args) -> None:
+        if event == EVENT_CORRECT:
+            self.hits += 1
+
+    def send(self, message: dict) -> None:
+        self.write(_encode_race_message(message))
+
+    def write(self, data: bytes, droppable: bool = False) -> None:
+        transport = self.writer.transport
+        if transport.is_closing():
+            return
+        if droppable and transport.get_write_buffer_size() > RACE_WRITE_LIMIT:
+            self.room.dropped += 1
+            return
+        self.writer.write(data)
+
+
+class RaceRoom:
+    """같은 가사로 보스 HP 하나를 함께 깎는 방.
+
+    첫 입력을 받으면 레이스가 시작되어 더는 들어올 수 없습니다. 이때 남은 HP를
+    참가자 전원이 아직 칠 글자 수로 나눠 한 타 피해를 정하고, 누가 나가면
+    남은 사람 기준으로 다시 나눕니다. 그래서 남은 참가자가 모두 끝까지 치면
+    HP가 정확히 0이 됩니다.
+    """
+
+    def __init__(self, name: str, source, capacity: int = RACE_ROOM_SIZE) -> None:
+        self.name = name
+        self.source = source
+        self.capacity = capacity
+        self.players = {}
+        self.boss_hp = 100.0
+        self.started = False
+        self.finished = False
+        self.ranking = []
+        self.dropped = 0
+        self.remaining_chars = 0
+        self.damage_per_hit = 0.0
+
+    def is_open(self) -> bool:
+        return not self.started and not self.finished and len(self.players) < self.capacity
+
+    def join(self, name: str, writer) -> RacePlayer:
+        base, suffix = name, 2
+        while name in self.players:
+            name = f"{base}#{suffix}"
+            suffix += 1
+        player = RacePlayer(name, self, writer)
+        self.broadcast({"op": "joined", "player": name})
+        self.players[name] = player
+        return player
+
+    def leave(self, player: RacePlayer) -> None:
+        if self.players.pop(player.name, None) is None:
+            return
+        self.broadcast({"op": "left", "player": player.name})
+        if self.started and not self.finished:
+            self.remaining_chars -= player.engine.total_chars - player.engine.current_index
+            if self.remaining_chars > 0:
+                self._split_damage()
+            elif self.players:
+                self.boss_hp = 0.0
+                self.finish()
+
+    def _split_damage(self) -> None:
+        self.damage_per_hit = self.boss_hp / self.remaining_chars
+
+    def start(self) -> None:
+        self.started = True
+        self.remaining_chars = sum(p.engine.total_chars - p.engine.current_index for p in self.players.values())
+        self._split_damage()
+
+    def feed(self, player: RacePlayer, text: str) -> str:
+        if self.finished:
+            return ""
+        if not self.started:
+            self.start()
+        before = player.hits
+        remaining = player.engine.feed_text(text)
+        hits = player.hits - before
+        if hits:
+            self.remaining_chars -= hits
+            if self.remaining_chars <= 0:
+                self.boss_hp = 0.0
+            else:
+                self.boss_hp = max(0.0, self.boss_hp - hits * self.damage_per_hit)
+            self.broadcast(
+                {"op": "progress", "player": player.name, "index": player.engine.current_index, "boss_hp": round(self.boss_hp, 3)},
+                exclude=player,
+                droppable=True,
+            )
+        if player.engine.victory and player.name not in self.ranking:
+            self.ranking.append(player.name)
+        if self.remaining_chars <= 0:
+            self.finish()
+        return remaining
+
+    def finish(self) -> None:
+        self.finished = True
+        standings = self.ranking + sorted(
+            (name for name in self.players if name not in self.ranking),
+            key=lambda name: -self.players[name].engine.current_index,
+        )
+        self.broadcast({"op": "finish", "ranking": standings, "boss_hp": round(self.boss_hp, 3)})
+
+    def broadcast(self, message: dict, exclude=None, droppable: bool = False) -> None:
+        data = _encode_race_message(message)
+        for player in self.players.values():
+            if player is not exclude:
+                player.write(data, droppable)
+
+
+class RaceServer:
+    """여러 방의 레이스를 이벤트 루프 하나에서 돌리는 asyncio 서버.
+
+    클라이언트는 줄마다 JSON 메시지 하나를 보냅니다.
+    ``{"op": "join", "room": "", "player": "이름"}`` 으로 들어가고(방 이름이
+    비어 있으면 아직 시작하지 않은 빈자리 방에 배정), ``{"op": "keys", "text": "…", "seq": n}``
+    마다 ``state`` 응답을 받습니다. 다른 참가자의 진행은 ``progress``로,
+    승부가 나면 ``finish``로 알립니다.
+    """
+
+    def __init__(self, source=None, room_size: int = RACE_ROOM_SIZE) -> None:
+        if not isinstance(source, LineTextSource):
+            source = LineTextSource(source or LYRICS_LINES)
+        self.source = source
+        self.room_size = room_size
+        self.lines = [source.line(idx) for idx in range(source.line_count)]
+        self.digest = source.content_digest()
+        self.rooms = {}
+        self._open_room = None
+        self._room_seq = 0
+        self.latency = RollingHistogram(8192)
+        self.keystrokes = 0
+        self.sessions = 0
+        self.peak_sessions = 0
+
+    def _new_room(self, name: str) -> RaceRoom:
+        room = self.rooms[name] = RaceRoom(name, self.source, self.room_size)
+        return room
+
+    def _find_room(self, name: str):
+        if name:
+            room = self.rooms.get(name)
+            if room is None or room.finished:
+                room = self._new_room(name)
+            return room if room.is_open() else None
+        if self._open_room is None or not self._open_room.is_open() or self._open_room.name not in self.rooms:
+            self._room_seq += 1
+            self._open_room = self._new_room(f"room-{self._room_seq}")
+        return self._open_room
+
+    def stats(self) -> dict:
+        return {
+            "op": "stats",
+            "sessions": self.sessions,
+            "peak_sessions": self.peak_sessions,
+            "rooms": len(self.rooms),
+            "keystrokes": self.keystrokes,
+            "cpu_seconds": time.process_time(),
+            "latency_ms": self.latency.summary(),
+        }
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        player = None
+        self.sessions += 1
+        self.peak_sessions = max(self.peak_sessions, self.sessions)
+        try:
+            while True:
+                raw = await reader.readline()
+                if not raw:
+                    break
+                started = time.perf_counter()
+                try:
+                    message = json.loads(raw)
+                    op = message["op"]
+                except (ValueError, KeyError, TypeError):
+                    writer.write(_encode_race_message({"op": "error", "reason": "bad message"}))
+                    continue
+
+                if op == "keys" and player is not None:
+                    remaining = player.room.feed(player, str(message.get("text", "")))
+                    engine = player.engine
+                    player.send({
+                        "op": "state",
+                        "seq": message.get("seq"),
+                        "index": engine.current_index,
+                        "line": engine.current_line_index,
+                        "boss_hp": round(player.room.boss_hp, 3),
+                        "remaining": remaining,
+                    })
+                    self.keystrokes += 1
+                    self.latency.add((time.perf_counter() - started) * 1000.0)
+                elif op == "join" and player is None:
+                    room = self._find_room(str(message.get("room") or ""))
+                    if room is None:
+                        writer.write(_encode_race_message({"op": "error", "reason": "room closed"}))
+                        continue
+                    player = room.join(str(message.get("player") or "player"), writer)
+                    player.send({
+                        "op": "welcome",
+                        "room": room.name,
+                        "player": player.name,
+                        "players": list(room.players),
+                        "lines": self.lines,
+                        "text_sha256": self.digest,
+                    })
+                elif op == "stats":
+                    writer.write(_encode_race_message(self.stats()))
+                else:
+                    writer.write(_encode_race_message({"op": "error", "reason": f"unexpected {op}"}))
+
+                if writer.transport.get_write_buffer_size() > RACE_WRITE_LIMIT:
+                    await writer.drain()
+        except (ConnectionError, asyncio.LimitOverrunError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.sessions -= 1
+            if player is not None:
+                room = player.room
+                room.leave(player)
+                if not room.players and self.rooms.get(room.name) is room:
+                    del self.rooms[room.name]
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = RACE_DEFAULT_PORT, unix_path=None, ready=None) -> None:
+        if unix_path:
+            server = await asyncio.start_unix_server(self.handle, unix_path)
+        else:
+            server = await asyncio.start_server(self.handle, host, port, backlog=4096)
+        if ready is not None:
+            ready(server)
+        async with server:
+            await server.serve_forever()
+
+
+SPECTATE_KEYFRAME = 0
+SPECTATE_LINE = 1
+SPECTATE_ADVANCE = 2
+SPECTATE_WRONG = 3
+SPECTATE_HP = 4
+SPECTATE_MISSILE = 5
+SPECTATE_FINISH = 6
+SPECTATE_KEYFRAME_INTERVAL = 2.0
+# 송신 스레드는 이 간격마다 한 번씩 모아서 보냅니다 (관전자마다 시스템 호출 한 번).
+SPECTATE_FLUSH_INTERVAL = 0.02
+# 이만큼 못 받아 간 관전자는 끊습니다. 다시 접속하면 키프레임부터 받습니다.
+SPECTATE_BACKLOG_LIMIT = 256 * 1024
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data, pos: int) -> tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+class SpectatorEncoder:
+    """엔진 이벤트를 관전용 델타 스트림으로 바꾸는 구독자.
+
+    연산 하나는 바이트 하나짜리 opcode 뒤에 varint 인자가 붙는 형태입니다.
+    연속으로 맞힌 글자는 ``ADVANCE n`` 하나로 합치고, 보스 HP는 0.01% 단위
+    정수로 바뀐 경우에만 보냅니다. 줄 본문은 줄이 바뀔 때만 실어 보내므로
+    큰 텍스트를 쳐도 관전자는 지금 줄만 받습니다.
+    """
+
+    def __init__(self, engine: TypingEngine) -> None:
+        self.engine = engine
+        self._out = bytearray()
+        self._advance = 0
+        self._hp = None
+
+    def __call__(self, event: str, *args) -> None:
+        if event == EVENT_CORRECT:
+            self._advance += 1
+            return
+        self._flush_advance()
+        if event == EVENT_WRONG:
+            self._out.append(SPECTATE_WRONG)
+            _write_varint(self._out, ord(args[0][0]))
+        elif event == EVENT_LINE_CHANGE:
+            self._out.append(SPECTATE_LINE)
+            self._write_line(args[1])
+        elif event == EVENT_FINISH:
+            self._out.append(SPECTATE_FINISH)
+            _write_varint(self._out, 1 if args[0] else 0)
+
+    def missile(self, hits: int) -> None:
+        self._flush_advance()
+        self._out.append(SPECTATE_MISSILE)
+        _write_varint(self._out, hits)
+
+    def take(self) -> bytes:
+        """지난번 이후 쌓인 델타를 꺼냅니다."""
+        self._flush_advance()
+        hp = round(self.engine.boss_hp * 100)
+        if hp != self._hp:
+            self._hp = hp
+            self._out.append(SPECTATE_HP)
+            _write_varint(self._out, hp)
+        data = bytes(self._out)
+        self._out.clear()
+        return data
+
+    def keyframe(self) -> bytes:
+        """지금 상태 전체. 쌓여 있던 델타는 버립니다."""
+        engine = self.engine
+        self._out.clear()
+        self._advance = 0
+        self._hp = round(engine.boss_hp * 100)
+        self._out.append(SPECTATE_KEYFRAME)
+        _write_varint(self._out, engine.current_index)
+        _write_varint(self._out, self._hp)
+        _write_varint(self._out, engine.game_over | engine.victory << 1)
+        self._write_line(engine.current_line_index)
+        data = bytes(self._out)
+        self._out.clear()
+        return data
+
+    def _flush_advance(self) -> None:
+        if self._advance:
+            self._out.append(SPECTATE_ADVANCE)
+            _write_varint(self._out, self._advance)
+            self._advance = 0
+
+    def _write_line(self, line_idx: int) -> None:
+        source = self.engine.source
+        text = source.line(line_idx).encode("utf-8")
+        _write_varint(self._out, line_idx)
+        _write_varint(self._out, source.line_start(line_idx))
+        _write_varint(self._out, len(text))
+        self._out += text
+
+
+class SpectatorDecoder:
+    """관전 스트림을 읽어 화면에 필요한 상태만 유지합니다. 조각난 입력도 받습니다."""
+
+    def __init__(self) -> None:
+        self._buffer = bytearray()
+        self.synced = False
+        self.index = 0
+        self.boss_hp = 100.0
+        self.game_over = False
+        self.victory = False
+        self.line_idx = 0
+        self.line_start = 0
+        self.line = ""
+        self.wrong = None
+        self.missiles = 0
+        self.ops = 0
+
+    def feed(self, data: bytes) -> int:
+        self._buffer += data
+        buffer = self._buffer
+        pos = 0
+        applied = 0
+        try:
+            while pos < len(buffer):
+                start = pos
+                pos = self._apply(buffer, pos)
+                if pos is None:
+                    pos = start
+                    break
+                applied += 1
+        except IndexError:
+            pos = start
+        del buffer[:pos]
+        self.ops += applied
+        return applied
+
+    def _apply(self, data, pos: int):
+        op = data[pos]
+        pos += 1
+        if op == SPECTATE_KEYFRAME:
+            self.index, pos = _read_varint(data, pos)
+            hp, pos = _read_varint(data, pos)
+            flags, pos = _read_varint(data, pos)
+            pos = self._read_line(data, pos)
+            if pos is None:
+                return None
+            self.boss_hp = hp / 100.0
+            self.game_over = bool(flags & 1)
+            self.victory = bool(flags & 2)
+            self.wrong = None
+            self.synced = True
+        elif op == SPECTATE_LINE:
+            pos = self._read_line(data, pos)
+        elif op == SPECTATE_ADVANCE:
+            count, pos = _read_varint(data, pos)
+            self.index += count
+            self.wrong = None
+        elif op == SPECTATE_WRONG:
+            code, pos = _read_varint(data, pos)
+            self.wrong = chr(code)
+        elif op == SPECTATE_HP:
+            hp, pos = _read_varint(data, pos)
+            self.boss_hp = hp / 100.0
+        elif op == SPECTATE_MISSILE:
+            hits, pos = _read_varint(data, pos)
+            self.missiles += hits
+        elif op == SPECTATE_FINISH:
+            victory, pos = _read_varint(data, pos)
+            self.game_over = True
+            self.victory = bool(victory)
+        else:
+            raise ValueError(f"알 수 없는 관전 opcode {op}")
+        return pos
+
+    def _read_line(self, data, pos: int):
+        line_idx, pos = _read_varint(data, pos)
+        line_start, pos = _read_varint(data, pos)
+        size, pos = _read_varint(data, pos)
+        if pos + size > len(data):
+            return None
+        self.line_idx = line_idx
+        self.line_start = line_start
+        self.line = bytes(data[pos:pos + size]).decode("utf-8")
+        return pos + size
+
+
+class SpectatorHub:
+    """관전 스트림을 파일과 유닉스 소켓 관전자들에게 내보냅니다.
+
+    보내기는 별도 스레드가 맡고, 게임 쪽 ``publish``는 큐에 넣고 깨우기만
+    합니다. 늦게 들어온 관전자는 마지막 키프레임과 그 뒤의 델타를 먼저 받고,
+    한 묶음은 한 번만 만들어 모든 관전자에게 그대로 보냅니다.
+    """
+
+    def __init__(self, socket_path=None, file_path=None) -> None:
+        self.socket_path = socket_path
+        self.bytes_published = 0
+        self.viewers = 0
+        self.dropped_viewers = 0
+        self.cpu_seconds = 0.0
+        self._lock = threading.Lock()
+        self._queue = deque()
+        self._late = []
+        self._closed = False
+        self._file = open(file_path, "ab") if file_path else None
+        self._selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._wake_r.setblocking(False)
+        self._wake_w.setblocking(False)
+        self._selector.register(self._wake_r, selectors.EVENT_READ, "wake")
+        self._listener = None
+        if socket_path:
+            if os.path.exists(socket_path):
+                os.unlink(socket_path)
+            self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._listener.bind(socket_path)
+            self._listener.listen(512)
+            self._listener.setblocking(False)
+            self._selector.register(self._listener, selectors.EVENT_READ, "accept")
+        self._thread = threading.Thread(target=self._run, name="eos-spectators", daemon=True)
+        self._thread.start()
+
+    def publish(self, chunk: bytes, keyframe: bool = False) -> None:
+        with self._lock:
+            if keyframe:
+                self._late = [chunk]
+            else:
+                self._late.append(chunk)
+            # 큐가 비어 있을 때만 깨웁니다. 이미 깨어 있다면 다음 묶음에 함께 나갑니다.
+            wake = not self._queue
+            self._queue.append(chunk)
+        self.bytes_published += len(chunk)
+        if wake:
+            try:
+                self._wake_w.send(b"\0")
+            except (BlockingIOError, OSError):
+                pass
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:
+            pass
+        self._thread.join()
+        for key in list(self._selector.get_map().values()):
+            key.fileobj.close()
+        self._selector.close()
+        self._wake_w.close()
+        if self._file is not None:
+            self._file.close()
+        if self.socket_path and os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    def _run(self) -> None:
+        viewers = {}
+        pending = False
+        flush_at = 0.0
+        while not self._closed:
+            timeout = max(0.0, flush_at - time.monotonic()) if pending else None
+            for key, mask in self._selector.select(timeout):
+                if key.data == "wake":
+                    self._drain_wake()
+                    pending = True
+                elif key.data == "accept":
+                    self._accept(viewers)
+                elif mask & selectors.EVENT_READ:
+                    # 관전자는 보내는 것이 없으므로 읽을 것이 생겼다는 건 연결이 끊겼다는 뜻입니다.
+                    try:
+                        gone = not key.fileobj.recv(4096)
+                    except OSError:
+                        gone = True
+                    if gone:
+                        self._drop(viewers, key.fileobj, counted=False)
+                elif key.fileobj in viewers:
+                    self._send(viewers, key.fileobj, viewers[key.fileobj], b"")
+            if pending and (self._closed or time.monotonic() >= flush_at):
+                pending = False
+                flush_at = time.monotonic() + SPECTATE_FLUSH_INTERVAL
+                self._flush(viewers)
+        self.cpu_seconds = time.thread_time()
+
+    def _flush(self, viewers: dict) -> None:
+        with self._lock:
+            data = b"".join(self._queue)
+            self._queue.clear()
+        if not data:
+            return
+        if self._file is not None:
+            self._file.write(data)
+            self._file.flush()
+        for viewer, backlog in list(viewers.items()):
+            self._send(viewers, viewer, backlog, data)
+
+    def _drain_wake(self) -> None:
+        try:
+            while self._wake_r.recv(4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+    def _accept(self, viewers: dict) -> None:
+        try:
+            viewer, _address = self._listener.accept()
+        except OSError:
+            return
+        viewer.setblocking(False)
+        with self._lock:
+            # 큐에 남은 묶음은 곧 따로 보내므로 늦은 참가용 버퍼에서 뺍니다.
+            late = self._late[:len(self._late) - len(self._queue)] if self._queue else list(self._late)
+        backlog = bytearray()
+        viewers[viewer] = backlog
+        self.viewers += 1
+        self._selector.register(viewer, selectors.EVENT_READ)
+        self._send(viewers, viewer, backlog, b"".join(late))
+
+    def _send(self, viewers: dict, viewer, backlog: bytearray, data: bytes) -> None:
+        if backlog:
+            backlog += data
+            data = bytes(backlog)
+            backlog.clear()
+        if not data:
+            return
+        try:
+            sent = viewer.send(data)
+        except BlockingIOError:
+            sent = 0
+        except OSError:
+            self._drop(viewers, viewer, counted=False)
+            return
+        if sent < len(data):
+            if len(data) - sent > SPECTATE_BACKLOG_LIMIT:
+                self._drop(viewers, viewer, counted=True)
+                return
+            backlog += data[sent:]
+            self._selector.modify(viewer, selectors.EVENT_READ | selectors.EVENT_WRITE)
+        elif self._selector.get_key(viewer).events & selectors.EVENT_WRITE:
+            self._selector.modify(viewer, selectors.EVENT_READ)
+
+    def _drop(self, viewers: dict, viewer, counted: bool) -> None:
+        if viewers.pop(viewer, None) is None:
+            return
+        self.viewers -= 1
+        self.dropped_viewers += counted
+        self._selector.unregister(viewer)
+        viewer.close()
+
+
+def render_spectator_line(state: SpectatorDecoder, columns: int = 80) -> str:
+    """관전 상태를 터미널 한 줄로 그립니다."""
+    filled = int(round(state.boss_hp / 10.0))
+    bar = "#" * filled + "-" * (10 - filled)
+    col = max(0, min(len(state.line), state.index - state.line_start))
+    typed, rest = state.line[:col], state.line[col:]
+    current = f"\x1b[7m{rest[:1] or ' '}\x1b[0m" if rest else ""
+    wrong = f" \x1b[31m✗{state.wrong}\x1b[0m" if state.wrong else ""
+    if state.game_over:
+        status = "승리!" if state.victory else "패배"
+    else:
+        status = f"{state.line_idx + 1}번째 줄"
+    return f"[{bar}] {state.boss_hp:5.1f}% \x1b[32m{typed}\x1b[0m{current}{rest[1:]}{wrong} | 미사일 {state.missiles} | {status}"
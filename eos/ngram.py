@@ -0,0 +1,257 @@
+"""가사 n-gram 역색인과 약점 연습 줄 고르기."""
+
+from __future__ import annotations
+
+import heapq
+import json
+import mmap
+import struct
+import sys
+from array import array
+
+from .text import LINE_DISPLAY_COLUMNS, _normalize_line
+from .packs import _write_sectioned_file
+from .ingest import _clean_ingest_line, _iter_ingest_files, wrap_display_lines
+
+NGRAM_SIZES = (2, 3)
+NGRAM_MAGIC = b"EOSNGRM\0"
+NGRAM_VERSION = 2
+NGRAM_SUFFIX = ".eosidx"
+NGRAM_SECTIONS = ("text", "line_offsets", "terms", "term_offsets", "posting_offsets", "postings")
+
+
+def line_ngrams(line: str) -> set[str]:
+    """줄 하나의 서로 다른 2·3글자 조각 (공백이 낀 조각은 뺍니다)."""
+    grams = set()
+    for size in NGRAM_SIZES:
+        for start in range(len(line) - size + 1):
+            gram = line[start:start + size]
+            if " " not in gram:
+                grams.add(gram)
+    return grams
+
+
+def _encode_postings(line_ids) -> bytearray:
+    """오름차순 줄 번호를 앞 번호와의 차이로 바꿔 LEB128 가변 길이 정수로 씁니다."""
+    out = bytearray()
+    append = out.append
+    previous = 0
+    for line_id in line_ids:
+        gap = line_id - previous
+        previous = line_id
+        while gap >= 0x80:
+            append(gap & 0x7F | 0x80)
+            gap >>= 7
+        append(gap)
+    return out
+
+
+def _decode_postings(data) -> array:
+    line_ids = array("I")
+    append = line_ids.append
+    line_id = value = shift = 0
+    for byte in bytes(data):
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            line_id += value
+            append(line_id)
+            value = shift = 0
+        else:
+            shift += 7
+    return line_ids
+
+
+def _decode_postings_numpy(np, data):
+    """``_decode_postings``와 같은 일을 바이트 단위 파이썬 반복 없이 합니다.
+
+    짧은 목록은 NumPy 호출 비용이 더 크므로 파이썬으로 풉니다.
+    """
+    if len(data) < 256:
+        return np.frombuffer(_decode_postings(data), dtype=np.uint32).astype(np.int64)
+    codes = np.frombuffer(data, dtype=np.uint8)
+    ends = np.flatnonzero(codes < 0x80)
+    gaps = codes[ends].astype(np.int64)
+    if len(ends) < len(codes):
+        # 여러 바이트짜리 정수는 마지막 바이트(최상위 7비트)부터 한 바이트씩 거슬러 붙입니다.
+        starts = np.empty_like(ends)
+        starts[0] = 0
+        starts[1:] = ends[:-1] + 1
+        lengths = ends - starts
+        for back in range(1, int(lengths.max()) + 1):
+            longer = np.flatnonzero(lengths >= back)
+            gaps[longer] = (gaps[longer] << 7) | (codes[ends[longer] - back] & 0x7F)
+    return np.cumsum(gaps)
+
+
+def build_ngram_index(lines, path) -> dict:
+    """줄 목록으로 n-gram 역색인 파일을 만듭니다.
+
+    조각마다 그 조각이 든 줄 번호를 오름차순으로 모아(postings) 앞 번호와의
+    차이를 가변 길이 정수로 적습니다. 파일에는 줄 본문, 정렬된 조각 목록과
+    위치표, postings가 8바이트 정렬 구역으로 들어가므로 열 때는 메모리
+    매핑만 합니다.
+    """
+    postings = {}
+    text_parts = []
+    line_offsets = array("Q", [0])
+    position = 0
+    count = 0
+    for raw in lines:
+        line = _normalize_line(raw)
+        if not line:
+            continue
+        data = line.encode("utf-8")
+        text_parts.append(data)
+        position += len(data)
+        line_offsets.append(position)
+        for gram in line_ngrams(line):
+            found = postings.get(gram)
+            if found is None:
+                found = postings[gram] = array("I")
+            found.append(count)
+        count += 1
+
+    terms = sorted(postings)
+    term_blob = bytearray()
+    term_offsets = array("Q", [0])
+    posting_offsets = array("Q", [0])
+    posting_blob = bytearray()
+    for term in terms:
+        term_blob += term.encode("utf-8")
+        term_offsets.append(len(term_blob))
+        posting_blob += _encode_postings(postings[term])
+        posting_offsets.append(len(posting_blob))
+
+    payloads = {
+        "text": b"".join(text_parts),
+        "line_offsets": line_offsets.tobytes(),
+        "terms": bytes(term_blob),
+        "term_offsets": term_offsets.tobytes(),
+        "posting_offsets": posting_offsets.tobytes(),
+        "postings": bytes(posting_blob),
+    }
+    header = {"version": NGRAM_VERSION, "lines": count, "terms": len(terms), "byteorder": sys.byteorder}
+    _write_sectioned_file(path, NGRAM_MAGIC, header, NGRAM_SECTIONS, payloads)
+    return header
+
+
+class NgramIndex:
+    """메모리 매핑한 n-gram 역색인. 약한 조각이 많이 든 줄을 찾습니다."""
+
+    def __init__(self, path) -> None:
+        self.path = str(path)
+        with open(path, "rb") as handle:
+            if handle.read(len(NGRAM_MAGIC)) != NGRAM_MAGIC:
+                raise ValueError(f"{path}: n-gram 색인 파일이 아닙니다.")
+            (size,) = struct.unpack("<I", handle.read(4))
+            self.header = json.loads(handle.read(size).decode("utf-8"))
+        if self.header.get("version") != NGRAM_VERSION or self.header.get("byteorder") != sys.byteorder:
+            raise ValueError(f"{path}: 지원하지 않는 색인 형식입니다.")
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._map)
+        sections = self.header["sections"]
+
+        def section(name: str) -> memoryview:
+            offset, length = sections[name]
+            return view[offset:offset + length]
+
+        self._text = section("text")
+        self._line_offsets = section("line_offsets").cast("Q")
+        self._terms = section("terms")
+        self._term_offsets = section("term_offsets").cast("Q")
+        self._posting_offsets = section("posting_offsets").cast("Q")
+        self._postings = section("postings")
+        self.line_count = self.header["lines"]
+        self.term_count = self.header["terms"]
+
+    def line(self, line_id: int) -> str:
+        start = self._line_offsets[line_id]
+        return bytes(self._text[start:self._line_offsets[line_id + 1]]).decode("utf-8")
+
+    def _term(self, number: int) -> bytes:
+        return bytes(self._terms[self._term_offsets[number]:self._term_offsets[number + 1]])
+
+    def postings(self, gram: str) -> array:
+        """조각이 든 줄 번호들 (없으면 빈 배열)."""
+        return _decode_postings(self._encoded_postings(gram))
+
+    def _encoded_postings(self, gram: str) -> memoryview:
+        """조각의 부호화된 postings. 정렬된 조각 목록을 이진 탐색합니다."""
+        key = gram.encode("utf-8")
+        low, high = 0, self.term_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._term(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.term_count and self._term(low) == key:
+            return self._postings[self._posting_offsets[low]:self._posting_offsets[low + 1]]
+        return self._postings[0:0]
+
+    def query(self, weak, limit: int = 8) -> list[tuple[int, int]]:
+        """``weak``의 (조각, 틀린 횟수) 가운데 여러 개가 든 줄을 ``(점수, 줄 번호)``로 돌려줍니다.
+
+        점수는 줄에 든 약한 조각 수를 먼저, 틀린 횟수 합을 다음으로 봅니다.
+        """
+        lists = [(self._encoded_postings(gram), weight) for gram, weight in weak]
+        lists = [(found, weight) for found, weight in lists if len(found)]
+        if not lists:
+            return []
+        # 조각 수가 같으면 틀린 횟수가 큰 쪽이 앞서도록 한 자리 아래에 더합니다.
+        scale = sum(weight for _found, weight in lists) + 1
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        if np is not None:
+            # 후보는 약한 조각의 postings에 든 줄뿐이므로 줄 전체가 아니라 그 줄들만 셉니다.
+            # 목록마다 이미 정렬돼 있어 안정 정렬(timsort)은 이어 붙인 목록을 병합만 합니다.
+            decoded = [_decode_postings_numpy(np, found) for found, _weight in lists]
+            ids = np.concatenate(decoded)
+            weights = np.concatenate([
+                np.full(len(line_ids), scale + weight, dtype=np.int64)
+                for line_ids, (_found, weight) in zip(decoded, lists)
+            ])
+            order = np.argsort(ids, kind="stable")
+            ids = ids[order]
+            starts = np.flatnonzero(np.concatenate(([True], ids[1:] != ids[:-1])))
+            candidates = ids[starts]
+            scores = np.add.reduceat(weights[order], starts)
+            top = min(limit, len(candidates))
+            best = np.argpartition(scores, -top)[-top:]
+            return sorted(((int(scores[slot]), int(candidates[slot])) for slot in best), reverse=True)
+        lists = [(_decode_postings(found), weight) for found, weight in lists]
+        scores = {}
+        get = scores.get
+        for found, weight in lists:
+            value = scale + weight
+            for line_id in found:
+                scores[line_id] = get(line_id, 0) + value
+        return heapq.nlargest(limit, ((score, line_id) for line_id, score in scores.items()))
+
+    def drill_lines(self, weak, count: int = 8) -> list[str]:
+        lines = []
+        for _score, line_id in self.query(weak, count * 2):
+            line = self.line(line_id)
+            if line not in lines:
+                lines.append(line)
+            if len(lines) == count:
+                break
+        return lines
+
+    def close(self) -> None:
+        for name in ("_text", "_line_offsets", "_terms", "_term_offsets", "_posting_offsets", "_postings"):
+            getattr(self, name).release()
+        self._map.close()
+        self._file.close()
+
+
+def _iter_corpus_lines(inputs, columns: int = LINE_DISPLAY_COLUMNS):
+    for path in _iter_ingest_files(inputs):
+        with open(path, encoding="utf-8-sig", errors="replace") as handle:
+            for raw in handle:
+                cleaned = _clean_ingest_line(raw)
+                if cleaned:
+                    yield from wrap_display_lines(cleaned, columns)
@@ -0,0 +1,227 @@
+"""콘텐츠 팩(.eospack) 컴파일과 읽기, 곡 라이브러리."""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from collections import OrderedDict
+from pathlib import Path
+
+from .text import LYRICS_LINES, LineTextSource, MappedTextSource, _normalize_line
+
+PACK_MAGIC = b"EOSPACK\0"
+PACK_VERSION = 2
+# 버전 1 팩은 자모·표시 폭 구역이 더 있을 뿐이라 그대로 읽습니다.
+PACK_READABLE_VERSIONS = (1, 2)
+PACK_SUFFIX = ".eospack"
+PACK_SECTIONS = ("text", "char_offsets", "byte_offsets")
+
+
+def compile_content_pack(lines, path, title: str = "", extra=None) -> dict:
+    """줄 목록을 미리 가공한 콘텐츠 팩 파일로 씁니다.
+
+    팩은 머리글 JSON과 8바이트 정렬된 구역들로 이루어집니다. NFC 본문과
+    줄별 글자·바이트 시작 위치(uint64)가 들어갑니다.
+    """
+    lines = [_normalize_line(line) for line in lines]
+    lines = [line for line in lines if line]
+    text = "\n".join(lines).encode("utf-8")
+
+    char_offsets = array("Q")
+    byte_offsets = array("Q")
+    chars = 0
+    position = 0
+    for line in lines:
+        char_offsets.append(chars)
+        byte_offsets.append(position)
+        chars += len(line)
+        position += len(line.encode("utf-8")) + 1
+    char_offsets.append(chars)
+    byte_offsets.append(len(text) + 1)
+
+    payloads = {
+        "text": text,
+        "char_offsets": char_offsets.tobytes(),
+        "byte_offsets": byte_offsets.tobytes(),
+    }
+    header = {
+        "version": PACK_VERSION,
+        "title": title,
+        "lines": len(lines),
+        "chars": chars,
+        "sha256": hashlib.sha256(text).hexdigest(),
+        "byteorder": sys.byteorder,
+        **(extra or {}),
+    }
+
+    _write_sectioned_file(path, PACK_MAGIC, header, PACK_SECTIONS, payloads)
+    return header
+
+
+def read_pack_header(path) -> dict:
+    with open(path, "rb") as handle:
+        if handle.read(len(PACK_MAGIC)) != PACK_MAGIC:
+            raise ValueError(f"{path}: 콘텐츠 팩이 아닙니다.")
+        (size,) = struct.unpack("<I", handle.read(4))
+        header = json.loads(handle.read(size).decode("utf-8"))
+    if header.get("version") not in PACK_READABLE_VERSIONS:
+        raise ValueError(f"{path}: 지원하지 않는 팩 버전 {header.get('version')}")
+    return header
+
+
+class ContentPack(LineTextSource):
+    """미리 가공한 콘텐츠 팩을 메모리 매핑해서 그대로 쓰는 텍스트 소스.
+
+    줄 위치는 파일에 든 배열을 memoryview로 바로 읽습니다. 열 때는 구역이
+    파일 안에 있는지만 보고, 본문 SHA-256은 ``verify=True``이거나
+    ``verify()``를 부를 때만 계산합니다. 곡을 바꿀 때처럼 Tk 스레드에서
+    여는 팩은 수집할 때 이미 해시를 적어 둔 것이라 다시 읽지 않습니다.
+    """
+
+    def __init__(self, path, verify: bool = False) -> None:
+        self.path = str(path)
+        self.header = read_pack_header(path)
+        if self.header.get("byteorder", sys.byteorder) != sys.byteorder:
+            raise ValueError(f"{path}: 다른 바이트 순서로 만든 팩입니다.")
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        view = self._view = memoryview(self._map)
+        sections = self.header["sections"]
+
+        def section(name: str) -> memoryview:
+            offset, length = sections[name]
+            if offset + length > len(self._map):
+                raise ValueError(f"{path}: 팩 파일이 잘렸습니다 ({name} 구역).")
+            return view[offset:offset + length]
+
+        try:
+            self._text = section("text")
+            self._char_offsets = section("char_offsets").cast("Q")
+            self._byte_offsets = section("byte_offsets").cast("Q")
+        except ValueError:
+            self.close()
+            raise
+        self.total_chars = self.header["chars"]
+        self.title = self.header.get("title", "")
+        self._lines = OrderedDict()
+
+        if verify:
+            try:
+                self.verify()
+            except ValueError:
+                self.close()
+                raise
+
+    def verify(self) -> None:
+        if hashlib.sha256(self._text).hexdigest() != self.header["sha256"]:
+            raise ValueError(f"{self.path}: 본문 해시가 맞지 않습니다.")
+
+    @property
+    def line_count(self) -> int:
+        return self.header["lines"]
+
+    def line(self, idx: int) -> str:
+        if idx < 0 or idx >= self.line_count:
+            raise IndexError(idx)
+        text = self._lines.get(idx)
+        if text is None:
+            start = self._byte_offsets[idx]
+            end = self._byte_offsets[idx + 1] - 1
+            text = self._lines[idx] = bytes(self._text[start:end]).decode("utf-8")
+            if len(self._lines) > 8:
+                self._lines.popitem(last=False)
+        return text
+
+    def position(self, index: int) -> tuple[int, int]:
+        line_idx = bisect.bisect_right(self._char_offsets, index, 0, self.line_count) - 1
+        return line_idx, index - self._char_offsets[line_idx]
+
+    def content_digest(self) -> str:
+        return self.header["sha256"]
+
+    def close(self) -> None:
+        for name in ("_text", "_char_offsets", "_byte_offsets", "_view"):
+            view = getattr(self, name, None)
+            if view is not None:
+                view.release()
+        self._map.close()
+        self._file.close()
+
+
+def default_library_dir() -> Path:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return Path(base) / "eos" / "packs"
+
+
+class SongLibrary:
+    """콘텐츠 팩이 모여 있는 폴더. 기본 가사도 처음 실행할 때 팩으로 만들어 둡니다."""
+
+    BUILTIN_TITLE = "애국가"
+
+    def __init__(self, directory=None) -> None:
+        self.directory = Path(directory) if directory else default_library_dir()
+
+    def ensure_builtin(self) -> Path:
+        digest = hashlib.sha256("\n".join(LYRICS_LINES).encode("utf-8")).hexdigest()
+        path = self.directory / f"builtin-{digest[:16]}{PACK_SUFFIX}"
+        if not path.exists():
+            self.directory.mkdir(parents=True, exist_ok=True)
+            compile_content_pack(LYRICS_LINES, path, self.BUILTIN_TITLE, {"builtin": True})
+        return path
+
+    def songs(self) -> list[tuple[str, Path]]:
+        songs = []
+        for path in sorted(self.directory.glob(f"*{PACK_SUFFIX}")):
+            try:
+                header = read_pack_header(path)
+            except (OSError, ValueError):
+                continue
+            songs.append((header.get("title") or path.stem, path))
+        return songs
+
+
+def _write_sectioned_file(path, magic: bytes, header: dict, names, payloads: dict) -> None:
+    """머리글 JSON 뒤에 8바이트 정렬 구역들을 붙여 원자적으로 씁니다.
+
+    구역 위치는 머리글 길이에 따라 달라지므로, 위치가 더 바뀌지 않을 때까지 맞춥니다.
+    """
+    sections = {name: [0, len(payloads[name])] for name in names}
+    while True:
+        header["sections"] = sections
+        header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+        offset = len(magic) + 4 + len(header_bytes)
+        moved = False
+        for name in names:
+            offset += -offset % 8
+            if sections[name][0] != offset:
+                sections[name][0] = offset
+                moved = True
+            offset += sections[name][1]
+        if not moved:
+            break
+
+    path = Path(path)
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as handle:
+        handle.write(magic)
+        handle.write(struct.pack("<I", len(header_bytes)))
+        handle.write(header_bytes)
+        for name in names:
+            handle.write(b"\0" * (sections[name][0] - handle.tell()))
+            handle.write(payloads[name])
+    os.replace(tmp_path, path)
+
+
+def open_text_source(text=None):
+    if not text:
+        return LineTextSource(LYRICS_LINES)
+    if text.endswith(PACK_SUFFIX):
+        # 명령줄로 직접 고른 팩은 게임 창을 띄우기 전에 한 번 확인합니다.
+        return ContentPack(text, verify=True)
+    return MappedTextSource(text)
@@ -0,0 +1,617 @@
+"""Tk 캔버스·텍스트 위젯 그리기 도우미 (타이머, 프레임 시계, 미사일, 가사 줄)."""
+
+from __future__ import annotations
+
+import heapq
+import random
+import time
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+class TimerRegistry:
+    """게임 세션이 건 Tk 타이머(``after``/``after_idle``)를 모아 두는 등록부.
+
+    발화하거나 취소된 타이머는 곧바로 빠지므로 ``live_count``는 아직 대기 중인
+    Tcl 이벤트 수와 같고, ``cancel_all``로 세션의 타이머를 한 번에 걷어낼 수
+    있습니다.
+    """
+
+    def __init__(self, root) -> None:
+        self.root = root
+        self._live = {}
+        self.cancelled_total = 0
+
+    def after(self, delay_ms: int, callback, *args):
+        return self._register(self.root.after, delay_ms, callback, args)
+
+    def after_idle(self, callback, *args):
+        return self._register(lambda fire: self.root.after_idle(fire), None, callback, args)
+
+    def _register(self, schedule, delay_ms, callback, args):
+        cell = []
+
+        def fire() -> None:
+            self._live.pop(cell[0], None)
+            callback(*args)
+
+        job = schedule(delay_ms, fire) if delay_ms is not None else schedule(fire)
+        cell.append(job)
+        self._live[job] = callback
+        return job
+
+    def cancel(self, job) -> None:
+        if self._live.pop(job, None) is not None:
+            self.root.after_cancel(job)
+            self.cancelled_total += 1
+
+    def cancel_all(self) -> int:
+        jobs = list(self._live)
+        self._live.clear()
+        for job in jobs:
+            self.root.after_cancel(job)
+        self.cancelled_total += len(jobs)
+        return len(jobs)
+
+    def live_count(self) -> int:
+        return len(self._live)
+
+
+class FrameClock:
+    """모든 애니메이션과 지연 호출을 하나의 고정 주기 타이머로 진행시키는 시계.
+
+    ``schedule(delay_ms, callback)``/``cancel(job)``에 Tk의 ``after``를 넘기면
+    플레이어가 아무리 빨리 입력해도 대기 중인 Tcl 타이머는 최대 하나입니다.
+    애니메이션은 ``step(now_ms) -> bool`` 호출체로, False를 돌려주면 끝납니다.
+    """
+
+    def __init__(self, schedule, cancel, interval_ms: int = 16, now=None) -> None:
+        self._schedule = schedule
+        self._cancel = cancel
+        self.interval_ms = interval_ms
+        self._now = now or (lambda: time.monotonic() * 1000.0)
+        self._animations = []
+        self._timers = []
+        self._timer_seq = 0
+        self._job = None
+        self._job_due = None
+        self._last_frame = None
+        self.frame_ms = float(interval_ms)
+        self.probe = None
+
+    def now(self) -> float:
+        return self._now()
+
+    def add(self, animation) -> None:
+        self._animations.append(animation)
+        self._wake(self.now())
+
+    def call_later(self, delay_ms: float, callback) -> list:
+        self._timer_seq += 1
+        timer = [self.now() + delay_ms, self._timer_seq, callback]
+        heapq.heappush(self._timers, timer)
+        self._wake(timer[0])
+        return timer
+
+    def cancel(self, timer) -> None:
+        if timer is not None:
+            timer[2] = None
+
+    def clear(self) -> None:
+        self._animations = []
+        self._timers = []
+        if self._job is not None:
+            self._cancel(self._job)
+            self._job = None
+            self._job_due = None
+
+    def active_count(self) -> int:
+        return len(self._animations) + sum(1 for timer in self._timers if timer[2] is not None)
+
+    def _wake(self, due: float, frame_start=None) -> None:
+        now = self.now()
+        if self._animations:
+            due = min(due, (now if frame_start is None else frame_start) + self.interval_ms)
+        if self._job is not None:
+            if self._job_due <= due:
+                return
+            self._cancel(self._job)
+        delay = max(1, int(due - now + 0.999))
+        self._job_due = due
+        self._job = self._schedule(delay, self._tick)
+
+    def _tick(self) -> None:
+        due = self._job_due
+        self._job = None
+        self._job_due = None
+        now = self.now()
+        probe = self.probe
+        if probe is not None and due is not None:
+            probe.record("frame_jitter", max(0.0, now - due))
+
+        # 호출체가 예외를 던져도 그 호출체만 빠지고 시계는 다음 틱을 겁니다 (예외는 Tk가 보고합니다).
+        timers = self._timers
+        try:
+            while timers and timers[0][0] <= now:
+                timer_due, _seq, callback = heapq.heappop(timers)
+                if callback is not None:
+                    if probe is not None:
+                        probe.record("timer_jitter", now - timer_due)
+                    callback()
+
+            if self._animations:
+                if self._last_frame is not None:
+                    self.frame_ms = self.frame_ms * 0.8 + (now - self._last_frame) * 0.2
+                self._last_frame = now
+                pending = iter(self._animations)
+                self._animations = []
+                still_running = []
+                try:
+                    for animation in pending:
+                        if animation(now):
+                            still_running.append(animation)
+                finally:
+                    still_running.extend(pending)
+                    still_running.extend(self._animations)
+                    self._animations = still_running
+        finally:
+            timers = self._timers
+            while timers and timers[0][2] is None:
+                heapq.heappop(timers)
+
+            if not self._animations:
+                self._last_frame = None
+            if timers:
+                self._wake(timers[0][0], now)
+            elif self._animations:
+                self._wake(now + self.interval_ms, now)
+
+
+def bezier_trajectory(start, control1, control2, end, steps: int, ease_power: float) -> tuple[list, list]:
+    """3차 베지어 궤적의 ``steps + 1``개 점을 한 번에 계산합니다.
+
+    NumPy가 있으면 벡터 연산으로, 없으면 거듭제곱 없이 곱셈만으로 계산합니다.
+    """
+    if np is not None:
+        t = np.linspace(0.0, 1.0, steps + 1) ** ease_power
+        inv = 1.0 - t
+        b0 = inv * inv * inv
+        b1 = 3.0 * inv * inv * t
+        b2 = 3.0 * inv * t * t
+        b3 = t * t * t
+        xs = b0 * start[0] + b1 * control1[0] + b2 * control2[0] + b3 * end[0]
+        ys = b0 * start[1] + b1 * control1[1] + b2 * control2[1] + b3 * end[1]
+        return xs.tolist(), ys.tolist()
+
+    x0, y0 = start
+    x1, y1 = control1
+    x2, y2 = control2
+    x3, y3 = end
+    xs = []
+    ys = []
+    for step in range(steps + 1):
+        t = (step / steps) ** ease_power
+        inv = 1.0 - t
+        b0 = inv * inv * inv
+        b1 = 3.0 * inv * inv * t
+        b2 = 3.0 * inv * t * t
+        b3 = t * t * t
+        xs.append(b0 * x0 + b1 * x1 + b2 * x2 + b3 * x3)
+        ys.append(b0 * y0 + b1 * y1 + b2 * y2 + b3 * y3)
+    return xs, ys
+
+
+class TrajectoryCache:
+    """(단계 수, 가속 구간)별로 미리 구운 정규화 궤적 묶음.
+
+    템플릿은 시작점 (0, 0), 목표점 (1, 0) 좌표계에서 계산해 두고, 발사할 때
+    실제 시작점과 목표점에 맞춰 평행 이동·확대만 합니다.
+    """
+
+    EASE_BUCKET = 0.25
+
+    def __init__(self, rng: random.Random, variants: int = 6, reference_span: float = 260.0) -> None:
+        self.rng = rng
+        self.variants = variants
+        self.reference_span = reference_span
+        self._templates = {}
+
+    def trajectory(self, start, end, steps: int, ease_power: float) -> tuple[list, list]:
+        bucket = round(ease_power / self.EASE_BUCKET)
+        key = (steps, bucket)
+        templates = self._templates.get(key)
+        if templates is None:
+            templates = [self._bake(steps, bucket * self.EASE_BUCKET) for _ in range(self.variants)]
+            self._templates[key] = templates
+        us, vs = templates[self.rng.randrange(len(templates))]
+
+        dx = end[0] - start[0]
+        dy = end[1] - start[1]
+        if np is not None:
+            xs = start[0] + us * dx - vs * dy
+            ys = start[1] + us * dy + vs * dx
+            return xs.tolist(), ys.tolist()
+        sx, sy = start
+        xs = [sx + u * dx - v * dy for u, v in zip(us, vs)]
+        ys = [sy + u * dy + v * dx for u, v in zip(us, vs)]
+        return xs, ys
+
+    def __len__(self) -> int:
+        return len(self._templates)
+
+    def _bake(self, steps: int, ease_power: float) -> tuple:
+        rng = self.rng
+        span = self.reference_span
+        control1 = (rng.uniform(0.3, 1.0) * rng.choice([-1, 1]), rng.uniform(-220, 120) / span)
+        control2 = (1.0 - rng.uniform(0.2, 0.9) * rng.choice([-1, 1]), rng.uniform(-120, 200) / span)
+        us, vs = bezier_trajectory((0.0, 0.0), control1, control2, (1.0, 0.0), steps, ease_power)
+        if np is not None:
+            return np.asarray(us), np.asarray(vs)
+        return us, vs
+
+
+class EntityGroup:
+    """태그 하나로 묶은 전투원 그림(몸통, 이름표 등)과 그 변위.
+
+    아이템마다 절대 좌표를 다시 쓰지 않고 기억해 둔 변위와의 차이만큼 태그
+    전체를 ``move`` 한 번으로 옮깁니다. 색 바꾸기도 ``{tag}_body`` 태그에
+    ``itemconfig`` 한 번이라 그림을 이루는 아이템 수와 무관합니다.
+    """
+
+    def __init__(self, canvas, tag: str) -> None:
+        self.canvas = canvas
+        self.tag = tag
+        self.body_tag = f"{tag}_body"
+        self.offset = (0.0, 0.0)
+        self._style = {}
+
+    def tags(self, body: bool = False) -> tuple:
+        return (self.tag, self.body_tag) if body else (self.tag,)
+
+    def move_to(self, dx: float, dy: float) -> None:
+        old_x, old_y = self.offset
+        if dx != old_x or dy != old_y:
+            self.canvas.move(self.tag, dx - old_x, dy - old_y)
+            self.offset = (dx, dy)
+
+    def style(self, **options) -> None:
+        changed = {name: value for name, value in options.items() if self._style.get(name) != value}
+        if changed:
+            self.canvas.itemconfig(self.body_tag, **changed)
+            self._style.update(changed)
+
+
+class MissilePool:
+    """미사일 캔버스 항목을 미리 만들어 두고 재사용하는 풀.
+
+    동시에 날 수 있는 미사일 수는 ``capacity``로 제한됩니다. 자리가 없으면
+    가장 최근에 쏜 미사일에 합쳐지고, 프레임이 예산을 넘기면 비행 단계를
+    줄이다가 결국 즉시 명중으로 처리합니다.
+    """
+
+    MAX_RADIUS = 16
+
+    def __init__(self, canvas, clock: FrameClock, on_hit, capacity: int = 24, frame_budget_ms: float = 24.0) -> None:
+        if capacity < 1:
+            raise ValueError(f"미사일 풀에는 자리가 하나 이상 있어야 합니다: {capacity}")
+        self.canvas = canvas
+        self.clock = clock
+        self.on_hit = on_hit
+        self.frame_budget_ms = frame_budget_ms
+        self.items = [
+            canvas.create_oval(0, 0, 0, 0, fill="#38bdf8", outline="#bae6fd", state="hidden")
+            for _ in range(capacity)
+        ]
+        self._free = list(reversed(self.items))
+        self._flights = []
+        self._animating = False
+        self.level_of_detail = 0
+        self.merged = 0
+        self.instant_hits = 0
+
+    def active_count(self) -> int:
+        return len(self._flights)
+
+    def launch(self, radius: int, xs: list, ys: list, frame_delay: int, hits: int = 1) -> None:
+        self._adjust_detail()
+        if self.level_of_detail >= 2:
+            self.instant_hits += hits
+            self.on_hit(hits)
+            return
+
+        if not self._free:
+            youngest = self._flights[-1]
+            youngest[6] += hits
+            youngest[1] = min(youngest[1] + hits, self.MAX_RADIUS)
+            self.merged += hits
+            return
+
+        radius = min(radius + hits - 1, self.MAX_RADIUS)
+
+        if self.level_of_detail == 1 and len(xs) > 24:
+            xs = xs[::3] + xs[-1:]
+            ys = ys[::3] + ys[-1:]
+
+        item = self._free.pop()
+        flight = [item, radius, xs, ys, frame_delay, self.clock.now(), hits]
+        self._place(flight, 0)
+        self.canvas.itemconfig(item, state="normal")
+        self._flights.append(flight)
+        if not self._animating:
+            self._animating = True
+            self.clock.add(self._step)
+
+    def clear(self) -> None:
+        for flight in self._flights:
+            self._release(flight[0])
+        self._flights = []
+        self._animating = False
+
+    def _adjust_detail(self) -> None:
+        frame_ms = self.clock.frame_ms if self._flights else self.clock.interval_ms
+        if frame_ms > self.frame_budget_ms * 2:
+            self.level_of_detail = 2
+        elif frame_ms > self.frame_budget_ms:
+            self.level_of_detail = max(self.level_of_detail, 1)
+        elif frame_ms < self.frame_budget_ms * 0.75:
+            self.level_of_detail = max(0, self.level_of_detail - 1)
+
+    def _place(self, flight: list, step: int) -> None:
+        x = flight[2][step]
+        y = flight[3][step]
+        radius = flight[1]
+        self.canvas.coords(flight[0], x - radius, y - radius, x + radius, y + radius)
+
+    def _release(self, item) -> None:
+        self.canvas.itemconfig(item, state="hidden")
+        self._free.append(item)
+
+    def _step(self, now: float) -> bool:
+        still_flying = []
+        for flight in self._flights:
+            step = int((now - flight[5]) // flight[4])
+            if step >= len(flight[2]):
+                self._release(flight[0])
+                self.on_hit(flight[6])
+                continue
+            self._place(flight, step)
+            still_flying.append(flight)
+        self._flights = still_flying
+        self._animating = bool(still_flying)
+        return self._animating
+
+
+LINE_TAGS = ("typed", "current", "pending", "bottom_line", "bottom_typed", "bottom_wrong", "align")
+
+
+class LineRenderer:
+    """현재 줄 Text 위젯을 바뀐 부분만 다시 그리는 렌더러.
+
+    줄이 바뀔 때만 버퍼 전체를 다시 만들고, 같은 줄 안에서는 태그 경계를
+    옮기고 아래 줄에서 바뀐 글자만 교체합니다.
+    """
+
+    def __init__(self, widget) -> None:
+        self.widget = widget
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        self._line = None
+        self._typed = 0
+        self._wrong = None
+        self._bottom = ""
+
+    def render(self, line: str, typed_len: int, wrong_char=None) -> None:
+        typed_len = min(typed_len, len(line))
+        if typed_len >= len(line):
+            wrong_char = None
+        if line != self._line:
+            bottom = line[:typed_len] + (wrong_char or "")
+            self._rebuild(line, typed_len, wrong_char, bottom.ljust(len(line)))
+            return
+        if typed_len == self._typed and wrong_char == self._wrong:
+            return
+
+        self._replace_bottom_chars(line, typed_len, wrong_char)
+
+        old_t, new_t, size = self._typed, typed_len, len(line)
+        self._move_tag("typed", 1, (0, old_t), (0, new_t))
+        self._move_tag("current", 1, (old_t, min(old_t + 1, size)), (new_t, min(new_t + 1, size)))
+        self._move_tag("pending", 1, (old_t + 1, size), (new_t + 1, size))
+        self._move_tag("bottom_typed", 2, (0, old_t), (0, new_t))
+        old_wrong = (old_t, old_t + 1) if self._wrong else (0, 0)
+        new_wrong = (new_t, new_t + 1) if wrong_char else (0, 0)
+        self._move_tag("bottom_wrong", 2, old_wrong, new_wrong)
+
+        self._typed = typed_len
+        self._wrong = wrong_char
+
+    def show_transition(self, line: str) -> None:
+        self._rebuild(line, len(line), None, " " * len(line), bottom_typed=False)
+        self._line = None
+
+    def _rebuild(self, line: str, typed_len: int, wrong_char, bottom: str, bottom_typed: bool = True) -> None:
+        widget = self.widget
+        widget.configure(state="normal")
+        widget.delete("1.0", "end")
+        widget.insert("1.0", line)
+        widget.insert("end", "\n")
+        widget.insert("end", bottom)
+
+        for tag in LINE_TAGS:
+            widget.tag_remove(tag, "1.0", "end")
+
+        widget.tag_add("align", "1.0", "2.0")
+        widget.tag_add("align", "2.0", "3.0")
+        widget.tag_add("bottom_line", "2.0", "3.0")
+
+        if typed_len > 0:
+            widget.tag_add("typed", "1.0", f"1.{typed_len}")
+            if bottom_typed:
+                widget.tag_add("bottom_typed", "2.0", f"2.{typed_len}")
+
+        if typed_len < len(line):
+            widget.tag_add("current", f"1.{typed_len}", f"1.{typed_len + 1}")
+            widget.tag_add("pending", f"1.{typed_len + 1}", "1.end")
+
+        if wrong_char:
+            widget.tag_add("bottom_wrong", f"2.{typed_len}", f"2.{typed_len + 1}")
+
+        widget.configure(state="disabled")
+
+        self._line = line
+        self._typed = typed_len
+        self._wrong = wrong_char
+        self._bottom = bottom
+
+    def _replace_bottom_chars(self, line: str, typed_len: int, wrong_char) -> None:
+        old_bottom = self._bottom
+        low = min(self._typed, typed_len)
+        high = min(max(self._typed, typed_len) + 1, len(line))
+        changed = []
+        for pos in range(low, high):
+            if pos < typed_len:
+                ch = line[pos]
+            elif pos == typed_len and wrong_char:
+                ch = wrong_char
+            else:
+                ch = " "
+            if ch != old_bottom[pos]:
+                changed.append((pos, ch))
+        if not changed:
+            return
+
+        widget = self.widget
+        widget.configure(state="normal")
+        for pos, ch in changed:
+            # 교체한 글자에는 이전 상태의 태그를 붙여 두고, 태그 이동에서 함께 정리합니다.
+            tags = ["align", "bottom_line"]
+            if pos < self._typed:
+                tags.append("bottom_typed")
+            elif pos == self._typed and self._wrong:
+                tags.append("bottom_wrong")
+            widget.delete(f"2.{pos}", f"2.{pos + 1}")
+            widget.insert(f"2.{pos}", ch, tuple(tags))
+        widget.configure(state="disabled")
+
+        chars = list(old_bottom)
+        for pos, ch in changed:
+            chars[pos] = ch
+        self._bottom = "".join(chars)
+
+    def _move_tag(self, tag: str, row: int, old: tuple[int, int], new: tuple[int, int]) -> None:
+        a, b = old
+        c, d = new
+        old_empty = a >= b
+        new_empty = c >= d
+        if old_empty and new_empty:
+            return
+
+        widget = self.widget
+        if old_empty:
+            widget.tag_add(tag, f"{row}.{c}", f"{row}.{d}")
+            return
+        if new_empty:
+            widget.tag_remove(tag, f"{row}.{a}", f"{row}.{b}")
+            return
+        if b <= c or d <= a:
+            widget.tag_remove(tag, f"{row}.{a}", f"{row}.{b}")
+            widget.tag_add(tag, f"{row}.{c}", f"{row}.{d}")
+            return
+
+        if a < c:
+            widget.tag_remove(tag, f"{row}.{a}", f"{row}.{c}")
+        elif c < a:
+            widget.tag_add(tag, f"{row}.{c}", f"{row}.{a}")
+        if d < b:
+            widget.tag_remove(tag, f"{row}.{d}", f"{row}.{b}")
+        elif b < d:
+            widget.tag_add(tag, f"{row}.{b}", f"{row}.{d}")
+
+
+VIEWPORT_BEFORE = 2
+VIEWPORT_AFTER = 4
+VIEWPORT_TAGS = ("view_done", "view_current", "view_typed", "view_next")
+
+
+class LyricsViewport:
+    """전체 가사 가운데 현재 줄 주변 몇 줄만 Text 위젯에 올려 두는 가상 스크롤 뷰.
+
+    현재 줄은 항상 같은 행에 두고, 줄이 넘어가면 맨 위 행을 지우고 맨 아래에
+    새 줄만 붙입니다. 같은 줄 안의 입력은 ``view_typed`` 태그 경계만 옮기므로
+    키 입력당 Tk 호출 수가 가사 길이와 무관합니다.
+    """
+
+    def __init__(self, widget, before: int = VIEWPORT_BEFORE, after: int = VIEWPORT_AFTER) -> None:
+        self.widget = widget
+        self.before = before
+        self.after = after
+        self.rows = before + 1 + after
+        self.invalidate()
+
+    def invalidate(self) -> None:
+        self._source = None
+        self._index = None
+        self._typed = 0
+
+    def render(self, source, line_idx: int, typed_len: int) -> None:
+        if source is not self._source or self._index is None:
+            self._rebuild(source, line_idx, typed_len)
+            return
+        delta = line_idx - self._index
+        if delta < 0 or delta >= self.rows:
+            self._rebuild(source, line_idx, typed_len)
+        elif delta > 0:
+            self._scroll(source, line_idx, delta, typed_len)
+        elif typed_len != self._typed:
+            row = self.before + 1
+            low, high = sorted((self._typed, typed_len))
+            method = self.widget.tag_add if typed_len > self._typed else self.widget.tag_remove
+            method("view_typed", f"{row}.{low}", f"{row}.{high}")
+            self._typed = typed_len
+
+    def _line(self, source, idx: int) -> str:
+        return source.line(idx) if 0 <= idx < source.line_count else ""
+
+    def _rebuild(self, source, line_idx: int, typed_len: int) -> None:
+        widget = self.widget
+        widget.configure(state="normal")
+        widget.delete("1.0", "end")
+        for tag in VIEWPORT_TAGS:
+            widget.tag_remove(tag, "1.0", "end")
+        for row in range(self.rows):
+            offset = row - self.before
+            tag = "view_done" if offset < 0 else "view_current" if offset == 0 else "view_next"
+            text = self._line(source, line_idx + offset)
+            widget.insert("end", text if row == 0 else "\n" + text, ("align", tag))
+        self._mark_typed(typed_len)
+        widget.configure(state="disabled")
+        self._source = source
+        self._index = line_idx
+
+    def _scroll(self, source, line_idx: int, delta: int, typed_len: int) -> None:
+        widget = self.widget
+        row = self.before + 1
+        widget.configure(state="normal")
+        widget.delete("1.0", f"{delta + 1}.0")
+        first_new = line_idx + self.after - delta + 1
+        text = "\n".join(self._line(source, idx) for idx in range(first_new, first_new + delta))
+        widget.insert("end", "\n" + text, ("align", "view_next"))
+        # 위로 밀려 올라온 행들의 태그를 현재 줄 행 기준으로 다시 나눕니다.
+        widget.tag_remove("view_typed", "1.0", "end")
+        widget.tag_remove("view_current", "1.0", f"{row}.0")
+        widget.tag_remove("view_next", "1.0", f"{row + 1}.0")
+        widget.tag_add("view_done", "1.0", f"{row}.0")
+        widget.tag_add("view_current", f"{row}.0", f"{row + 1}.0")
+        self._mark_typed(typed_len)
+        widget.configure(state="disabled")
+        self._index = line_idx
+
+    def _mark_typed(self, typed_len: int) -> None:
+        if typed_len > 0:
+            row = self.before + 1
+            self.widget.tag_add("view_typed", f"{row}.0", f"{row}.{typed_len}")
+        self._typed = typed_len
@@ -0,0 +1,102 @@
+"""입력 기록 저장·불러오기와 화면 없는 재생."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+
+from .packs import open_text_source
+from .engine import TypingEngine
+
+REPLAY_FORMAT = "eos-replay"
+REPLAY_VERSION = 1
+REPLAY_INPUT = "i"
+REPLAY_RESTART = "r"
+
+
+class TraceDigest:
+    """엔진 이벤트 열을 저장하지 않고 SHA-256으로 요약하는 구독자."""
+
+    def __init__(self) -> None:
+        self._hash = hashlib.sha256()
+        self.count = 0
+
+    def __call__(self, event: str, *args) -> None:
+        self._hash.update(repr((event,) + args).encode("utf-8"))
+        self.count += 1
+
+    def mark(self, label: str) -> None:
+        self(label)
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+def engine_state(engine: TypingEngine) -> dict:
+    return {
+        "index": engine.current_index,
+        "line": engine.current_line_index,
+        "boss_hp": engine.boss_hp,
+        "game_over": engine.game_over,
+        "victory": engine.victory,
+    }
+
+
+class SessionRecorder:
+    """입력창 변화와 재시작을 시각과 함께 기록합니다.
+
+    파일은 JSON Lines입니다. 첫 줄은 시드와 본문 해시를 담은 머리글, 이어서
+    ``[직전 이벤트로부터 ms, 종류, 입력창 내용]`` 줄들, 마지막 줄은 최종 상태와
+    이벤트 해시입니다.
+    """
+
+    def __init__(self, path: str, seed: int, text=None, text_digest: str = "") -> None:
+        self.path = path
+        self.header = {
+            "format": REPLAY_FORMAT,
+            "version": REPLAY_VERSION,
+            "seed": seed,
+            "text": text,
+            "text_sha256": text_digest,
+        }
+        self.events = []
+        self._last = time.monotonic()
+
+    def record(self, kind: str, text: str = "") -> None:
+        now = time.monotonic()
+        self.events.append([int(round((now - self._last) * 1000)), kind, text])
+        self._last = now
+
+    def save(self, final: dict, trace: TraceDigest) -> None:
+        with open(self.path, "w", encoding="utf-8") as handle:
+            handle.write(json.dumps(self.header, ensure_ascii=False) + "\n")
+            for event in self.events:
+                handle.write(json.dumps(event, ensure_ascii=False, separators=(",", ":")) + "\n")
+            footer = {"final": final, "trace_sha256": trace.hexdigest(), "trace_events": trace.count}
+            handle.write(json.dumps(footer, ensure_ascii=False) + "\n")
+
+
+def load_recording(path: str) -> tuple[dict, list, dict]:
+    with open(path, encoding="utf-8") as handle:
+        rows = [json.loads(line) for line in handle if line.strip()]
+    if not rows or rows[0].get("format") != REPLAY_FORMAT:
+        raise ValueError(f"{path}: Eos 리플레이 파일이 아닙니다.")
+    header = rows[0]
+    footer = rows[-1] if len(rows) > 1 and isinstance(rows[-1], dict) else {}
+    events = rows[1:-1] if footer else rows[1:]
+    return header, events, footer
+
+
+def replay_headless(header: dict, events: list, source=None) -> tuple[TypingEngine, TraceDigest]:
+    """기록을 화면 없이 최대 속도로 다시 실행합니다."""
+    engine = TypingEngine(source if source is not None else open_text_source(header.get("text")))
+    trace = TraceDigest()
+    engine.subscribe(trace)
+    for _delay, kind, text in events:
+        if kind == REPLAY_INPUT:
+            engine.feed_text(text)
+        elif kind == REPLAY_RESTART:
+            trace.mark("reset")
+            engine.reset()
+    return engine, trace
@@ -0,0 +1,322 @@
+"""입력 통계(자모별 오타, 지연 히스토그램)와 입력 지연 단계 측정."""
+
+from __future__ import annotations
+
+import json
+import time
+from array import array
+
+from .text import CHOSEONG, HangulMatcher, JONGSEONG, JUNGSEONG
+from .ngram import NGRAM_SIZES
+
+
+class RollingHistogram:
+    """최근 ``size``개 표본만 고리 버퍼에 담아 백분위수를 계산합니다."""
+
+    def __init__(self, size: int = 1024) -> None:
+        self.size = size
+        self._values = array("d", bytes(8 * size))
+        self._next = 0
+        self.count = 0
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.size
+        self.count += 1
+        if value > self.max:
+            self.max = value
+
+    def percentiles(self, *quantiles: float) -> list[float]:
+        filled = min(self.count, self.size)
+        if not filled:
+            return [0.0 for _ in quantiles]
+        data = sorted(self._values[:filled])
+        return [data[min(filled - 1, int(q / 100.0 * filled))] for q in quantiles]
+
+    def summary(self) -> dict:
+        p50, p95, p99 = self.percentiles(50, 95, 99)
+        return {"count": self.count, "p50": p50, "p95": p95, "p99": p99, "max": self.max}
+
+    def samples(self) -> list[float]:
+        return self._values[:min(self.count, self.size)].tolist()
+
+
+STATS_WINDOW = 64
+LATENCY_BUCKETS = 16
+# 초성 19 + 중성 21 + 종성 28(0은 받침 없음) 자리
+JAMO_SLOTS = len(CHOSEONG) + len(JUNGSEONG) + len(JONGSEONG)
+CHAR_SLOTS = 1024
+MISSED_SLOTS = 16
+NGRAM_SLOTS = 32
+
+
+def _space_saving_add(table: dict, key: str, slots: int) -> None:
+    """Space-Saving 방식으로 고정 크기 표에서 자주 나온 항목을 셉니다.
+
+    표가 차면 가장 적게 센 항목을 내보내고 그 횟수를 물려받습니다 (오차 상한도 기록).
+    """
+    entry = table.get(key)
+    if entry is not None:
+        entry[0] += 1
+    elif len(table) < slots:
+        table[key] = [1, 0]
+    else:
+        victim = min(table, key=lambda item: table[item][0])
+        floor = table.pop(victim)[0]
+        table[key] = [floor + 1, floor]
+
+
+def _latency_bucket(milliseconds: float) -> int:
+    """지연 구간 번호. b번 구간은 [2^(b-1), 2^b) ms이고 0번은 1 ms 미만입니다."""
+    return min(LATENCY_BUCKETS - 1, int(milliseconds).bit_length())
+
+
+def _bucket_median_ms(counts) -> float:
+    total = sum(counts)
+    seen = 0
+    for bucket, count in enumerate(counts):
+        seen += count
+        if seen * 2 >= total:
+            return float(1 << bucket)
+    return 0.0
+
+
+def _jamo_name(slot: int) -> str:
+    if slot < len(CHOSEONG):
+        return CHOSEONG[slot]
+    slot -= len(CHOSEONG)
+    if slot < len(JUNGSEONG):
+        return JUNGSEONG[slot]
+    return JONGSEONG[slot - len(JUNGSEONG)]
+
+
+class TypingStats:
+    """키 입력마다 상수 시간에 갱신되는 타자 통계. 메모리 크기도 고정입니다.
+
+    최근 ``window``개의 맞은 글자 시각과 누적 타수를 고리 버퍼에 두고 CPM/WPM을
+    구하고, 최근 ``window``번의 입력 결과로 정확도를 구합니다. 글자 간 간격은
+    글자별·자모별 로그 구간 히스토그램에 쌓고, 많이 틀린 글자는 Space-Saving
+    방식의 고정 크기 표로 셉니다.
+    """
+
+    def __init__(self, window: int = STATS_WINDOW) -> None:
+        self.window = window
+        self._times = array("d", bytes(8 * window))
+        self._strokes = array("Q", bytes(8 * window))
+        self._outcomes = bytearray(window)
+        self.jamo_latency = array("I", bytes(4 * JAMO_SLOTS * LATENCY_BUCKETS))
+        self.char_latency = {}
+        self._chars = {}
+        self.missed = {}
+        self.missed_ngrams = {}
+        self.reset()
+
+    def reset(self) -> None:
+        self.correct = 0
+        self.wrong = 0
+        self.strokes = 0
+        self.started = None
+        self.last = None
+        self._next = 0
+        self._filled = 0
+        self._next_outcome = 0
+        self._outcomes_filled = 0
+        self._outcome_sum = 0
+        for index in range(len(self.jamo_latency)):
+            self.jamo_latency[index] = 0
+        self.char_latency.clear()
+        self._chars.clear()
+        self.missed.clear()
+        self.missed_ngrams.clear()
+
+    def correct_char(self, ch: str, now: float) -> None:
+        info = self._chars.get(ch)
+        if info is None:
+            info = self._char_info(ch)
+        histogram, strokes, offsets = info
+        self.correct += 1
+        self.strokes += strokes
+        slot = self._next
+        self._times[slot] = now
+        self._strokes[slot] = self.strokes
+        slot += 1
+        self._next = 0 if slot == self.window else slot
+        if self._filled < self.window:
+            self._filled += 1
+        self._outcome(1)
+
+        last = self.last
+        if last is not None:
+            bucket = int((now - last) * 1000.0).bit_length()
+            if bucket >= LATENCY_BUCKETS:
+                bucket = LATENCY_BUCKETS - 1
+            if histogram is not None:
+                histogram[bucket] += 1
+            jamo = self.jamo_latency
+            for offset in offsets:
+                jamo[offset + bucket] += 1
+        elif self.started is None:
+            self.started = now
+        self.last = now
+
+    def _char_info(self, ch: str) -> tuple:
+        """글자별 (히스토그램, 타수, 자모 히스토그램 위치들). 자리가 남아 있으면 캐시합니다."""
+        parts = HangulMatcher.decompose(ch)
+        strokes = 1
+        offsets = ()
+        if parts is not None:
+            initial, medial, final = parts
+            strokes = 2 + (final > 0)
+            strokes += (HangulMatcher.VOWEL_FIRST[medial] != medial) + (HangulMatcher.FINAL_FIRST[final] != final)
+            slots = [initial, len(CHOSEONG) + medial]
+            if final:
+                slots.append(len(CHOSEONG) + len(JUNGSEONG) + final)
+            offsets = tuple(slot * LATENCY_BUCKETS for slot in slots)
+        if len(self._chars) >= CHAR_SLOTS:
+            return None, strokes, offsets
+        histogram = self.char_latency[ch] = array("I", bytes(4 * LATENCY_BUCKETS))
+        info = self._chars[ch] = (histogram, strokes, offsets)
+        return info
+
+    def wrong_char(self, expected: str, now: float, context: str = "") -> None:
+        """틀린 입력 한 번. ``context``는 같은 줄에서 기대 글자 바로 앞 글자들입니다."""
+        self.wrong += 1
+        self._outcome(0)
+        if self.started is None:
+            self.started = now
+        _space_saving_add(self.missed, expected, MISSED_SLOTS)
+        if expected != " ":
+            for size in NGRAM_SIZES:
+                gram = context[-(size - 1):] + expected
+                if len(gram) == size and " " not in gram:
+                    _space_saving_add(self.missed_ngrams, gram, NGRAM_SLOTS)
+
+    def _outcome(self, value: int) -> None:
+        slot = self._next_outcome
+        if self._outcomes_filled == self.window:
+            self._outcome_sum += value - self._outcomes[slot]
+        else:
+            self._outcomes_filled += 1
+            self._outcome_sum += value
+        self._outcomes[slot] = value
+        slot += 1
+        self._next_outcome = 0 if slot == self.window else slot
+
+    def _span(self) -> tuple[float, int, int]:
+        if self._filled < 2:
+            return 0.0, 0, 0
+        newest = (self._next - 1) % self.window
+        oldest = (self._next - self._filled) % self.window
+        return (
+            self._times[newest] - self._times[oldest],
+            self._strokes[newest] - self._strokes[oldest],
+            self._filled - 1,
+        )
+
+    def cpm(self) -> float:
+        """최근 구간의 분당 타수 (자모 기준)."""
+        seconds, strokes, _chars = self._span()
+        return strokes * 60.0 / seconds if seconds > 0 else 0.0
+
+    def wpm(self) -> float:
+        """최근 구간의 분당 단어 수 (다섯 글자를 한 단어로)."""
+        seconds, _strokes, chars = self._span()
+        return chars / 5.0 * 60.0 / seconds if seconds > 0 else 0.0
+
+    def accuracy(self) -> float:
+        if not self._outcomes_filled:
+            return 100.0
+        return self._outcome_sum * 100.0 / self._outcomes_filled
+
+    def overall_accuracy(self) -> float:
+        total = self.correct + self.wrong
+        return self.correct * 100.0 / total if total else 100.0
+
+    def most_missed(self, count: int = 3) -> list[tuple[str, int]]:
+        ranked = sorted(self.missed.items(), key=lambda item: -item[1][0])
+        return [(ch, counts[0]) for ch, counts in ranked[:count]]
+
+    def weak_ngrams(self, count: int = NGRAM_SLOTS) -> list[tuple[str, int]]:
+        ranked = sorted(self.missed_ngrams.items(), key=lambda item: -item[1][0])
+        return [(gram, counts[0]) for gram, counts in ranked[:count]]
+
+    def slowest_jamo(self, count: int = 3, min_samples: int = 3) -> list[tuple[str, float]]:
+        ranked = []
+        for slot in range(JAMO_SLOTS):
+            counts = self.jamo_latency[slot * LATENCY_BUCKETS:(slot + 1) * LATENCY_BUCKETS]
+            if sum(counts) >= min_samples:
+                ranked.append((_bucket_median_ms(counts), _jamo_name(slot)))
+        ranked.sort(reverse=True)
+        return [(name, ms) for ms, name in ranked[:count]]
+
+    def summary(self, now=None) -> dict:
+        elapsed = 0.0
+        if self.started is not None and self.last is not None:
+            elapsed = (now if now is not None else self.last) - self.started
+        return {
+            "chars": self.correct,
+            "wrong": self.wrong,
+            "seconds": elapsed,
+            "cpm": self.strokes * 60.0 / elapsed if elapsed > 0 else 0.0,
+            "wpm": self.correct / 5.0 * 60.0 / elapsed if elapsed > 0 else 0.0,
+            "accuracy": self.overall_accuracy(),
+            "most_missed": self.most_missed(),
+            "slowest_jamo": self.slowest_jamo(),
+        }
+
+
+LATENCY_STAGES = (
+    ("engine", "입력→엔진"),
+    ("reconcile", "입력→갱신 시작"),
+    ("render", "입력→그리기 명령"),
+    ("photon", "입력→화면 반영"),
+    ("frame_jitter", "프레임 지연"),
+    ("timer_jitter", "타이머 지연"),
+)
+
+
+class LatencyProbe:
+    """키 입력 경로의 단계별 지연(ms)과 타이머 지터를 모읍니다.
+
+    ``input_started``가 찍힌 뒤 각 ``stage`` 호출은 그 시점까지의 경과 시간을
+    기록하고, ``input_finished``가 한 묶음의 입력을 닫습니다.
+    """
+
+    def __init__(self, size: int = 1024) -> None:
+        self.histograms = {name: RollingHistogram(size) for name, _label in LATENCY_STAGES}
+        self._input_started = None
+
+    def record(self, name: str, milliseconds: float) -> None:
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = RollingHistogram()
+        histogram.add(milliseconds)
+
+    def input_started(self) -> None:
+        if self._input_started is None:
+            self._input_started = time.perf_counter_ns()
+
+    def stage(self, name: str) -> None:
+        if self._input_started is not None:
+            self.record(name, (time.perf_counter_ns() - self._input_started) / 1e6)
+
+    def input_finished(self) -> float | None:
+        """입력 한 묶음을 닫고, 열린 묶음이 있었으면 입력→화면 지연(ms)을 돌려줍니다."""
+        started = self._input_started
+        if started is None:
+            return None
+        elapsed = (time.perf_counter_ns() - started) / 1e6
+        self.record("photon", elapsed)
+        self._input_started = None
+        return elapsed
+
+    def discard_input(self) -> None:
+        self._input_started = None
+
+    def snapshot(self) -> dict:
+        return {name: histogram.summary() for name, histogram in self.histograms.items()}
+
+    def export(self, handle, **extra) -> None:
+        record = {"time": time.time(), **extra, "stages": self.snapshot()}
+        handle.write(json.dumps(record, ensure_ascii=False) + "\n")
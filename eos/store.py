@@ -0,0 +1,219 @@
+"""기록 저장소 (SQLite, 백그라운드 쓰기 스레드)."""
+
+from __future__ import annotations
+
+import getpass
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import deque
+from pathlib import Path
+
+STORE_QUEUE_SIZE = 256
+STORE_BATCH_SIZE = 64
+STORE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id INTEGER PRIMARY KEY,
+    song TEXT NOT NULL,
+    title TEXT NOT NULL,
+    player TEXT NOT NULL,
+    finished_at REAL NOT NULL,
+    victory INTEGER NOT NULL,
+    chars INTEGER NOT NULL,
+    wrong INTEGER NOT NULL,
+    seconds REAL NOT NULL,
+    cpm REAL NOT NULL,
+    wpm REAL NOT NULL,
+    accuracy REAL NOT NULL,
+    score REAL NOT NULL,
+    missed TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sessions_song_score ON sessions (song, score DESC);
+CREATE INDEX IF NOT EXISTS sessions_player_song_score ON sessions (player, song, score DESC);
+"""
+STORE_COLUMNS = (
+    "song", "title", "player", "finished_at", "victory", "chars", "wrong",
+    "seconds", "cpm", "wpm", "accuracy", "score", "missed",
+)
+
+
+def default_store_path() -> Path:
+    base = os.environ.get("XDG_DATA_HOME") or os.path.join(os.path.expanduser("~"), ".local", "share")
+    return Path(base) / "eos" / "history.sqlite3"
+
+
+def default_player() -> str:
+    try:
+        return getpass.getuser()
+    except (KeyError, OSError):
+        return "player"
+
+
+def session_score(summary: dict, victory: bool) -> float:
+    """타수에 정확도를 곱한 점수. 끝까지 가지 못한 판은 절반만 칩니다."""
+    score = summary["cpm"] * summary["accuracy"] / 100.0
+    return round(score if victory else score / 2.0, 1)
+
+
+def session_record(song: str, title: str, player: str, summary: dict, victory: bool) -> tuple:
+    return (
+        song,
+        title,
+        player,
+        time.time(),
+        1 if victory else 0,
+        summary["chars"],
+        summary["wrong"],
+        summary["seconds"],
+        summary["cpm"],
+        summary["wpm"],
+        summary["accuracy"],
+        session_score(summary, victory),
+        json.dumps(summary.get("most_missed", []), ensure_ascii=False),
+    )
+
+
+class SessionStore:
+    """끝난 판을 SQLite에 쌓는 저장소. 디스크 작업은 모두 전용 스레드가 합니다.
+
+    게임 쪽은 ``submit``/``lookup_best``로 크기가 정해진 큐에 ``put_nowait``만
+    하므로 Tk 루프가 I/O를 기다리는 일은 없습니다. 큐가 차면 기록을 버리고
+    ``dropped``를 올립니다. 쓰기는 WAL 모드에서 여러 건을 한 트랜잭션으로
+    묶고, 조회 결과는 ``poll``을 부른 스레드(보통 Tk 스레드)에서 콜백으로
+    넘겨 줍니다.
+    """
+
+    def __init__(self, path=None, queue_size: int = STORE_QUEUE_SIZE, batch_size: int = STORE_BATCH_SIZE) -> None:
+        self.path = str(path or default_store_path())
+        self.batch_size = batch_size
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.error = None
+        self._queue = queue.Queue(queue_size)
+        self._results = deque()
+        self.pending_lookups = 0
+        self._thread = threading.Thread(target=self._run, name="eos-store", daemon=True)
+        self._thread.start()
+
+    def submit(self, record: tuple) -> bool:
+        try:
+            self._queue.put_nowait(("write", record, None))
+        except queue.Full:
+            self.dropped += 1
+            return False
+        return True
+
+    def lookup_best(self, song: str, player: str, callback) -> bool:
+        try:
+            self._queue.put_nowait(("best", (song, player), callback))
+        except queue.Full:
+            return False
+        self.pending_lookups += 1
+        return True
+
+    def poll(self) -> int:
+        """스레드가 끝낸 조회의 콜백을 지금 스레드에서 부릅니다."""
+        handled = 0
+        while self._results:
+            callback, result = self._results.popleft()
+            self.pending_lookups -= 1
+            callback(result)
+            handled += 1
+        return handled
+
+    def close(self, timeout: float = 5.0) -> None:
+        if not self._thread.is_alive():
+            return
+        # 프로그램을 끝낼 때만 큐가 빌 때까지 잠깐 기다립니다.
+        try:
+            self._queue.put(("stop", None, None), timeout=timeout)
+        except queue.Full:
+            pass
+        self._thread.join(timeout)
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(STORE_SCHEMA)
+        return connection
+
+    def _run(self) -> None:
+        try:
+            # 리눅스에서는 스레드별 nice 값을 줄 수 있습니다. 코어가 적을 때 Tk 스레드가 먼저 돕니다.
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+        except (AttributeError, OSError):
+            pass
+        try:
+            connection = self._connect()
+        except sqlite3.Error as exc:
+            self.error = exc
+            connection = None
+        insert = f"INSERT INTO sessions ({', '.join(STORE_COLUMNS)}) VALUES ({', '.join('?' for _ in STORE_COLUMNS)})"
+        running = True
+        while running:
+            items = [self._queue.get()]
+            while len(items) < self.batch_size:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            rows = [payload for kind, payload, _callback in items if kind == "write"]
+            if rows and connection is not None:
+                try:
+                    self._write_batch(connection, insert, rows)
+                except sqlite3.Error as exc:
+                    self.error = exc
+            for kind, payload, callback in items:
+                if kind == "best":
+                    result = None
+                    if connection is not None:
+                        try:
+                            result = personal_best(connection, *payload)
+                        except sqlite3.Error as exc:
+                            # 조회가 실패해도 콜백은 None으로 돌려주고 쓰기 스레드는 계속 돕니다.
+                            self.error = exc
+                    self._results.append((callback, result))
+                elif kind == "stop":
+                    running = False
+        if connection is not None:
+            connection.close()
+
+    def _write_batch(self, connection: sqlite3.Connection, insert: str, rows: list) -> None:
+        with connection:
+            connection.executemany(insert, rows)
+        self.written += len(rows)
+        self.batches += 1
+
+
+def _session_rows(cursor) -> list[dict]:
+    names = [column[0] for column in cursor.description]
+    return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+
+def personal_best(connection: sqlite3.Connection, song: str, player: str):
+    cursor = connection.execute(
+        "SELECT * FROM sessions WHERE player = ? AND song = ? ORDER BY score DESC LIMIT 1",
+        (player, song),
+    )
+    rows = _session_rows(cursor)
+    return rows[0] if rows else None
+
+
+def top_scores(connection: sqlite3.Connection, song=None, player=None, limit: int = 10) -> list[dict]:
+    clauses = []
+    params = []
+    if player is not None:
+        clauses.append("player = ?")
+        params.append(player)
+    if song is not None:
+        clauses.append("song = ?")
+        params.append(song)
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    cursor = connection.execute(f"SELECT * FROM sessions {where} ORDER BY score DESC LIMIT ?", (*params, limit))
+    return _session_rows(cursor)
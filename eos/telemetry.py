@@ -0,0 +1,262 @@
+"""플레이 텔레메트리 수집과 백그라운드 전송."""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import struct
+import threading
+import time
+import zlib
+
+TELEMETRY_RING_SIZE = 8192
+TELEMETRY_BATCH_SIZE = 1024
+TELEMETRY_ENCODE_CHUNK = 64
+TELEMETRY_FLUSH_INTERVAL = 0.25
+TELEMETRY_MAX_BACKOFF = 5.0
+TELEMETRY_KEY = "key"
+TELEMETRY_RESULT = "result"
+TELEMETRY_TIMING = "timing"
+TELEMETRY_FIELDS = {
+    TELEMETRY_KEY: ("char", "correct"),
+    TELEMETRY_RESULT: ("victory", "summary"),
+    TELEMETRY_TIMING: ("photon_ms",),
+}
+
+
+class TelemetryRing:
+    """생산자 하나(Tk 스레드)와 소비자 하나(내보내기 스레드)가 쓰는 고정 크기 고리 버퍼.
+
+    생산자는 칸 하나를 채우고 쓰기 번호를 올리는 것 말고는 아무것도 하지 않고
+    잠금도 잡지 않습니다. 가득 차면 가장 오래된 칸을 덮어쓰며, 소비자는 읽기
+    전후의 쓰기 번호를 비교해 그동안 덮어쓰인 칸을 ``dropped``로 셉니다.
+    """
+
+    def __init__(self, capacity: int = TELEMETRY_RING_SIZE) -> None:
+        self.capacity = capacity
+        self.dropped = 0
+        self._slots = [None] * capacity
+        self._written = 0
+        self._read = 0
+
+    def push(self, item) -> None:
+        written = self._written
+        self._slots[written % self.capacity] = item
+        self._written = written + 1
+
+    def pending(self) -> int:
+        return min(self._written - self._read, self.capacity)
+
+    def drain(self, limit: int) -> list:
+        capacity = self.capacity
+        written = self._written
+        start = max(self._read, written - capacity)
+        end = min(written, start + limit)
+        if end <= start:
+            return []
+        first, last = start % capacity, end % capacity
+        if first < last:
+            items = self._slots[first:last]
+        else:
+            items = self._slots[first:] + self._slots[:last]
+        # 복사하는 동안 생산자가 한 바퀴 돌아 덮어쓴 앞쪽 칸은 버립니다.
+        overwritten = self._written - capacity
+        lost = min(max(0, overwritten - start), end - start)
+        if lost:
+            items = items[lost:]
+        self.dropped += start - self._read + lost
+        self._read = end
+        return items
+
+
+def encode_telemetry_batch(items) -> bytes:
+    """이벤트 튜플 묶음을 JSON Lines로 바꿔 gzip 멤버 하나로 압축합니다.
+
+    멤버를 이어 붙인 파일은 그대로 ``gzip.open``으로 읽힙니다. 중간중간 GIL을
+    내줘 Tk 스레드가 기다리지 않게 합니다.
+    """
+    compressor = zlib.compressobj(1, zlib.DEFLATED, 31)
+    chunks = []
+    for offset in range(0, len(items), TELEMETRY_ENCODE_CHUNK):
+        lines = []
+        for kind, stamp, *values in items[offset:offset + TELEMETRY_ENCODE_CHUNK]:
+            record = {"type": kind, "time": stamp}
+            record.update(zip(TELEMETRY_FIELDS[kind], values))
+            lines.append(json.dumps(record, ensure_ascii=False))
+        chunks.append(compressor.compress(("\n".join(lines) + "\n").encode("utf-8")))
+        time.sleep(0)
+    chunks.append(compressor.flush())
+    return b"".join(chunks)
+
+
+class FileTelemetrySink:
+    """묶음마다 gzip 멤버를 파일 끝에 덧붙입니다."""
+
+    def __init__(self, path) -> None:
+        self.path = str(path)
+        self._handle = open(self.path, "ab")
+
+    def send(self, payload: bytes) -> None:
+        self._handle.write(payload)
+        self._handle.flush()
+
+    def close(self) -> None:
+        self._handle.close()
+
+
+class SocketTelemetrySink:
+    """유닉스 소켓 수집기로 ``<길이 4바이트><gzip 묶음>`` 프레임을 보냅니다. 끊기면 다음 묶음에서 다시 붙습니다."""
+
+    def __init__(self, path: str, timeout: float = 2.0) -> None:
+        self.path = path
+        self.timeout = timeout
+        self._sock = None
+
+    def send(self, payload: bytes) -> None:
+        if self._sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.path)
+            except OSError:
+                sock.close()
+                raise
+            self._sock = sock
+        try:
+            self._sock.sendall(struct.pack("<I", len(payload)) + payload)
+        except OSError:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+
+class HttpTelemetrySink:
+    """로컬 HTTP 수집기에 묶음마다 gzip 본문으로 POST합니다."""
+
+    def __init__(self, url: str, timeout: float = 2.0) -> None:
+        from urllib.parse import urlsplit
+
+        parts = urlsplit(url)
+        self.host = parts.hostname or "127.0.0.1"
+        self.port = parts.port or 80
+        self.path = parts.path or "/"
+        self.timeout = timeout
+        self._connection = None
+
+    def send(self, payload: bytes) -> None:
+        import http.client
+
+        if self._connection is None:
+            self._connection = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        headers = {"Content-Type": "application/x-ndjson", "Content-Encoding": "gzip"}
+        try:
+            self._connection.request("POST", self.path, body=payload, headers=headers)
+            response = self._connection.getresponse()
+            response.read()
+        except (OSError, http.client.HTTPException) as exc:
+            self.close()
+            raise OSError(f"수집기 연결 실패: {exc}") from exc
+        if response.status >= 300:
+            raise OSError(f"수집기 응답 {response.status}")
+
+    def close(self) -> None:
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+
+def open_telemetry_sink(target: str):
+    """``http://…``는 HTTP, ``unix:경로``는 유닉스 소켓, 나머지는 파일 경로로 봅니다."""
+    if target.startswith(("http://", "https://")):
+        return HttpTelemetrySink(target)
+    if target.startswith("unix:"):
+        return SocketTelemetrySink(target[len("unix:"):])
+    return FileTelemetrySink(target)
+
+
+class TelemetryExporter:
+    """게임 이벤트를 로컬 수집기(파일, 유닉스 소켓, HTTP)로 내보냅니다.
+
+    Tk 스레드는 ``emit``으로 고리 버퍼에 튜플을 넣기만 하고, 직렬화·압축·I/O는
+    모두 전용 스레드가 ``flush_interval``마다 묶어서 합니다. 수집기가 느리면
+    버퍼가 넘쳐 가장 오래된 이벤트부터 버려지고, 보내기에 실패하면 간격을
+    늘려 가며 다시 시도합니다. 잃어버린 이벤트는 ``dropped``에 모두 셉니다.
+    """
+
+    def __init__(
+        self,
+        sink,
+        capacity: int = TELEMETRY_RING_SIZE,
+        batch_size: int = TELEMETRY_BATCH_SIZE,
+        flush_interval: float = TELEMETRY_FLUSH_INTERVAL,
+    ) -> None:
+        self.sink = sink
+        self.ring = TelemetryRing(capacity)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.sent = 0
+        self.batches = 0
+        self.bytes_sent = 0
+        self.failed = 0
+        self.error = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="eos-telemetry", daemon=True)
+        self._thread.start()
+
+    @property
+    def dropped(self) -> int:
+        return self.ring.dropped + self.failed
+
+    def emit(self, kind: str, *values) -> None:
+        self.ring.push((kind, time.time(), *values))
+
+    def close(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        self._thread.join(timeout)
+        self.sink.close()
+
+    def _run(self) -> None:
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 10)
+        except (AttributeError, OSError):
+            pass
+        delay = self.flush_interval
+        while True:
+            stopping = self._stop.wait(delay)
+            while True:
+                items = self.ring.drain(self.batch_size)
+                if not items:
+                    break
+                payload = encode_telemetry_batch(items)
+                try:
+                    self.sink.send(payload)
+                except OSError as exc:
+                    # 수집기가 죽어 있으면 점점 드물게 두드리고, 그동안 쌓인 이벤트는 고리에서 밀려납니다.
+                    self.error = exc
+                    self.failed += len(items)
+                    delay = min(delay * 2, TELEMETRY_MAX_BACKOFF)
+                    break
+                delay = self.flush_interval
+                self.sent += len(items)
+                self.batches += 1
+                self.bytes_sent += len(payload)
+                if len(items) < self.batch_size:
+                    break
+            if stopping:
+                return
+
+
+def decode_telemetry(payload: bytes) -> list[dict]:
+    """gzip 멤버(여러 개를 이어 붙인 것 포함)를 이벤트 딕셔너리 목록으로 풉니다."""
+    events = []
+    while payload:
+        decompressor = zlib.decompressobj(31)
+        data = decompressor.decompress(payload) + decompressor.flush()
+        events.extend(json.loads(line) for line in data.splitlines() if line)
+        payload = decompressor.unused_data
+    return events
@@ -0,0 +1,421 @@
+"""가사 줄 목록과 한글 자모 처리.
+
+메모리에 올린 줄 목록(LineTextSource)과 mmap으로 읽는 줄 목록(MappedTextSource),
+조합 중인 글자를 판정하는 HangulMatcher, 화면 폭 계산을 담습니다.
+"""
+
+from __future__ import annotations
+
+import bisect
+import hashlib
+import mmap
+import os
+import unicodedata
+from array import array
+from collections import OrderedDict
+
+LYRICS_LINES = [
+    "동해 물과 백두산이 마르고 닳도록",
+    "하느님이 보우하사 우리나라 만세",
+    "무궁화 삼천리 화려 강산",
+    "대한 사람 대한으로 길이 보전하세",
+]
+
+
+def _normalize_line(text: str) -> str:
+    text = text.rstrip("\r")
+    if not unicodedata.is_normalized("NFC", text):
+        text = unicodedata.normalize("NFC", text)
+    return text
+
+
+class LineTextSource:
+    """메모리에 있는 줄 목록을 그대로 쓰는 텍스트 소스.
+
+    빈 줄은 입력할 글자가 없으므로 건너뜁니다.
+    """
+
+    _digest = None
+
+    def __init__(self, lines) -> None:
+        self._lines = [line for line in lines if line]
+        self._char_offsets = array("Q")
+        total = 0
+        for line in self._lines:
+            self._char_offsets.append(total)
+            total += len(line)
+        self.total_chars = total
+
+    @property
+    def line_count(self) -> int:
+        return len(self._lines)
+
+    def line(self, idx: int) -> str:
+        return self._lines[idx]
+
+    def line_start(self, idx: int) -> int:
+        return self._char_offsets[idx]
+
+    def position(self, index: int) -> tuple[int, int]:
+        line_idx = bisect.bisect_right(self._char_offsets, index) - 1
+        return line_idx, index - self._char_offsets[line_idx]
+
+    def char_at(self, index: int) -> str:
+        line_idx, col = self.position(index)
+        return self.line(line_idx)[col]
+
+    def content_digest(self) -> str:
+        """정규화된 줄들을 줄바꿈으로 이은 UTF-8 내용의 SHA-256.
+
+        기록 저장소의 곡 키로 판을 시작하고 끝낼 때마다 쓰이므로 처음 한 번만
+        계산해 둡니다.
+        """
+        if self._digest is None:
+            digest = hashlib.sha256()
+            for idx in range(self.line_count):
+                if idx:
+                    digest.update(b"\n")
+                digest.update(self.line(idx).encode("utf-8"))
+            self._digest = digest.hexdigest()
+        return self._digest
+
+    def close(self) -> None:
+        pass
+
+
+class MappedTextSource(LineTextSource):
+    """UTF-8 파일을 메모리 매핑해 필요한 줄만 풀어 쓰는 텍스트 소스.
+
+    한 번 훑으면서 줄마다 바이트 범위와 글자 시작 위치만 배열에 적어 두고,
+    실제 문자열은 ``window_lines``개 단위로 필요할 때 디코딩해 몇 묶음만
+    캐시합니다. 말뭉치가 커져도 줄당 24바이트 색인 외에는 메모리가 늘지 않습니다.
+    """
+
+    SCAN_BLOCK_BYTES = 1 << 22
+
+    def __init__(self, path: str, window_lines: int = 256, cached_windows: int = 3) -> None:
+        self.path = path
+        self.window_lines = window_lines
+        self.cached_windows = cached_windows
+        self._file = open(path, "rb")
+        size = os.fstat(self._file.fileno()).st_size
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        self._byte_starts = array("Q")
+        self._byte_ends = array("Q")
+        self._char_offsets = array("Q")
+        self._windows = OrderedDict()
+        self.total_chars = self._scan(size)
+
+    def _scan(self, size: int) -> int:
+        """파일을 ``SCAN_BLOCK_BYTES`` 단위로 훑어 줄 색인과 내용 해시를 만듭니다.
+
+        묶음이 이미 NFC이고 줄 끝 말고는 ``\\r``이 없으면(거의 늘 그렇습니다)
+        줄마다 디코딩하지 않고, UTF-8 연속 바이트가 아닌 바이트 수로 줄별 글자
+        수를 셉니다. 그 밖의 묶음만 줄마다 정규화합니다.
+        """
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        data = self._map
+        digest = hashlib.sha256()
+        total = 0
+        pos = 0
+        while pos < size:
+            end = size
+            if pos + self.SCAN_BLOCK_BYTES < size:
+                end = data.rfind(b"\n", pos, pos + self.SCAN_BLOCK_BYTES)
+                if end < 0:
+                    end = data.find(b"\n", pos + self.SCAN_BLOCK_BYTES)
+                    if end < 0:
+                        end = size
+            raw = data[pos:end]
+            block = raw.decode("utf-8")
+            hashed = total > 0
+            if (
+                np is not None
+                and (b"\r" not in raw or raw.count(b"\r") == raw.count(b"\r\n"))
+                and unicodedata.is_normalized("NFC", block)
+            ):
+                total = self._index_block(np, raw, pos, total)
+                if b"\r" in raw or b"\n\n" in raw or raw.startswith(b"\n") or raw.endswith(b"\n"):
+                    raw = b"\n".join(line for line in raw.replace(b"\r\n", b"\n").split(b"\n") if line)
+            else:
+                kept = []
+                for raw_line, text in zip(raw.split(b"\n"), block.split("\n")):
+                    text = _normalize_line(text)
+                    if text:
+                        line_end = pos + len(raw_line)
+                        if raw_line.endswith(b"\r"):
+                            line_end -= 1
+                        self._byte_starts.append(pos)
+                        self._byte_ends.append(line_end)
+                        self._char_offsets.append(total)
+                        total += len(text)
+                        kept.append(text)
+                    pos += len(raw_line) + 1
+                raw = "\n".join(kept).encode("utf-8")
+            if raw:
+                if hashed:
+                    digest.update(b"\n")
+                digest.update(raw)
+            pos = end + 1
+        self._digest = digest.hexdigest()
+        return total
+
+    def _index_block(self, np, raw: bytes, pos: int, total: int) -> int:
+        if not raw:
+            return total
+        codes = np.frombuffer(raw, dtype=np.uint8)
+        breaks = np.flatnonzero(codes == 0x0A)
+        starts = np.concatenate(([0], breaks + 1))
+        ends = np.concatenate((breaks, [len(codes)]))
+        # 줄마다 연속 바이트(10xxxxxx)가 아닌 바이트 수 = 글자 수 (+ 줄바꿈·\r)
+        lead = (codes < 0x80) | (codes >= 0xC0)
+        counts = np.zeros(len(starts), dtype=np.int64)
+        inside = starts < len(codes)
+        counts[inside] = np.add.reduceat(lead.view(np.uint8), starts[inside], dtype=np.int32)
+        counts[:len(breaks)] -= 1
+        carriage = (ends > starts) & (codes[np.maximum(ends - 1, 0)] == 0x0D)
+        ends -= carriage
+        counts -= carriage
+        keep = counts > 0
+        counts = counts[keep]
+        offsets = np.cumsum(counts) - counts + total
+        self._byte_starts.frombytes((starts[keep] + pos).astype(np.uint64).tobytes())
+        self._byte_ends.frombytes((ends[keep] + pos).astype(np.uint64).tobytes())
+        self._char_offsets.frombytes(offsets.astype(np.uint64).tobytes())
+        return total + int(counts.sum())
+
+    @property
+    def line_count(self) -> int:
+        return len(self._char_offsets)
+
+    def line(self, idx: int) -> str:
+        if idx < 0 or idx >= len(self._char_offsets):
+            raise IndexError(idx)
+        window_idx = idx // self.window_lines
+        window = self._windows.get(window_idx)
+        if window is None:
+            window = self._decode_window(window_idx)
+        else:
+            self._windows.move_to_end(window_idx)
+        return window[idx - window_idx * self.window_lines]
+
+    def char_at(self, index: int) -> str:
+        line_idx, col = self.position(index)
+        window = self._windows.get(line_idx // self.window_lines)
+        if window is not None:
+            return window[line_idx % self.window_lines][col]
+        return self._decode_line(line_idx)[col]
+
+    def _decode_line(self, idx: int) -> str:
+        return _normalize_line(self._map[self._byte_starts[idx]:self._byte_ends[idx]].decode("utf-8"))
+
+    def _decode_window(self, window_idx: int) -> list:
+        first = window_idx * self.window_lines
+        last = min(first + self.window_lines, len(self._char_offsets))
+        window = [self._decode_line(i) for i in range(first, last)]
+        self._windows[window_idx] = window
+        while len(self._windows) > self.cached_windows:
+            self._windows.popitem(last=False)
+        return window
+
+    def index_nbytes(self) -> int:
+        return sum(arr.itemsize * len(arr) for arr in (self._byte_starts, self._byte_ends, self._char_offsets))
+
+    def close(self) -> None:
+        self._windows.clear()
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+
+HANGUL_BASE = 0xAC00
+HANGUL_COUNT = 11172
+COMPAT_JAMO_BASE = 0x3131
+
+CHOSEONG = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+JUNGSEONG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+JONGSEONG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+COMPOUND_VOWELS = ("ㅘㅗㅏ", "ㅙㅗㅐ", "ㅚㅗㅣ", "ㅝㅜㅓ", "ㅞㅜㅔ", "ㅟㅜㅣ", "ㅢㅡㅣ")
+FINAL_CLUSTERS = ("ㄳㄱㅅ", "ㄵㄴㅈ", "ㄶㄴㅎ", "ㄺㄹㄱ", "ㄻㄹㅁ", "ㄼㄹㅂ", "ㄽㄹㅅ", "ㄾㄹㅌ", "ㄿㄹㅍ", "ㅀㄹㅎ", "ㅄㅂㅅ")
+
+MATCH_WRONG = 0
+MATCH_PARTIAL = 1
+MATCH_COMPLETE = 2
+
+
+def _build_hangul_tables() -> tuple:
+    initial = bytearray(HANGUL_COUNT)
+    medial = bytearray(HANGUL_COUNT)
+    final = bytearray(HANGUL_COUNT)
+    for offset in range(HANGUL_COUNT):
+        initial[offset] = offset // 588
+        medial[offset] = (offset % 588) // 28
+        final[offset] = offset % 28
+
+    # 호환 자모(ㄱ~ㅣ) → 초성/종성/중성 번호, 해당 없으면 0xFF
+    compat_initial = bytearray(b"\xff" * 51)
+    compat_final = bytearray(b"\xff" * 51)
+    compat_medial = bytearray(b"\xff" * 51)
+    for idx, jamo in enumerate(CHOSEONG):
+        compat_initial[ord(jamo) - COMPAT_JAMO_BASE] = idx
+    for idx, jamo in enumerate(JONGSEONG[1:], start=1):
+        compat_final[ord(jamo) - COMPAT_JAMO_BASE] = idx
+    for idx, jamo in enumerate(JUNGSEONG):
+        compat_medial[ord(jamo) - COMPAT_JAMO_BASE] = idx
+
+    vowel_first = bytearray(range(len(JUNGSEONG)))
+    for compound, first, _second in COMPOUND_VOWELS:
+        vowel_first[JUNGSEONG.index(compound)] = JUNGSEONG.index(first)
+
+    final_first = bytearray(range(len(JONGSEONG)))
+    # (앞 종성, 다음 초성) → 겹받침, 없으면 0
+    cluster = bytearray(len(JONGSEONG) * len(CHOSEONG))
+    for compound, first, second in FINAL_CLUSTERS:
+        first_idx = JONGSEONG.index(first)
+        final_first[JONGSEONG.index(compound)] = first_idx
+        cluster[first_idx * len(CHOSEONG) + CHOSEONG.index(second)] = JONGSEONG.index(compound)
+
+    # 받침으로 붙었다가 다음 글자 초성으로 넘어갈 수 있는 홑받침 → 초성 번호
+    final_as_initial = bytearray(b"\xff" * len(JONGSEONG))
+    for idx, jamo in enumerate(JONGSEONG):
+        if jamo in CHOSEONG:
+            final_as_initial[idx] = CHOSEONG.index(jamo)
+
+    return (
+        bytes(initial),
+        bytes(medial),
+        bytes(final),
+        bytes(compat_initial),
+        bytes(compat_medial),
+        bytes(compat_final),
+        bytes(vowel_first),
+        bytes(final_first),
+        bytes(cluster),
+        bytes(final_as_initial),
+    )
+
+
+class HangulMatcher:
+    """IME 조합 중인 글자가 기대한 음절로 가는 중인지 자모 단위로 판정합니다.
+
+    음절 분해와 겹모음·겹받침 관계는 모두 미리 만든 표로 찾으므로 IME
+    갱신 한 번마다 상수 시간에 끝납니다. 받침이 다음 음절의 초성으로 넘어가는
+    경우(하 + ㄴ → 한 → 하나)도 다음 기대 글자를 보고 허용합니다.
+    """
+
+    (
+        INITIAL,
+        MEDIAL,
+        FINAL,
+        COMPAT_INITIAL,
+        COMPAT_MEDIAL,
+        COMPAT_FINAL,
+        VOWEL_FIRST,
+        FINAL_FIRST,
+        CLUSTER,
+        FINAL_AS_INITIAL,
+    ) = _build_hangul_tables()
+
+    @staticmethod
+    def decompose(ch: str):
+        offset = ord(ch) - HANGUL_BASE
+        if 0 <= offset < HANGUL_COUNT:
+            table = HangulMatcher
+            return table.INITIAL[offset], table.MEDIAL[offset], table.FINAL[offset]
+        return None
+
+    def classify(self, ch: str, expected, following=None) -> int:
+        if ch == expected:
+            return MATCH_COMPLETE
+        if expected is None:
+            return MATCH_WRONG
+
+        target = ord(expected) - HANGUL_BASE
+        if not 0 <= target < HANGUL_COUNT:
+            return MATCH_WRONG
+
+        code = ord(ch)
+        offset = code - HANGUL_BASE
+        if not 0 <= offset < HANGUL_COUNT:
+            compat = code - COMPAT_JAMO_BASE
+            if 0 <= compat < 51 and self.COMPAT_INITIAL[compat] == self.INITIAL[target]:
+                return MATCH_PARTIAL
+            return MATCH_WRONG
+
+        if self.INITIAL[offset] != self.INITIAL[target]:
+            return MATCH_WRONG
+
+        medial = self.MEDIAL[offset]
+        final = self.FINAL[offset]
+        target_medial = self.MEDIAL[target]
+        if medial != target_medial:
+            if final == 0 and self.VOWEL_FIRST[target_medial] == medial:
+                return MATCH_PARTIAL
+            return MATCH_WRONG
+
+        target_final = self.FINAL[target]
+        if final == 0 or self.FINAL_FIRST[target_final] == final != target_final:
+            return MATCH_PARTIAL
+
+        if following is not None:
+            follow = ord(following) - HANGUL_BASE
+            if 0 <= follow < HANGUL_COUNT:
+                follow_initial = self.INITIAL[follow]
+                if target_final == 0:
+                    if self.FINAL_AS_INITIAL[final] == follow_initial:
+                        return MATCH_PARTIAL
+                elif self.CLUSTER[target_final * len(CHOSEONG) + follow_initial] == final:
+                    return MATCH_PARTIAL
+        return MATCH_WRONG
+
+
+LINE_DISPLAY_COLUMNS = 34
+
+
+_TEXT_TABLES = None
+
+
+def _text_tables() -> tuple:
+    """표시 폭·타수 계산용 표. 글자마다 파이썬 루프를 돌지 않도록
+    ``str.translate``로 쓰는 표를 처음 쓸 때 한 번 만듭니다."""
+    global _TEXT_TABLES
+    if _TEXT_TABLES is None:
+        wide = {
+            code: None
+            for code in range(0x1100, 0x10000)
+            if unicodedata.east_asian_width(chr(code)) in ("W", "F")
+        }
+        strokes = {code: ("a" if chr(code).isalnum() else "s") for code in range(0x21, 0x7F)}
+        strokes[0x20] = None
+        for offset in range(HANGUL_COUNT):
+            medial, final = HangulMatcher.MEDIAL[offset], HangulMatcher.FINAL[offset]
+            count = 2 + (final > 0) + (HangulMatcher.VOWEL_FIRST[medial] != medial) + (HangulMatcher.FINAL_FIRST[final] != final)
+            strokes[HANGUL_BASE + offset] = str(count)
+        _TEXT_TABLES = (wide, strokes)
+    return _TEXT_TABLES
+
+
+def display_width(text: str) -> int:
+    if text.isascii():
+        return len(text)
+    # 전각 글자를 지운 길이로 전각 글자 수를 셉니다 (BMP 밖은 반각으로 취급).
+    return 2 * len(text) - len(text.translate(_text_tables()[0]))
+
+
+def _composition_states(syllable: str) -> list[str]:
+    initial, medial, final = HangulMatcher.decompose(syllable)
+    base = HANGUL_BASE + initial * 588
+    states = [CHOSEONG[initial]]
+    first_medial = HangulMatcher.VOWEL_FIRST[medial]
+    if first_medial != medial:
+        states.append(chr(base + first_medial * 28))
+    states.append(chr(base + medial * 28))
+    first_final = HangulMatcher.FINAL_FIRST[final]
+    if final and first_final != final:
+        states.append(chr(base + medial * 28 + first_final))
+    if final:
+        states.append(syllable)
+    return states
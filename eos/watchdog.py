@@ -0,0 +1,108 @@
+"""이벤트 루프 멈춤 감시기."""
+
+from __future__ import annotations
+
+import os
+import sys
+import threading
+import time
+
+WATCHDOG_THRESHOLD_MS = 100
+WATCHDOG_HEARTBEAT_MS = 50
+WATCHDOG_SAMPLE_MS = 10
+WATCHDOG_MAX_DEPTH = 32
+
+
+class StallWatchdog:
+    """Tk 이벤트 루프가 멈춘 동안 메인 스레드 스택을 표본 추출하는 감시자.
+
+    ``after`` 심장 박동이 타임스탬프를 갱신하고, 백그라운드 스레드가 박동이
+    ``threshold_ms`` 넘게 늦으면 ``sys._current_frames``로 메인 스레드 스택을
+    찍어 접힌 스택(``a;b;c``)별 표본 수로 모읍니다. 세션 타이머와 달리
+    재시작 때 걷히지 않도록 ``TimerRegistry``를 거치지 않습니다.
+    """
+
+    def __init__(
+        self,
+        root,
+        threshold_ms: float = WATCHDOG_THRESHOLD_MS,
+        heartbeat_ms: int = WATCHDOG_HEARTBEAT_MS,
+        sample_ms: float = WATCHDOG_SAMPLE_MS,
+    ) -> None:
+        self.root = root
+        self.threshold = threshold_ms / 1000.0
+        self.heartbeat_ms = heartbeat_ms
+        self.sample_interval = sample_ms / 1000.0
+        self.stacks = {}
+        self.samples = 0
+        self.stalls = 0
+        self.longest_ms = 0.0
+        self._thread_id = threading.get_ident()
+        self._beat = time.monotonic()
+        self._job = None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="eos-watchdog", daemon=True)
+
+    def start(self) -> "StallWatchdog":
+        self._heartbeat()
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        if self._job is not None:
+            self.root.after_cancel(self._job)
+            self._job = None
+
+    def _heartbeat(self) -> None:
+        self._beat = time.monotonic()
+        self._job = self.root.after(self.heartbeat_ms, self._heartbeat)
+
+    def _run(self) -> None:
+        expected = self.heartbeat_ms / 1000.0
+        stalled = False
+        while not self._stop.wait(self.sample_interval):
+            lag = time.monotonic() - self._beat - expected
+            if lag < self.threshold:
+                stalled = False
+                continue
+            if not stalled:
+                stalled = True
+                self.stalls += 1
+            self.longest_ms = max(self.longest_ms, (lag + expected) * 1000.0)
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                stack = self._fold(frame)
+                self.stacks[stack] = self.stacks.get(stack, 0) + 1
+                self.samples += 1
+
+    @staticmethod
+    def _fold(frame) -> str:
+        names = []
+        while frame is not None and len(names) < WATCHDOG_MAX_DEPTH:
+            code = frame.f_code
+            names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+            frame = frame.f_back
+        return ";".join(reversed(names))
+
+    def top_functions(self, count: int = 10) -> list[tuple[str, int]]:
+        """멈춘 동안 스택 맨 위에 있던 함수별 표본 수."""
+        leaves = {}
+        for stack, samples in self.stacks.items():
+            leaf = stack.rsplit(";", 1)[-1].split(" (", 1)[0]
+            leaves[leaf] = leaves.get(leaf, 0) + samples
+        return sorted(leaves.items(), key=lambda item: -item[1])[:count]
+
+    def dump(self, path) -> None:
+        """flamegraph.pl 등이 읽는 접힌 스택 형식으로 저장합니다."""
+        with open(path, "w", encoding="utf-8") as handle:
+            for stack, samples in sorted(self.stacks.items(), key=lambda item: -item[1]):
+                handle.write(f"{stack} {samples}\n")
+
+    def summary(self) -> str:
+        if not self.stalls:
+            return "이벤트 루프 멈춤 없음"
+        leaves = ", ".join(f"{name} {samples}" for name, samples in self.top_functions(5))
+        return f"이벤트 루프 멈춤 {self.stalls}회, 최장 {self.longest_ms:.0f} ms, 표본 {self.samples}개 ({leaves})"
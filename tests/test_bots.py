@@ -0,0 +1,20 @@
+import pytest
+
+from eos.bots import BOT_SCENARIOS, run_typist_direct
+from eos.packs import open_text_source
+
+
+@pytest.mark.parametrize("name", sorted(BOT_SCENARIOS))
+def test_each_profile_beats_the_default_text(name):
+    source = open_text_source(None)
+    try:
+        total_chars = source.total_chars
+        first = run_typist_direct(BOT_SCENARIOS[name], source, seed=7)
+        again = run_typist_direct(BOT_SCENARIOS[name], source, seed=7)
+    finally:
+        source.close()
+
+    assert first["victory"]
+    assert first["chars"] == total_chars
+    assert (again["events"], again["chars"]) == (first["events"], first["chars"])
+    assert again["typed_seconds"] == first["typed_seconds"]
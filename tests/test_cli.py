@@ -0,0 +1,31 @@
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from eos.cli import _build_arg_parser
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_import_skips_heavy_modules():
+    # 이 프로세스는 다른 테스트가 이미 numpy 등을 가져왔을 수 있어 새 인터프리터에서 확인합니다.
+    probe = "import sys, eos.cli; print(' '.join(sorted({'numpy', 'asyncio', 'tkinter'} & set(sys.modules))))"
+    result = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True)
+
+    assert result.stdout.strip() == ""
+
+
+def test_lazy_choices_are_checked_when_used(capsys):
+    parser = _build_arg_parser()
+
+    assert parser.parse_args(["--burst", "merge"]).burst == "merge"
+    assert parser.parse_args(["bots", "--scenario", "steady"]).scenario == ["steady"]
+    assert parser.parse_args(["serve"]).port is None
+    with pytest.raises(SystemExit):
+        parser.parse_args(["--burst", "sometimes"])
+    assert "'each', 'merge', 'instant'" in capsys.readouterr().err
+    with pytest.raises(SystemExit):
+        parser.parse_args(["--max-missiles", "0"])
+    assert "1 이상이어야 합니다" in capsys.readouterr().err
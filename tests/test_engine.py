@@ -0,0 +1,54 @@
+from eos.engine import EVENT_CORRECT, EVENT_FINISH, EVENT_LINE_CHANGE, EVENT_WRONG, TypingEngine
+from eos.replay import REPLAY_INPUT, REPLAY_RESTART, engine_state, replay_headless
+from eos.text import LYRICS_LINES
+
+
+def record(engine):
+    events = []
+    engine.subscribe(lambda event, *args: events.append((event, *args)))
+    return events
+
+
+def test_full_lyrics_defeat_the_boss():
+    engine = TypingEngine()
+    events = record(engine)
+    for line in LYRICS_LINES:
+        for ch in line:
+            engine.process_char(ch)
+
+    assert engine.victory and engine.game_over
+    assert engine.boss_hp == 0.0
+    assert events[-1] == (EVENT_FINISH, True)
+    assert sum(1 for event in events if event[0] == EVENT_LINE_CHANGE) == len(LYRICS_LINES) - 1
+
+
+def test_wrong_key_does_not_advance():
+    engine = TypingEngine(["가나"])
+    events = record(engine)
+    engine.process_char("다")
+
+    assert events == [(EVENT_WRONG, "다", "가")]
+    assert engine.current_index == 0 and engine.boss_hp == 100.0
+
+
+def test_feed_text_keeps_composing_syllable():
+    engine = TypingEngine(["한글"])
+    events = record(engine)
+
+    assert [engine.feed_text(text) for text in ("ㅎ", "하")] == ["ㅎ", "하"]
+    assert events == []
+    assert engine.feed_text("한") == ""
+    assert [engine.feed_text(text) for text in ("ㄱ", "그", "글")] == ["ㄱ", "그", ""]
+    assert events == [(EVENT_CORRECT, 1, 0), (EVENT_CORRECT, 2, 0), (EVENT_FINISH, True)]
+
+
+def test_replay_is_deterministic():
+    text = "동해 물과 백두산이"
+    events = [(0.05, REPLAY_INPUT, ch) for ch in text]
+    events += [(0.1, REPLAY_RESTART, "")] + events
+    first, first_trace = replay_headless({}, events, source=LYRICS_LINES)
+    second, second_trace = replay_headless({}, events, source=LYRICS_LINES)
+
+    assert engine_state(first) == engine_state(second)
+    assert first.current_index == len(text)
+    assert first_trace.hexdigest() == second_trace.hexdigest()
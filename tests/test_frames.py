@@ -0,0 +1,142 @@
+import pytest
+
+from eos.benches import FRAME_BUDGETS, TK_PATH_CALLS, TclCallCounter, _PASTE_KEYS, check_frame_budgets
+from eos.render import EntityGroup, FrameClock, LineRenderer, LyricsViewport, MissilePool
+from eos.text import LYRICS_LINES, LineTextSource
+
+tkinter = pytest.importorskip("tkinter")
+
+
+class FakeInterp:
+    """Tcl 명령을 받기만 하는 인터프리터. 위젯 메서드는 진짜 tkinter 것을 씁니다."""
+
+    def call(self, *args):
+        return "1"
+
+    def createcommand(self, name, function):
+        pass
+
+    def deletecommand(self, name):
+        pass
+
+    def splitlist(self, value):
+        return tuple(str(value).split())
+
+    def getdouble(self, value):
+        return float(value)
+
+    def getint(self, value):
+        return int(value)
+
+
+def widget(cls, counter, path):
+    item = cls.__new__(cls)
+    item.tk = counter
+    item._w = path
+    item._tclCommands = None
+    return item
+
+
+def calls(counter, action, *args, **options) -> int:
+    before = counter.count
+    action(*args, **options)
+    return counter.count - before
+
+
+@pytest.fixture
+def counter():
+    return TclCallCounter(FakeInterp())
+
+
+def test_counter_splits_calls_by_phase(counter):
+    def key():
+        counter.call(".canvas", "coords", "1")
+        frame()
+
+    def frame():
+        counter.call("after", "16", "tick")
+
+    counter.measure("input", key)()
+    counter.measure("frame", frame)()
+    counter.call("update")
+
+    assert counter.count == 4
+    assert counter.phases == {"input": 2, "frame": 1, "other": 1}
+    assert counter.calls == {"coords": 1, "after": 2, "update": 1}
+    assert counter.phase == "other"
+
+
+def test_line_paths_match_budget_costs(counter):
+    line = LYRICS_LINES[0]
+    renderer = LineRenderer(widget(tkinter.Text, counter, ".line"))
+
+    assert calls(counter, renderer.render, line, 0) == TK_PATH_CALLS["line_rebuild"]
+    assert calls(counter, renderer.render, line, 1) == TK_PATH_CALLS["line_advance"]
+    renderer.render(line, len(line) - 1)
+    assert calls(counter, renderer.render, line, len(line)) == TK_PATH_CALLS["line_last"]
+    assert calls(counter, renderer.show_transition, line) == TK_PATH_CALLS["line_transition"]
+
+    viewport = LyricsViewport(widget(tkinter.Text, counter, ".view"))
+    source = LineTextSource(LYRICS_LINES)
+    viewport.render(source, 0, 0)
+    assert calls(counter, viewport.render, source, 0, 1) == TK_PATH_CALLS["viewport_advance"]
+    assert calls(counter, viewport.render, source, 1, 0) == TK_PATH_CALLS["viewport_scroll"]
+
+
+def test_paste_path_matches_budget_costs(counter):
+    line = LYRICS_LINES[0]
+    pasted = line[:_PASTE_KEYS]
+    renderer = LineRenderer(widget(tkinter.Text, counter, ".line"))
+    renderer.render(line, 0)
+
+    # 한 번에 옮기는 비용에 글자마다 아래 줄 교체(delete, insert) 2를 더합니다. 공백은 바뀌지 않습니다.
+    replaced = sum(1 for ch in pasted if ch != " ")
+    render_calls = calls(counter, renderer.render, line, _PASTE_KEYS)
+    assert render_calls == TK_PATH_CALLS["line_bulk"] + 2 * replaced
+
+    canvas = widget(tkinter.Canvas, counter, ".canvas")
+    pool = MissilePool(canvas, FrameClock(canvas.after, canvas.after_cancel, now=lambda: 0.0), lambda hits: None)
+    launch_calls = calls(counter, lambda: [pool.launch(4, [0.0, 1.0], [0.0, 0.0], 10) for _ in pasted])
+    # 첫 발사만 쉬던 시계를 깨웁니다 (대기 중인 타이머가 없으면 after 하나).
+    assert launch_calls == _PASTE_KEYS * TK_PATH_CALLS["missile_launch"] + 1
+    assert (render_calls + launch_calls) / _PASTE_KEYS <= FRAME_BUDGETS["paste"]["calls_per_key"]
+
+
+def test_missile_and_clock_paths_match_budget_costs(counter):
+    now = [0.0]
+    canvas = widget(tkinter.Canvas, counter, ".canvas")
+    clock = FrameClock(canvas.after, canvas.after_cancel, now=lambda: now[0])
+    pool = MissilePool(canvas, clock, lambda hits: None)
+    clock.call_later(500, lambda: None)
+
+    launch = calls(counter, pool.launch, 4, [0.0, 1.0, 2.0], [0.0, 0.0, 0.0], 10)
+    assert launch == TK_PATH_CALLS["missile_launch"] + TK_PATH_CALLS["clock_wake"]
+    pool.launch(4, [0.0, 1.0, 2.0], [0.0, 0.0, 0.0], 10)
+
+    now[0] = 10.0
+    assert calls(counter, clock._tick) == TK_PATH_CALLS["frame"] + 2 * TK_PATH_CALLS["missile_flight"]
+    now[0] = 40.0
+    assert calls(counter, clock._tick) == TK_PATH_CALLS["frame"] + 2 * TK_PATH_CALLS["missile_hit"]
+
+    for _ in range(3):
+        pool.launch(4, [0.0, 1.0, 2.0], [0.0, 0.0, 0.0], 10)
+    assert calls(counter, pool.clear) == 3 * TK_PATH_CALLS["missile_hit"]
+
+
+def test_entity_paths_match_budget_costs(counter):
+    canvas = widget(tkinter.Canvas, counter, ".canvas")
+    player, boss = EntityGroup(canvas, "player"), EntityGroup(canvas, "boss")
+
+    jiggle = calls(counter, lambda: (player.move_to(1.0, 0.0), boss.move_to(-1.0, 0.0)))
+    assert jiggle == TK_PATH_CALLS["jiggle"]
+    flash = calls(counter, lambda: (boss.style(fill="#dc2626"), boss.move_to(4.0, 0.0), boss.style(fill="#450a0a")))
+    assert flash == TK_PATH_CALLS["boss_flash"]
+    assert calls(counter, boss.style, fill="#450a0a") == 0
+
+
+def test_budget_check_reports_overruns():
+    results = {"typing": {"calls_per_key": 19.5, "calls_per_frame": 8.8}}
+    limit = FRAME_BUDGETS["typing"]["calls_per_key"]
+
+    assert check_frame_budgets(results, {"typing": {"calls_per_key": limit}}) == [f"typing: calls_per_key 19.5 > {limit}"]
+    assert check_frame_budgets({"typing": {"calls_per_key": 1.0, "calls_per_frame": 1.0}}) == []
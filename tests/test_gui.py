@@ -0,0 +1,118 @@
+from types import SimpleNamespace
+
+import pytest
+
+from eos.engine import TypingEngine
+from eos.gui import BURST_EACH, BURST_INSTANT, BURST_MERGE, TypingBattleGame
+from eos.render import TimerRegistry
+from eos.replay import REPLAY_INPUT, REPLAY_RESTART
+from eos.stats import LatencyProbe, TypingStats
+
+
+class FakeRoot:
+    """``after``로 걸린 호출을 걸린 순서대로 직접 돌리는 Tk 루트 대역."""
+
+    def __init__(self) -> None:
+        self.jobs = {}
+        self._seq = 0
+
+    def after(self, delay_ms, callback):
+        self._seq += 1
+        self.jobs[self._seq] = callback
+        return self._seq
+
+    def after_idle(self, callback):
+        return self.after(0, callback)
+
+    def after_cancel(self, job) -> None:
+        del self.jobs[job]
+
+    def run(self) -> None:
+        while self.jobs:
+            job = min(self.jobs)
+            self.jobs.pop(job)()
+
+
+def replaying_game():
+    root = FakeRoot()
+    log = []
+    game = SimpleNamespace(timers=TimerRegistry(root), entry_var=SimpleNamespace(set=log.append))
+
+    def restart() -> None:
+        log.append("다시 시작")
+        game.timers.cancel_all()
+
+    game._restart = restart
+    return root, game, log
+
+
+def test_replay_steps_survive_recorded_restart():
+    root, game, log = replaying_game()
+    events = [[0, REPLAY_INPUT, "동"], [0, REPLAY_RESTART, None], [0, REPLAY_INPUT, "해"]]
+    TypingBattleGame.replay(game, events)
+
+    assert game.timers.live_count() == 1
+    root.run()
+    assert log == ["동", "다시 시작", "해"]
+
+
+def test_cancelling_session_timers_stops_replay():
+    root, game, log = replaying_game()
+    TypingBattleGame.replay(game, [[0, REPLAY_INPUT, "동"], [0, REPLAY_INPUT, "동해"]])
+    root.jobs.pop(min(root.jobs))()
+
+    # 다시 시작 버튼이나 창 닫기와 같이 세션 타이머를 모두 걷어 냅니다.
+    game.timers.cancel_all()
+    root.run()
+    assert log == ["동"]
+
+
+def coalescing_game(policy: str):
+    """위젯 없이 입력 처리와 화면 반영 예약만 도는 게임. 그리는 메서드는 기록으로 바꿉니다."""
+    root = FakeRoot()
+    game = TypingBattleGame.__new__(TypingBattleGame)
+    game.root = root
+    game.engine = TypingEngine(["동해 물과", "백두산이"])
+    game.stats = TypingStats()
+    game.probe = LatencyProbe()
+    game.timers = TimerRegistry(root)
+    game.telemetry = game.spectators = None
+    game.burst_policy = policy
+    game._build_state()
+    game.engine.subscribe(game._on_engine_event)
+
+    drawn = []
+    game._update_stat_labels = lambda: drawn.append("stats")
+    game._update_line_display = lambda wrong_char=None: drawn.append(("line", wrong_char))
+    game._line_transition_animation = lambda previous: drawn.append(("transition", previous))
+    game._flash_player = lambda: drawn.append("flash")
+    game._animate_missile = lambda hits=1: drawn.append(("missile", hits))
+    game._on_missile_hit = lambda hits: drawn.append(("instant", hits))
+    return root, game, drawn
+
+
+@pytest.mark.parametrize(
+    "policy, missiles",
+    [
+        (BURST_EACH, [("missile", 1)] * 4),
+        (BURST_MERGE, [("missile", 4)]),
+        (BURST_INSTANT, [("instant", 4)]),
+    ],
+)
+def test_paste_is_drawn_once_per_tick(policy, missiles):
+    root, game, drawn = coalescing_game(policy)
+    game.engine.feed_text("동해 물")
+
+    # 글자 네 개가 처리돼도 화면 반영은 유휴 콜백 하나로 미룹니다.
+    assert drawn == [] and game.timers.live_count() == 1
+    root.run()
+    assert drawn == ["stats", ("line", None), *missiles]
+
+
+def test_wrong_keys_and_line_change_share_one_redraw():
+    root, game, drawn = coalescing_game(BURST_MERGE)
+    game.engine.feed_text("동해 뭄")
+    game.engine.feed_text("물과")
+
+    root.run()
+    assert drawn == ["stats", ("transition", "동해 물과"), "flash", ("missile", 5)]
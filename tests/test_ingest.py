@@ -0,0 +1,103 @@
+import json
+import os
+import shutil
+
+from eos.ingest import INGEST_MANIFEST, ingest_corpus, stage_difficulty, wrap_display_lines
+from eos.packs import ContentPack
+from eos.text import LINE_DISPLAY_COLUMNS, display_width
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "ingest")
+
+EXPECTED = {
+    "anthem.lrc": [["동해 물과 백두산이 마르고 닳도록", "하느님이 보우하사 우리나라 만세", "무궁화 삼천리 화려강산"]],
+    "clip.srt": [["남산 위에 저 소나무", "철갑을 두른 듯 바람서리 불변함은", "우리 기상일세"]],
+    "notes.md": [
+        ["가을 하늘 공활한데 높고 구름 없이", "밝은 달은 우리 가슴 일편단심일세 -", "이 기상과 이 맘으로 충성을 다하여"],
+        ['"괴로우나 즐거우나" 나라', "사랑하세..."],
+    ],
+}
+
+
+def read_manifest(output):
+    with open(os.path.join(output, INGEST_MANIFEST), encoding="utf-8") as handle:
+        return {os.path.basename(entry["source"]): entry for entry in map(json.loads, handle)}
+
+
+def read_pack(path):
+    pack = ContentPack(path)
+    try:
+        return pack.header, [pack.line(idx) for idx in range(pack.line_count)]
+    finally:
+        pack.close()
+
+
+def test_ingest_builds_packs_and_manifest(tmp_path):
+    output = str(tmp_path / "out")
+    result = ingest_corpus([FIXTURES], output, workers=1, stage_lines=3)
+
+    assert (result["files"], result["skipped"], result["failed"], result["stages"]) == (3, 0, 0, 4)
+    manifest = read_manifest(output)
+    assert sorted(manifest) == sorted(EXPECTED)
+    for name, stages in EXPECTED.items():
+        entry = manifest[name]
+        assert entry["size"] == os.path.getsize(os.path.join(FIXTURES, name))
+        assert len(entry["stages"]) == len(stages)
+        for number, (stage, lines) in enumerate(zip(entry["stages"], stages), 1):
+            header, packed = read_pack(os.path.join(output, stage["pack"]))
+            assert packed == lines
+            assert all(display_width(line) <= LINE_DISPLAY_COLUMNS for line in packed)
+            assert stage["lines"] == header["lines"] == len(lines)
+            assert stage["chars"] == header["chars"] == sum(map(len, lines))
+            assert header["stage"] == number
+            assert header["difficulty"] == stage["difficulty"] == stage_difficulty(lines)
+
+
+def test_ingest_resumes_from_manifest(tmp_path):
+    inputs = tmp_path / "in"
+    shutil.copytree(FIXTURES, inputs)
+    output = str(tmp_path / "out")
+    ingest_corpus([str(inputs)], output, workers=1, stage_lines=3)
+
+    again = ingest_corpus([str(inputs)], output, workers=1, stage_lines=3)
+    assert (again["files"], again["skipped"]) == (0, 3)
+
+    with open(inputs / "clip.srt", "a", encoding="utf-8") as handle:
+        handle.write("\n4\n00:00:09,000 --> 00:00:10,000\n만세\n")
+    changed = ingest_corpus([str(inputs)], output, workers=1, stage_lines=3)
+    assert (changed["files"], changed["skipped"]) == (1, 2)
+    with open(os.path.join(output, INGEST_MANIFEST), encoding="utf-8") as handle:
+        assert len(handle.readlines()) == 4
+    stage = read_manifest(output)["clip.srt"]["stages"][-1]
+    assert read_pack(os.path.join(output, stage["pack"]))[1] == ["만세"]
+
+
+def test_stage_difficulty_counts_script_switches():
+    hangul = stage_difficulty(["가나다라 마바사"])
+    mixed = stage_difficulty(["가a나b다c라d"])
+
+    assert 1.0 <= hangul < mixed <= 10.0
+    assert stage_difficulty([]) == 0.0
+
+
+def test_reingest_removes_stages_that_no_longer_exist(tmp_path):
+    inputs = tmp_path / "in"
+    inputs.mkdir()
+    shutil.copy(os.path.join(FIXTURES, "notes.md"), inputs)
+    output = str(tmp_path / "out")
+    ingest_corpus([str(inputs)], output, workers=1, stage_lines=3)
+    old_stages = read_manifest(output)["notes.md"]["stages"]
+    assert len(old_stages) == 2
+
+    (inputs / "notes.md").write_text("애국가\n\n가을 하늘 공활한데\n", encoding="utf-8")
+    ingest_corpus([str(inputs)], output, workers=1, stage_lines=3)
+
+    stages = read_manifest(output)["notes.md"]["stages"]
+    assert [stage["pack"] for stage in stages] == [old_stages[0]["pack"]]
+    assert read_pack(os.path.join(output, stages[0]["pack"]))[1] == ["애국가", "가을 하늘 공활한데"]
+    assert not os.path.exists(os.path.join(output, old_stages[1]["pack"]))
+
+
+def test_wrap_emits_at_least_one_char_per_line():
+    assert wrap_display_lines("대한 사람 abc", 1) == ["대", "한", "사", "람", "a", "b", "c"]
+    assert wrap_display_lines("대한사람", 3) == ["대", "한", "사", "람"]
+    assert wrap_display_lines("대한 사람 대한으로", 9) == ["대한 사람", "대한으로"]
@@ -0,0 +1,59 @@
+import sys
+
+import pytest
+
+from eos.ngram import (
+    NGRAM_SUFFIX, NgramIndex, _decode_postings, _decode_postings_numpy, _encode_postings, build_ngram_index, line_ngrams,
+)
+
+LINES = ["동해 물과 백두산이", "", "마르고 닳도록", "하느님이 보우하사", "닳도록 닳도록 물과", "우리나라 만세"]
+
+
+@pytest.fixture
+def index(tmp_path):
+    path = tmp_path / ("anthem" + NGRAM_SUFFIX)
+    header = build_ngram_index(LINES, path)
+    assert (header["lines"], header["terms"]) == (5, len(set().union(*map(line_ngrams, LINES))))
+    index = NgramIndex(path)
+    yield index
+    index.close()
+
+
+def test_postings_round_trip_large_gaps():
+    line_ids = [0, 1, 127, 128, 16_511, 2 ** 21, 2 ** 32 - 1]
+    encoded = _encode_postings(line_ids)
+
+    assert len(encoded) == 1 + 1 + 1 + 1 + 2 + 3 + 5
+    assert list(_decode_postings(encoded)) == line_ids
+
+
+def test_numpy_decoder_matches_python():
+    np = pytest.importorskip("numpy")
+    line_ids = sorted({(idx * 7919) % 3_000_000 for idx in range(2000)} | {2 ** 32 - 1})
+    encoded = _encode_postings(line_ids)
+
+    assert len(encoded) >= 256
+    assert _decode_postings_numpy(np, bytes(encoded)).tolist() == line_ids
+
+
+def test_build_keeps_lines_and_postings(index):
+    assert [index.line(line_id) for line_id in range(index.line_count)] == [line for line in LINES if line]
+    assert list(index.postings("닳도")) == [1, 3]
+    assert list(index.postings("물과")) == [0, 3]
+    assert list(index.postings("없는")) == []
+
+
+def test_query_ranks_by_weak_count_then_weight(index):
+    weak = [("닳도", 1), ("물과", 5), ("만세", 2)]
+
+    assert index.query(weak, limit=2) == [(2 * 9 + 6, 3), (9 + 5, 0)]
+    assert index.query([("없는", 3)]) == []
+    assert index.drill_lines(weak, 2) == ["닳도록 닳도록 물과", "동해 물과 백두산이"]
+
+
+def test_query_without_numpy_matches(index, monkeypatch):
+    weak = [("닳도", 1), ("물과", 5), ("만세", 2), ("하느", 4)]
+    expected = index.query(weak, limit=4)
+    monkeypatch.setitem(sys.modules, "numpy", None)
+
+    assert index.query(weak, limit=4) == expected
@@ -0,0 +1,55 @@
+import unicodedata
+
+import pytest
+
+from eos.packs import PACK_SECTIONS, ContentPack, compile_content_pack, read_pack_header
+from eos.text import LYRICS_LINES, LineTextSource
+
+
+def test_pack_round_trip(tmp_path):
+    path = tmp_path / "anthem.eospack"
+    lines = ["", unicodedata.normalize("NFD", LYRICS_LINES[0]) + "\r", *LYRICS_LINES[1:], "abc ✓"]
+    header = compile_content_pack(lines, path, "애국가", {"stage": 1})
+
+    expected = LineTextSource([*LYRICS_LINES, "abc ✓"])
+    pack = ContentPack(path, verify=True)
+    try:
+        assert read_pack_header(path)["sections"].keys() == set(PACK_SECTIONS)
+        assert (pack.title, pack.header["stage"]) == ("애국가", 1)
+        assert pack.line_count == header["lines"] == expected.line_count
+        assert pack.total_chars == header["chars"] == expected.total_chars
+        assert [pack.line(idx) for idx in range(pack.line_count)] == expected._lines
+        for index in range(expected.total_chars):
+            assert pack.position(index) == expected.position(index)
+            assert pack.char_at(index) == expected.char_at(index)
+        assert pack.content_digest() == expected.content_digest()
+    finally:
+        pack.close()
+
+
+def test_hash_mismatch_is_reported(tmp_path):
+    path = tmp_path / "anthem.eospack"
+    header = compile_content_pack(LYRICS_LINES, path)
+    offset = header["sections"]["text"][0]
+    data = bytearray(path.read_bytes())
+    data[offset:offset + 3] = "남".encode("utf-8")
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError, match="해시"):
+        ContentPack(path, verify=True)
+    pack = ContentPack(path)
+    try:
+        assert pack.line(0).startswith("남해")
+        with pytest.raises(ValueError, match="해시"):
+            pack.verify()
+    finally:
+        pack.close()
+
+
+def test_truncated_pack_is_rejected(tmp_path):
+    path = tmp_path / "anthem.eospack"
+    compile_content_pack(LYRICS_LINES, path)
+    path.write_bytes(path.read_bytes()[:-8])
+
+    with pytest.raises(ValueError, match="잘렸습니다"):
+        ContentPack(path)
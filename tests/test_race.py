@@ -0,0 +1,149 @@
+import asyncio
+import json
+
+from eos.net import RaceRoom, RaceServer, _encode_race_message
+from eos.text import LineTextSource
+
+LINES = ["동해 물과", "백두산이"]
+
+
+class Client:
+    def __init__(self, reader, writer) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.messages = []
+
+    def send(self, message: dict) -> None:
+        self.writer.write(_encode_race_message(message))
+
+    async def expect(self, op: str, **fields) -> dict:
+        while True:
+            message = json.loads(await asyncio.wait_for(self.reader.readline(), 5))
+            self.messages.append(message)
+            if message["op"] == op and all(message.get(key) == value for key, value in fields.items()):
+                return message
+
+    async def type_all(self, lines) -> dict:
+        remaining = ""
+        for seq, ch in enumerate("".join(lines)):
+            self.send({"op": "keys", "text": remaining + ch, "seq": seq})
+            state = await self.expect("state", seq=seq)
+            remaining = state["remaining"]
+        return state
+
+
+def run_race(scenario):
+    """RaceServer를 같은 이벤트 루프에 띄우고 ``scenario(server, connect)``를 실행합니다."""
+
+    async def main():
+        server = RaceServer(LINES, room_size=4)
+        ready = asyncio.get_running_loop().create_future()
+        task = asyncio.create_task(server.serve("127.0.0.1", 0, ready=ready.set_result))
+        port = (await ready).sockets[0].getsockname()[1]
+        clients = []
+
+        async def connect(room: str, name: str) -> Client:
+            client = Client(*await asyncio.open_connection("127.0.0.1", port))
+            client.send({"op": "join", "room": room, "player": name})
+            clients.append(client)
+            return client
+
+        try:
+            return await scenario(server, connect)
+        finally:
+            for client in clients:
+                client.writer.close()
+            while server.sessions:
+                await asyncio.sleep(0.001)
+            task.cancel()
+
+    return asyncio.run(main())
+
+
+def test_race_shares_boss_hp_and_ranks_finishers():
+    async def scenario(server, connect):
+        clients = [await connect("arena", name) for name in ("a", "b", "c")]
+        for client in clients:
+            await client.expect("welcome")
+
+        hp = []
+        for client in (clients[1], clients[2], clients[0]):
+            state = await client.type_all(LINES)
+            hp.append(state["boss_hp"])
+        room = server.rooms["arena"]
+        await clients[1].expect("finish")
+        return hp, next(m for m in clients[0].messages if m["op"] == "finish"), room
+
+    hp, finish, room = run_race(scenario)
+
+    assert hp[:2] == [round(100 * 2 / 3, 3), round(100 / 3, 3)]
+    assert hp[2] == 0.0 and room.boss_hp == 0.0
+    assert finish == {"op": "finish", "ranking": ["b", "c", "a"], "boss_hp": 0.0}
+
+
+def test_room_closes_after_first_keystroke():
+    async def scenario(server, connect):
+        first = await connect("", "a")
+        welcome = await first.expect("welcome")
+        first.send({"op": "keys", "text": "동", "seq": 0})
+        await first.expect("state", seq=0)
+
+        named = await connect(welcome["room"], "late")
+        refused = await named.expect("error")
+        other = await connect("", "b")
+        placed = await other.expect("welcome")
+        return welcome, refused, placed
+
+    welcome, refused, placed = run_race(scenario)
+
+    assert refused["reason"] == "room closed"
+    assert placed["room"] != welcome["room"] and placed["players"] == ["b"]
+
+
+class FakeTransport:
+    def is_closing(self) -> bool:
+        return False
+
+    def get_write_buffer_size(self) -> int:
+        return 0
+
+
+class FakeWriter:
+    transport = FakeTransport()
+
+    def __init__(self) -> None:
+        self.sent = []
+
+    def write(self, data: bytes) -> None:
+        self.sent.append(json.loads(data))
+
+
+def test_leaving_mid_race_rescales_the_remaining_damage():
+    source = LineTextSource(LINES)
+    room = RaceRoom("r", source)
+    players = [room.join(name, FakeWriter()) for name in ("a", "b", "c")]
+    text = "".join(LINES)
+
+    room.feed(players[0], text[:3])
+    room.feed(players[2], text[:5])
+    room.leave(players[2])
+    for player in players[:2]:
+        for ch in text[player.engine.current_index:]:
+            room.feed(player, ch)
+
+    assert room.finished and room.boss_hp == 0.0
+    assert room.ranking == ["a", "b"]
+    assert players[0].writer.sent[-1] == {"op": "finish", "ranking": ["a", "b"], "boss_hp": 0.0}
+
+
+def test_last_unfinished_player_leaving_ends_the_race():
+    room = RaceRoom("r", LineTextSource(LINES))
+    winner, quitter = room.join("a", FakeWriter()), room.join("b", FakeWriter())
+    for ch in "".join(LINES):
+        room.feed(winner, ch)
+    assert not room.finished
+
+    room.leave(quitter)
+
+    assert room.finished and room.boss_hp == 0.0
+    assert winner.writer.sent[-1]["ranking"] == ["a"]
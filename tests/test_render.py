@@ -0,0 +1,275 @@
+import random
+
+import pytest
+
+from eos import render
+from eos.render import EntityGroup, FrameClock, LineRenderer, LyricsViewport, MissilePool, TrajectoryCache, bezier_trajectory
+from eos.text import LYRICS_LINES, LineTextSource
+
+
+class FakeCanvas:
+    def __init__(self) -> None:
+        self.calls = []
+        self._ids = 0
+
+    def create_oval(self, *args, **options):
+        self._ids += 1
+        return self._ids
+
+    def __getattr__(self, name):
+        return lambda *args, **options: self.calls.append((name, *args))
+
+
+class FakeText:
+    """글자마다 태그 집합을 들고 있는 Text 위젯 모형. ``줄.칸``, ``줄.end``, ``end`` 위치만 압니다."""
+
+    def __init__(self) -> None:
+        self.chars = []
+
+    def _index(self, index: str) -> int:
+        if index == "end":
+            return len(self.chars)
+        row, col = index.split(".")
+        start = 0
+        for _ in range(int(row) - 1):
+            newline = self._find_newline(start)
+            if newline is None:
+                return len(self.chars)
+            start = newline + 1
+        end = self._find_newline(start)
+        end = len(self.chars) if end is None else end
+        return end if col == "end" else min(start + int(col), end)
+
+    def _find_newline(self, start: int):
+        for pos in range(start, len(self.chars)):
+            if self.chars[pos][0] == "\n":
+                return pos
+        return None
+
+    def insert(self, index: str, text: str, tags=None) -> None:
+        pos = self._index(index)
+        if tags is None:
+            # Tk처럼 태그를 주지 않으면 양옆 글자에 모두 있는 태그를 물려받습니다.
+            left = self.chars[pos - 1][1] if pos > 0 else set()
+            right = self.chars[pos][1] if pos < len(self.chars) else set()
+            tags = left & right
+        elif isinstance(tags, str):
+            tags = {tags}
+        self.chars[pos:pos] = [[ch, set(tags)] for ch in text]
+
+    def delete(self, start: str, end: str) -> None:
+        del self.chars[self._index(start):self._index(end)]
+
+    def tag_add(self, tag: str, start: str, end: str) -> None:
+        for item in self.chars[self._index(start):self._index(end)]:
+            item[1].add(tag)
+
+    def tag_remove(self, tag: str, start: str, end: str) -> None:
+        for item in self.chars[self._index(start):self._index(end)]:
+            item[1].discard(tag)
+
+    def configure(self, **options) -> None:
+        pass
+
+    def state(self) -> list:
+        return [(ch, sorted(tags)) for ch, tags in self.chars]
+
+
+class ManualClock:
+    """``after``/``after_cancel`` 대신 쓰는 손으로 돌리는 시계."""
+
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.jobs = {}
+        self._seq = 0
+        self.clock = FrameClock(self.schedule, self.jobs.pop, now=lambda: self.now)
+
+    def schedule(self, delay_ms, callback):
+        self._seq += 1
+        self.jobs[self._seq] = (self.now + delay_ms, callback)
+        return self._seq
+
+    def advance(self, ms: float) -> None:
+        deadline = self.now + ms
+        while self.jobs:
+            job, (due, callback) = min(self.jobs.items(), key=lambda item: item[1][0])
+            if due > deadline:
+                break
+            del self.jobs[job]
+            self.now = max(self.now, due)
+            callback()
+        self.now = deadline
+
+
+def launch(pool):
+    pool.launch(4, [0.0, 1.0, 2.0], [0.0, 0.0, 0.0], 10)
+
+
+def test_missiles_fly_again_after_restart_mid_flight():
+    manual = ManualClock()
+    hits = []
+    pool = MissilePool(FakeCanvas(), manual.clock, hits.append, capacity=2)
+    launch(pool)
+    manual.advance(10)
+
+    # 게임 재시작과 같은 순서: 시계를 먼저 비우고 풀을 비웁니다.
+    manual.clock.clear()
+    pool.clear()
+    assert pool.active_count() == 0 and not pool._animating
+
+    launch(pool)
+    assert manual.clock.active_count() == 1
+    manual.advance(100)
+    assert hits == [1]
+    assert pool.active_count() == 0
+
+
+def test_pool_needs_at_least_one_missile():
+    with pytest.raises(ValueError):
+        MissilePool(FakeCanvas(), ManualClock().clock, lambda hits: None, capacity=0)
+
+
+def test_clock_keeps_ticking_after_a_callback_raises():
+    manual = ManualClock()
+    frames, fired = [], []
+
+    def broken(now):
+        raise RuntimeError("애니메이션 오류")
+
+    def boom():
+        raise RuntimeError("타이머 오류")
+
+    def steady(now):
+        frames.append(now)
+        return len(frames) < 3
+
+    manual.clock.add(broken)
+    manual.clock.add(steady)
+    manual.clock.call_later(5, boom)
+    manual.clock.call_later(40, lambda: fired.append("timer"))
+
+    with pytest.raises(RuntimeError, match="애니메이션"):
+        manual.advance(100)
+    with pytest.raises(RuntimeError, match="타이머"):
+        manual.advance(100)
+    manual.advance(100)
+
+    # 예외를 던진 호출체만 빠지고 같은 틱에서 아직 돌지 않은 애니메이션과 뒤의 타이머는 그대로 돕니다.
+    assert len(frames) == 3
+    assert fired == ["timer"]
+    assert manual.clock.active_count() == 0 and not manual.jobs
+
+
+def test_incremental_line_render_matches_full_rebuild():
+    rng = random.Random(3)
+    incremental = LineRenderer(FakeText())
+    for line in LYRICS_LINES[:4]:
+        typed = 0
+        for _ in range(3 * len(line)):
+            typed = max(0, min(len(line), typed + rng.choice((-1, 0, 1, 1, 1, 3))))
+            wrong = rng.choice((None, None, "쀍", "x"))
+            incremental.render(line, typed, wrong)
+
+            fresh = LineRenderer(FakeText())
+            fresh.render(line, typed, wrong)
+            assert incremental.widget.state() == fresh.widget.state(), (line, typed, wrong)
+        incremental.show_transition(line)
+
+
+def test_line_render_skips_unchanged_state():
+    widget = FakeText()
+    renderer = LineRenderer(widget)
+    renderer.render(LYRICS_LINES[0], 2, "x")
+    widget.chars = None
+
+    # 같은 상태를 다시 그리라고 해도 위젯은 건드리지 않습니다.
+    renderer.render(LYRICS_LINES[0], 2, "x")
+    renderer.render(LYRICS_LINES[0][:4] + LYRICS_LINES[0][4:], 2, "x")
+
+
+def test_bezier_trajectory_hits_both_ends(monkeypatch):
+    args = ((10.0, 80.0), (60.0, -40.0), (200.0, 150.0), (300.0, 60.0), 12, 1.7)
+    xs, ys = bezier_trajectory(*args)
+    assert len(xs) == len(ys) == 13
+    assert (xs[0], ys[0]) == pytest.approx((10.0, 80.0))
+    assert (xs[-1], ys[-1]) == pytest.approx((300.0, 60.0))
+
+    # NumPy가 없을 때의 곱셈 경로도 같은 점을 냅니다.
+    monkeypatch.setattr(render, "np", None)
+    plain_xs, plain_ys = bezier_trajectory(*args)
+    assert plain_xs == pytest.approx(xs) and plain_ys == pytest.approx(ys)
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_trajectory_cache_fits_templates_to_endpoints(numpy, monkeypatch):
+    if not numpy:
+        monkeypatch.setattr(render, "np", None)
+    cache = TrajectoryCache(random.Random(5), variants=3)
+
+    for start, end in (((40.0, 60.0), (340.0, 60.0)), ((0.0, 0.0), (-50.0, 120.0))):
+        xs, ys = cache.trajectory(start, end, 20, 1.6)
+        assert len(xs) == 21
+        assert (xs[0], ys[0]) == pytest.approx(start)
+        assert (xs[-1], ys[-1]) == pytest.approx(end)
+
+    # 가속 구간이 같은 칸이면 템플릿을 다시 굽지 않습니다.
+    cache.trajectory((0.0, 0.0), (1.0, 1.0), 20, 1.55)
+    assert len(cache) == 1
+    cache.trajectory((0.0, 0.0), (1.0, 1.0), 30, 1.6)
+    assert len(cache) == 2
+
+
+def visible(widget) -> list:
+    # 뷰 태그는 글자색만 바꾸므로 줄바꿈 글자에 붙은 태그는 화면에 드러나지 않습니다.
+    return [(ch, tags) if ch != "\n" else ch for ch, tags in widget.state()]
+
+
+def test_viewport_scrolls_like_a_full_rebuild():
+    rng = random.Random(11)
+    source = LineTextSource([f"{idx}번째 줄 가사" for idx in range(60)])
+    viewport = LyricsViewport(FakeText())
+    line_idx = 0
+    for _ in range(300):
+        line_idx = max(0, min(source.line_count - 1, line_idx + rng.choice((0, 0, 0, 1, 1, 2, 5, 9, -3))))
+        typed = rng.randrange(len(source.line(line_idx)) + 1)
+        viewport.render(source, line_idx, typed)
+
+        fresh = LyricsViewport(FakeText())
+        fresh.render(source, line_idx, typed)
+        assert visible(viewport.widget) == visible(fresh.widget), (line_idx, typed)
+
+
+def test_viewport_shows_blank_rows_past_the_ends():
+    widget = FakeText()
+    LyricsViewport(widget, before=2, after=2).render(LineTextSource(["첫 줄", "둘째 줄"]), 0, 1)
+
+    text = "".join(ch for ch, _tags in widget.state())
+    assert text.split("\n") == ["", "", "첫 줄", "둘째 줄", ""]
+    assert widget.state()[2] == ("첫", ["align", "view_current", "view_typed"])
+
+
+def test_entity_group_moves_by_difference_only():
+    canvas = FakeCanvas()
+    boss = EntityGroup(canvas, "boss")
+    assert boss.tags() == ("boss",) and boss.tags(body=True) == ("boss", "boss_body")
+
+    boss.move_to(3.0, 0.0)
+    boss.move_to(3.0, 0.0)
+    boss.move_to(-1.0, 2.0)
+    boss.move_to(0.0, 0.0)
+    assert canvas.calls == [("move", "boss", 3.0, 0.0), ("move", "boss", -4.0, 2.0), ("move", "boss", 1.0, -2.0)]
+
+
+def test_entity_group_styles_only_changed_options():
+    canvas = FakeCanvas()
+    options = []
+    canvas.itemconfig = lambda tag, **changed: options.append((tag, changed))
+    player = EntityGroup(canvas, "player")
+
+    player.style(fill="#dc2626", outline="#fff")
+    player.style(fill="#dc2626", outline="#fff")
+    player.style(fill="#450a0a", outline="#fff")
+    assert options == [
+        ("player_body", {"fill": "#dc2626", "outline": "#fff"}),
+        ("player_body", {"fill": "#450a0a"}),
+    ]
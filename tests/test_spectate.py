@@ -0,0 +1,82 @@
+import pytest
+
+from eos.engine import TypingEngine
+from eos.net import SPECTATE_ADVANCE, SPECTATE_HP, SpectatorDecoder, SpectatorEncoder, render_spectator_line
+from eos.text import LineTextSource
+
+LINES = ["동해 물과", "백두산이"]
+
+
+def watched_engine():
+    engine = TypingEngine(LineTextSource(LINES))
+    encoder = SpectatorEncoder(engine)
+    engine.subscribe(encoder)
+    return engine, encoder
+
+
+def feed_bytewise(decoder, data: bytes) -> None:
+    # 소켓에서 조각나 들어오는 경우처럼 한 바이트씩 먹입니다.
+    for pos in range(len(data)):
+        decoder.feed(data[pos:pos + 1])
+
+
+def assert_in_sync(decoder, engine) -> None:
+    assert decoder.index == engine.current_index
+    assert decoder.boss_hp == pytest.approx(engine.boss_hp, abs=0.01)
+    assert decoder.line_idx == engine.current_line_index
+    assert decoder.line == engine.source.line(engine.current_line_index)
+    assert (decoder.game_over, decoder.victory) == (engine.game_over, engine.victory)
+
+
+def test_deltas_follow_the_engine_through_a_whole_game():
+    engine, encoder = watched_engine()
+    decoder = SpectatorDecoder()
+    feed_bytewise(decoder, encoder.keyframe())
+    assert decoder.synced
+
+    text = "".join(LINES)
+    for pos, ch in enumerate(text):
+        if pos == 3:
+            engine.process_char("x")
+            feed_bytewise(decoder, encoder.take())
+            assert decoder.wrong == "x"
+        engine.process_char(ch)
+        if pos % 2:
+            encoder.missile(2)
+            feed_bytewise(decoder, encoder.take())
+            assert_in_sync(decoder, engine)
+    feed_bytewise(decoder, encoder.take())
+
+    assert_in_sync(decoder, engine)
+    assert decoder.victory and decoder.wrong is None
+    assert decoder.missiles == 2 * (len(text) // 2)
+    assert "승리!" in render_spectator_line(decoder)
+
+
+def test_correct_keys_are_sent_as_one_advance():
+    engine, encoder = watched_engine()
+    encoder.keyframe()
+    for ch in LINES[0][:4]:
+        engine.process_char(ch)
+
+    data = encoder.take()
+    assert data[:2] == bytes([SPECTATE_ADVANCE, 4])
+    assert data[2] == SPECTATE_HP
+    assert encoder.take() == b""
+
+
+def test_keyframe_syncs_a_late_viewer():
+    engine, encoder = watched_engine()
+    for ch in LINES[0] + LINES[1][:2]:
+        engine.process_char(ch)
+    encoder.take()
+
+    late = SpectatorDecoder()
+    late.feed(encoder.keyframe())
+    assert_in_sync(late, engine)
+    assert render_spectator_line(late).count("2번째 줄") == 1
+
+
+def test_unknown_opcode_is_rejected():
+    with pytest.raises(ValueError, match="opcode"):
+        SpectatorDecoder().feed(bytes([0x7F]))
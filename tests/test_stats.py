@@ -0,0 +1,135 @@
+import io
+import json
+
+import pytest
+
+from eos import stats
+from eos.stats import CHAR_SLOTS, LatencyProbe, RollingHistogram, TypingStats
+
+
+@pytest.fixture
+def ticks(monkeypatch):
+    now = [0]
+    monkeypatch.setattr(stats.time, "perf_counter_ns", lambda: now[0])
+    return now
+
+
+def test_rolling_histogram_keeps_recent_window():
+    histogram = RollingHistogram(4)
+    for value in (100.0, 1.0, 2.0, 3.0, 4.0):
+        histogram.add(value)
+
+    assert histogram.samples() == [4.0, 1.0, 2.0, 3.0]
+    assert histogram.percentiles(0, 50, 100) == [1.0, 3.0, 4.0]
+    assert histogram.summary()["count"] == 5 and histogram.max == 100.0
+    assert RollingHistogram().percentiles(50, 99) == [0.0, 0.0]
+
+
+def test_probe_times_a_batch_from_its_first_key(ticks):
+    probe = LatencyProbe()
+    probe.stage("engine")
+    assert probe.histograms["engine"].count == 0
+
+    probe.input_started()
+    ticks[0] = 2_000_000
+    # 같은 묶음 안의 두 번째 키는 시작 시각을 바꾸지 않습니다.
+    probe.input_started()
+    probe.stage("engine")
+    ticks[0] = 5_500_000
+    probe.stage("render")
+
+    assert probe.input_finished() == 5.5
+    assert probe.input_finished() is None
+    snapshot = probe.snapshot()
+    assert (snapshot["engine"]["max"], snapshot["render"]["max"], snapshot["photon"]["max"]) == (2.0, 5.5, 5.5)
+
+
+def test_discarded_input_is_not_recorded(ticks):
+    probe = LatencyProbe()
+    probe.input_started()
+    probe.discard_input()
+    ticks[0] = 9_000_000
+
+    assert probe.input_finished() is None
+    assert probe.histograms["photon"].count == 0
+
+
+def test_export_writes_one_json_line(ticks):
+    probe = LatencyProbe()
+    probe.record("frame_jitter", 3.0)
+    probe.record("custom", 1.0)
+    handle = io.StringIO()
+    probe.export(handle, budget_ms=50.0)
+
+    record = json.loads(handle.getvalue())
+    assert handle.getvalue().count("\n") == 1
+    assert record["budget_ms"] == 50.0
+    assert record["stages"]["frame_jitter"]["p50"] == 3.0
+    assert record["stages"]["custom"]["count"] == 1
+
+
+def type_chars(stats, chars, start=0.0, gap=0.1) -> float:
+    now = start
+    for ch in chars:
+        stats.correct_char(ch, now)
+        now += gap
+    return now
+
+
+def test_strokes_count_jamo_keys():
+    stats = TypingStats()
+    for ch, strokes in (("a", 1), ("하", 2), ("한", 3), ("와", 3), ("닭", 4), ("왠", 4)):
+        before = stats.strokes
+        stats.correct_char(ch, 0.0)
+        assert stats.strokes - before == strokes, ch
+
+
+def test_speed_uses_the_recent_window():
+    stats = TypingStats(window=4)
+    now = type_chars(stats, "a" * 10, gap=1.0)
+    type_chars(stats, "a" * 4, start=now, gap=0.1)
+
+    # 최근 네 글자 사이 0.3초 동안 세 타, 세 글자.
+    assert stats.cpm() == pytest.approx(600.0)
+    assert stats.wpm() == pytest.approx(120.0)
+    assert TypingStats().cpm() == 0.0
+
+
+def test_accuracy_window_and_overall():
+    stats = TypingStats(window=4)
+    for _ in range(4):
+        stats.wrong_char("가", 0.0)
+    type_chars(stats, "가가가가")
+
+    assert stats.accuracy() == 100.0
+    assert stats.overall_accuracy() == 50.0
+    stats.reset()
+    assert (stats.correct, stats.wrong, stats.accuracy()) == (0, 0, 100.0)
+
+
+def test_missed_chars_and_ngrams_are_ranked():
+    stats = TypingStats()
+    for expected, context in (("과", "해 물"), ("과", "물"), ("산", "백두"), ("과", ""), (" ", "동해")):
+        stats.wrong_char(expected, 0.0, context)
+
+    assert stats.most_missed(2) == [("과", 3), ("산", 1)]
+    assert dict(stats.weak_ngrams()) == {"물과": 2, "두산": 1, "백두산": 1}
+
+
+def test_slowest_jamo_uses_gap_before_each_char():
+    stats = TypingStats()
+    now = 0.0
+    for _ in range(4):
+        stats.correct_char("가", now + 0.2)
+        stats.correct_char("노", now + 0.21)
+        now += 0.21
+
+    assert stats.slowest_jamo(4) == [("ㅏ", 256.0), ("ㄱ", 256.0), ("ㅗ", 16.0), ("ㄴ", 16.0)]
+
+
+def test_per_char_tables_stay_bounded():
+    stats = TypingStats()
+    type_chars(stats, (chr(0xAC00 + code) for code in range(CHAR_SLOTS + 500)), gap=0.05)
+
+    assert len(stats.char_latency) == CHAR_SLOTS
+    assert stats.correct == CHAR_SLOTS + 500
@@ -0,0 +1,52 @@
+import sqlite3
+import time
+
+from eos.benches import benchmark_store
+from eos.store import SessionStore, session_record
+
+SUMMARY = {"chars": 120, "wrong": 3, "seconds": 30.0, "cpm": 240.0, "wpm": 48.0, "accuracy": 97.5, "most_missed": [["닳", 2]]}
+
+# 쓰기 스레드가 디스크를 기다리는 동안에도 submit은 큐에 넣기만 해야 합니다. 막힌다면 대부분의
+# submit이 배치 하나를 쓰는 시간만큼 기다리므로, 기준은 기계 속도가 아니라 그 지연에 맞춥니다.
+DISK_DELAY_MS = 20.0
+SUBMIT_P99_US = DISK_DELAY_MS * 1000.0 / 10
+
+
+def wait_for_callbacks(store, count, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    handled = 0
+    while handled < count and time.monotonic() < deadline:
+        handled += store.poll()
+        time.sleep(0.005)
+    return handled
+
+
+def test_failed_lookup_does_not_stop_the_writer(tmp_path):
+    store = SessionStore(tmp_path / "history.sqlite3")
+    results = []
+    try:
+        # 바인딩할 수 없는 값이라 sqlite3가 조회에서 ProgrammingError를 냅니다.
+        assert store.lookup_best(["not", "a", "song"], "tester", results.append)
+        assert store.submit(session_record("song", "제목", "tester", SUMMARY, True))
+        assert store.lookup_best("song", "tester", results.append)
+
+        assert wait_for_callbacks(store, 2) == 2
+        assert store._thread.is_alive()
+    finally:
+        store.close()
+
+    assert isinstance(store.error, sqlite3.Error)
+    assert results[0] is None
+    assert results[1]["player"] == "tester" and results[1]["chars"] == 120
+    assert store.written == 1 and store.pending_lookups == 0
+
+
+def test_saturated_writer_never_blocks_submit():
+    result = benchmark_store(records=5000, queue_size=64, disk_delay_ms=DISK_DELAY_MS)
+
+    assert result["error"] == ""
+    assert result["dropped"] > 0 and result["written"] > 0
+    assert result["written"] + result["dropped"] == result["records"]
+    assert result["stored"] == result["written"] == result["accepted"]
+    assert result["submit_us"]["count"] == result["records"]
+    assert result["submit_us"]["p99"] < SUBMIT_P99_US
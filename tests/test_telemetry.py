@@ -0,0 +1,30 @@
+from eos.benches import TELEMETRY_MODES, benchmark_telemetry, check_telemetry_latency
+
+KEYSTROKES = 30_000
+# 벤치 기준(bench-telemetry)보다 넉넉하게 봐줍니다. 바쁜 CI에서는 µs 단위 p99가 쉽게 흔들리지만,
+# 내보내기가 화면 스레드를 막는다면 수집기가 붙잡는 0.2초 단위로 드러나므로 이 정도로도 잡힙니다.
+TEST_P99_RATIO = 3.0
+TEST_P99_SLACK_US = 200.0
+
+
+def test_exporter_does_not_slow_keystrokes():
+    results = [benchmark_telemetry(mode, KEYSTROKES) for mode in TELEMETRY_MODES]
+
+    assert check_telemetry_latency(results, TEST_P99_RATIO, TEST_P99_SLACK_US) == []
+    for result in results[1:]:
+        assert result["keystrokes"] == KEYSTROKES
+        assert result["sent"] + result["dropped"] == KEYSTROKES
+    # 버퍼가 넘치면 기다리지 않고 버렸다는 뜻입니다.
+    slow = results[TELEMETRY_MODES.index("slow")]
+    assert slow["dropped"] > 0
+
+
+def test_latency_check_flags_a_slow_mode():
+    off = {"mode": "off", "p99": 10.0}
+    fine = {"mode": "file", "p99": 29.0}
+    blocked = {"mode": "slow", "p99": 31.0}
+
+    assert check_telemetry_latency([off, fine]) == []
+    assert check_telemetry_latency([off, fine, blocked]) == ["slow p99 31.00 µs > 30.00 µs"]
+    assert check_telemetry_latency([off, blocked], ratio=3.0, slack_us=0.0) == ["slow p99 31.00 µs > 30.00 µs"]
+    assert check_telemetry_latency([off, blocked], ratio=1.0, slack_us=25.0) == []
@@ -0,0 +1,112 @@
+import unicodedata
+
+import pytest
+
+from eos.text import (
+    HANGUL_BASE, HANGUL_COUNT, MATCH_COMPLETE, MATCH_PARTIAL, MATCH_WRONG, HangulMatcher, LineTextSource, MappedTextSource,
+    _composition_states,
+)
+
+
+def write(tmp_path, data: bytes):
+    path = tmp_path / "lyrics.txt"
+    path.write_bytes(data)
+    return str(path)
+
+
+def assert_same_as_lines(source, lines):
+    expected = LineTextSource(lines)
+    assert source.line_count == expected.line_count
+    assert source.total_chars == expected.total_chars
+    assert [source.line(idx) for idx in range(source.line_count)] == expected._lines
+    assert [source.char_at(index) for index in range(source.total_chars)] == [
+        expected.char_at(index) for index in range(expected.total_chars)
+    ]
+    assert source.content_digest() == expected.content_digest()
+
+
+def test_char_at_crosses_line_boundaries(tmp_path):
+    source = MappedTextSource(write(tmp_path, "동해 물과\nabc\n백두산이\n".encode("utf-8")), window_lines=1, cached_windows=1)
+
+    assert source.position(5) == (1, 0)
+    assert source.char_at(4) == "과"
+    assert source.char_at(5) == "a"
+    assert source.char_at(7) == "c"
+    assert source.char_at(8) == "백"
+    assert_same_as_lines(source, ["동해 물과", "abc", "백두산이"])
+    source.close()
+
+
+def test_crlf_and_blank_lines_are_dropped(tmp_path):
+    source = MappedTextSource(write(tmp_path, "\r\n하느님이\r\n\r\n\nabc\r".encode("utf-8")))
+
+    assert_same_as_lines(source, ["하느님이", "abc"])
+    source.close()
+
+
+def test_decomposed_hangul_is_normalized(tmp_path):
+    decomposed = unicodedata.normalize("NFD", "무궁화 삼천리")
+    source = MappedTextSource(write(tmp_path, f"대한 사람\n{decomposed}\n".encode("utf-8")))
+
+    assert source.line(1) == "무궁화 삼천리"
+    assert_same_as_lines(source, ["대한 사람", "무궁화 삼천리"])
+    source.close()
+
+
+def test_index_matches_across_scan_blocks(tmp_path, monkeypatch):
+    lines = [f"{idx} 길이 보전하세 ✓" for idx in range(200)]
+    monkeypatch.setattr(MappedTextSource, "SCAN_BLOCK_BYTES", 64)
+    source = MappedTextSource(write(tmp_path, "\n".join(lines).encode("utf-8")), window_lines=16)
+
+    assert_same_as_lines(source, lines)
+    source.close()
+
+
+def test_empty_file(tmp_path):
+    source = MappedTextSource(write(tmp_path, b""))
+
+    assert source.line_count == 0
+    assert source.total_chars == 0
+    assert source.content_digest() == LineTextSource([]).content_digest()
+    source.close()
+
+
+def test_decompose_splits_syllables_only():
+    assert HangulMatcher.decompose("한") == (18, 0, 4)
+    assert HangulMatcher.decompose("닭") == (3, 0, 9)
+    assert HangulMatcher.decompose("a") is None
+    assert HangulMatcher.decompose("ㅎ") is None
+
+
+def test_every_composition_state_is_partial():
+    matcher = HangulMatcher()
+    for code in range(HANGUL_BASE, HANGUL_BASE + HANGUL_COUNT):
+        syllable = chr(code)
+        *composing, last = _composition_states(syllable)
+        assert last == syllable
+        assert all(matcher.classify(state, syllable) == MATCH_PARTIAL for state in composing), syllable
+        assert matcher.classify(last, syllable) == MATCH_COMPLETE
+
+
+@pytest.mark.parametrize(
+    "typed, expected, following, result",
+    [
+        ("ㄴ", "나", None, MATCH_PARTIAL),
+        ("ㅏ", "나", None, MATCH_WRONG),
+        ("가", "나", None, MATCH_WRONG),
+        ("오", "와", None, MATCH_PARTIAL),
+        ("우", "와", None, MATCH_WRONG),
+        ("달", "닭", None, MATCH_PARTIAL),
+        ("닮", "닭", None, MATCH_WRONG),
+        # 받침이 다음 음절의 초성으로 넘어갈 글자면 아직 틀린 게 아닙니다.
+        ("한", "하", "나", MATCH_PARTIAL),
+        ("한", "하", "다", MATCH_WRONG),
+        ("닭", "달", "과", MATCH_PARTIAL),
+        ("닭", "달", "나", MATCH_WRONG),
+        ("한", "하", "n", MATCH_WRONG),
+        ("a", "b", None, MATCH_WRONG),
+        ("a", None, None, MATCH_WRONG),
+    ],
+)
+def test_classify_edge_cases(typed, expected, following, result):
+    assert HangulMatcher().classify(typed, expected, following) == result